@@ -1,53 +1,110 @@
 """FastAPI app - REST API for resolve, execute, glossary, lineage, metrics, health."""
 
+import asyncio
+import base64
+import binascii
+import json
+import math
 import time
 from contextlib import asynccontextmanager
+from pathlib import Path
 from typing import Any
 
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, PlainTextResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
 from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
+from ecp.adapters.base import PolicyEngine, SemanticLayerClient
+from ecp.adapters.cube_schema import load_schema
+from ecp.adapters.embedded_policy import EmbeddedPolicyEngine
 from ecp.adapters.graph import Neo4jGraphStore
+from ecp.adapters.pg import PgPoolManager, json_dumps
 from ecp.adapters.policy import OPAEngine
+from ecp.adapters.preaggregations import recommend_rollups, render_pre_aggregations
 from ecp.adapters.registry import PostgresAssetRegistry
 from ecp.adapters.semantic import CubeClient
+from ecp.adapters.sql_semantic import PostgresExecutor, RoutedSemanticLayer, SqlSemanticLayer
 from ecp.adapters.vector import PgVectorStore
 from ecp.config import settings
+from ecp.domain.columnar import ARROW_AVAILABLE, ColumnarResult
 from ecp.domain.models import ExecuteRequest, ResolveRequest, UserContext
+from ecp.index import KeywordIndex, ScopeIndex
 from ecp.observability import get_logger, metrics, setup_logging
 from ecp.observability.middleware import ObservabilityMiddleware
+from ecp.observability.workload import WorkloadRecorder
 from ecp.orchestrator import ResolutionOrchestrator
 from ecp.resilience import DegradationMode, ECPError
+from ecp.resilience.exceptions import StoreOverloadedError
+from ecp.resilience.last_known_good import LastKnownGoodStore
 
 # Initialize logging
 setup_logging(log_level=settings.log_level, json_logs=(settings.env != "local"))
 logger = get_logger(__name__)
 
 
-def _create_orchestrator() -> ResolutionOrchestrator:
+def _create_orchestrator(
+    keyword_index: KeywordIndex,
+    scope_index: ScopeIndex | None = None,
+    workload: WorkloadRecorder | None = None,
+) -> ResolutionOrchestrator:
     graph = Neo4jGraphStore()
-    vector = PgVectorStore()
+    vector = PgVectorStore(keyword_index=keyword_index)
     registry = PostgresAssetRegistry()
-    semantic = CubeClient()
-    policy = OPAEngine()
+    semantic: SemanticLayerClient = CubeClient(
+        result_store=LastKnownGoodStore(settings.lkg_path, settings.lkg_max_bytes)
+        if settings.lkg_enabled
+        else None
+    )
+    if settings.semantic_engine == "routed":
+        embedded = SqlSemanticLayer(
+            load_schema(settings.semantic_schema_path), PostgresExecutor(settings.sync_dw_url)
+        )
+        semantic = RoutedSemanticLayer(semantic, embedded)
+    policy: PolicyEngine = OPAEngine()
+    if settings.policy_engine == "embedded":
+        policy = EmbeddedPolicyEngine(fallback=policy)
     return ResolutionOrchestrator(
         graph=graph,
         vector=vector,
         registry=registry,
         semantic=semantic,
         policy=policy,
+        scope_index=scope_index,
+        workload=workload,
     )
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("application_startup", env=settings.env)
-    app.state.orchestrator = _create_orchestrator()
+    app.state.keyword_index = KeywordIndex()
+    app.state.scope_index = ScopeIndex()
+    app.state.orchestrator = _create_orchestrator(
+        app.state.keyword_index, app.state.scope_index, WorkloadRecorder()
+    )
+    # Open Postgres pools before the first request instead of on it
+    dsns = [settings.sync_registry_url, settings.pgvector_connection_string]
+    if settings.semantic_engine == "routed":
+        dsns.append(settings.sync_dw_url)
+    await PgPoolManager.warm(dsns)
+    await app.state.orchestrator._semantic.start()
+    await app.state.orchestrator._policy.start()
+    # Keep the BM25 index in sync with the registry (backs vector search fallback)
+    keyword_refresh = asyncio.create_task(
+        app.state.keyword_index.run_refresh_loop(app.state.orchestrator._registry)
+    )
+    # Active known issues by scope, attached to resolutions as warnings
+    scope_refresh = asyncio.create_task(
+        app.state.scope_index.run_refresh_loop(app.state.orchestrator._registry)
+    )
     yield
     logger.info("application_shutdown")
-    # Optional: close adapters if they have close()
+    keyword_refresh.cancel()
+    scope_refresh.cancel()
+    await app.state.orchestrator._semantic.close()
+    await app.state.orchestrator._policy.close()
+    await PgPoolManager.close_all()
 
 
 app = FastAPI(
@@ -109,10 +166,15 @@ async def ecp_error_handler(request: Request, exc: ECPError) -> JSONResponse:
         problem["degraded_services"] = degraded_services
         problem["degradation_notice"] = "Some services are experiencing issues. Results may be incomplete."
 
+    headers = {"Content-Type": "application/problem+json"}
+    if isinstance(exc, StoreOverloadedError):
+        # Shed at a store's concurrency limit; tell clients when to come back
+        headers["Retry-After"] = str(max(1, math.ceil(exc.retry_after_seconds)))
+
     return JSONResponse(
         status_code=exc.http_status,
         content=problem,
-        headers={"Content-Type": "application/problem+json"},
+        headers=headers,
     )
 
 
@@ -173,12 +235,84 @@ async def resolve(body: dict[str, Any]) -> dict:
         raise
 
 
-@app.post("/api/v1/execute", response_model=dict)
-async def execute(body: dict[str, Any]) -> dict:
-    """Execute a previously resolved metric query."""
+# /execute result encodings (Accept header); application/json keeps row dicts
+_JSON = "application/json"
+_COLUMNAR_JSON = "application/vnd.ecp.columnar+json"
+_ARROW_STREAM = "application/vnd.apache.arrow.stream"
+
+
+def _negotiate_result_format(accept: str | None) -> str:
+    """Pick the /execute media type from an Accept header (q-values honoured)."""
+    if not accept:
+        return _JSON
+    offers = []
+    for i, part in enumerate(accept.split(",")):
+        media, _, params = part.partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        offers.append((q, -i, media.strip().lower()))
+    for q, _, media in sorted(offers, reverse=True):
+        if q <= 0:
+            continue
+        if media in (_JSON, "application/*", "*/*"):
+            return _JSON
+        if media == _COLUMNAR_JSON or (media == _ARROW_STREAM and ARROW_AVAILABLE):
+            return media
+    supported = [_JSON, _COLUMNAR_JSON] + ([_ARROW_STREAM] if ARROW_AVAILABLE else [])
+    raise HTTPException(status_code=406, detail=f"Supported media types: {', '.join(supported)}")
+
+
+def _encode_results(result: dict[str, Any], media_type: str) -> dict[str, Any]:
+    """Render every query's data as row dicts (JSON) or compact columnar JSON."""
+    encode = ColumnarResult.to_rows if media_type == _JSON else ColumnarResult.to_dict
+    return {
+        **result,
+        "results": {
+            query_id: {**r, "data": encode(ColumnarResult.coerce(r.get("data")))}
+            if isinstance(r, dict)
+            else r
+            for query_id, r in result.get("results", {}).items()
+        },
+    }
+
+
+def _render_result(result: dict[str, Any], media_type: str) -> dict[str, Any] | Response:
+    if media_type == _JSON:
+        return _encode_results(result, _JSON)
+    if media_type == _COLUMNAR_JSON:
+        return Response(json_dumps(_encode_results(result, media_type)), media_type=media_type)
+    # Arrow: one table per stream; everything but the data travels in schema metadata
+    tables = [(q, r) for q, r in result.get("results", {}).items() if isinstance(r, dict)]
+    if len(tables) != 1:
+        raise HTTPException(
+            status_code=406,
+            detail=f"{_ARROW_STREAM} carries one result table; this plan has {len(tables)}",
+        )
+    query_id, query_result = tables[0]
+    meta = {k: v for k, v in result.items() if k != "results"}
+    meta["query"] = {"id": query_id, **{k: v for k, v in query_result.items() if k != "data"}}
+    data = ColumnarResult.coerce(query_result.get("data"))
+    return Response(data.to_arrow_ipc({"ecp": json_dumps(meta)}), media_type=_ARROW_STREAM)
+
+
+@app.post("/api/v1/execute", response_model=None)
+async def execute(body: dict[str, Any], request: Request) -> dict[str, Any] | Response:
+    """Execute a previously resolved metric query.
+
+    The Accept header selects the encoding: application/json (row dicts),
+    application/vnd.ecp.columnar+json (column names once, value arrays) or
+    application/vnd.apache.arrow.stream (Arrow IPC; needs pyarrow).
+    """
     resolution_id = body.get("resolution_id")
     if not resolution_id:
         raise HTTPException(status_code=400, detail="resolution_id is required")
+    media_type = _negotiate_result_format(request.headers.get("accept"))
 
     params = body.get("parameters") or {}
     logger.info("execute_request", resolution_id=resolution_id, parameters=params)
@@ -190,8 +324,16 @@ async def execute(body: dict[str, Any]) -> dict:
         result = await orch.execute(resolution_id, params)
         duration = time.time() - start_time
 
-        # Determine status from result
-        status = "not_found" if result.get("warnings") else "success"
+        # Determine status from result; a denied query outranks the rest
+        warning_types = {w.get("type") for w in result.get("warnings") or []}
+        if "access_denied" in warning_types:
+            status = "access_denied"
+        elif "not_found" in warning_types:
+            status = "not_found"
+        elif result.get("pending_queries"):
+            status = "pending"
+        else:
+            status = "success"
         metrics.record_execute(status=status, duration=duration)
 
         logger.info(
@@ -199,10 +341,13 @@ async def execute(body: dict[str, Any]) -> dict:
             resolution_id=resolution_id,
             status=status,
             duration_seconds=duration,
+            media_type=media_type,
         )
 
-        return result
+        return _render_result(result, media_type)
 
+    except HTTPException:
+        raise
     except Exception as e:
         duration = time.time() - start_time
         metrics.record_execute(status="error", duration=duration)
@@ -210,6 +355,47 @@ async def execute(body: dict[str, Any]) -> dict:
         raise
 
 
+@app.get("/api/v1/queries/{query_id}", response_model=dict)
+async def poll_query(query_id: str) -> dict:
+    """Poll a long-running query handed back by execute as pending."""
+    result = await app.state.orchestrator.poll_query(query_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"Query {query_id} not found or expired")
+    if result.get("status") == "pending":
+        return {"query_id": query_id, "status": "pending", "result": None}
+    return {
+        "query_id": query_id,
+        "status": "complete",
+        "result": {**result, "data": ColumnarResult.coerce(result.get("data")).to_rows()},
+    }
+
+
+@app.get("/api/v1/workload/pre-aggregations", response_model=None)
+async def pre_aggregation_report(
+    top: int = Query(10, ge=1, le=100), format: str = "json"
+) -> dict[str, Any] | PlainTextResponse:
+    """Rank Cube rollups by the latency they would have saved on the observed workload.
+
+    format=js returns only the ready-to-paste `preAggregations` blocks.
+    """
+    workload = app.state.orchestrator.workload
+    shapes = workload.shapes() if workload is not None else []
+    schema_path = Path(settings.semantic_schema_path)
+    # Measure types tell which measures re-aggregate from a coarser rollup
+    schema = load_schema(schema_path) if schema_path.exists() else None
+    rollups = recommend_rollups(shapes, schema=schema, top=top)
+    cube_js = render_pre_aggregations(rollups)
+    if format == "js":
+        return PlainTextResponse("\n\n".join(cube_js.values()) + "\n")
+    return {
+        "queries_recorded": workload.total if workload is not None else 0,
+        "shapes_tracked": len(shapes),
+        "rollups": [r.to_dict() for r in rollups],
+        "cube_js": cube_js,
+        "top_shapes": [s.to_dict() for s in shapes[:top]],
+    }
+
+
 @app.get("/api/v1/glossary", response_model=dict)
 async def query_glossary(query: str, domain: str | None = None) -> dict:
     """Search the business glossary for term definitions."""
@@ -230,6 +416,45 @@ async def query_glossary(query: str, domain: str | None = None) -> dict:
     }
 
 
+def _encode_cursor(asset_type: str, after_id: str) -> str:
+    payload = json.dumps({"t": asset_type, "a": after_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, asset_type: str) -> str:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if payload["t"] != asset_type:
+            raise ValueError("cursor belongs to another type")
+        return str(payload["a"])
+    except (binascii.Error, ValueError, KeyError, TypeError) as e:
+        raise HTTPException(status_code=400, detail="invalid cursor") from e
+
+
+@app.get("/api/v1/assets", response_model=dict)
+async def list_assets(
+    asset_type: str = Query(alias="type"),
+    limit: int = 100,
+    cursor: str | None = None,
+) -> dict:
+    """Page through every asset of a type; pass next_cursor back to continue."""
+    if limit < 1:
+        raise HTTPException(status_code=400, detail="limit must be positive")
+    limit = min(limit, settings.assets_page_max_limit)
+    after_id = _decode_cursor(cursor, asset_type) if cursor else None
+
+    registry = app.state.orchestrator._registry
+    # One extra row tells whether another page exists without an empty round-trip
+    page = await registry.get_assets_page(asset_type, after_id=after_id, limit=limit + 1)
+    assets = page[:limit]
+    return {
+        "assets": assets,
+        "count": len(assets),
+        "next_cursor": _encode_cursor(asset_type, assets[-1]["id"]) if len(page) > limit else None,
+    }
+
+
 @app.get("/api/v1/lineage", response_model=dict)
 async def get_lineage(target: str, depth: int = 3) -> dict:
     """Get data lineage for a metric or table."""
@@ -0,0 +1,12 @@
+# Batch helper - evaluate data.ecp.data_access for several inputs in one call
+package ecp.data_access_batch
+
+import data.ecp.data_access
+
+# input.batch is a list of data_access input documents. Decisions are keyed
+# by list index (JSON object keys "0", "1", ...) so the caller restores order.
+decisions := {i: decision |
+  some i
+  item := input.batch[i]
+  decision := data_access with input as item
+}
@@ -0,0 +1,11 @@
+# ECP row-level access - which rows of a data product a user may see
+package ecp.row_filters
+
+# Users without a region restriction see every row
+allow_row {
+  not input.user.allowed_regions
+}
+
+allow_row {
+  input.row.region == input.user.allowed_regions[_]
+}
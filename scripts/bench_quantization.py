@@ -0,0 +1,117 @@
+"""Memory vs recall benchmark for quantized embedding search.
+
+Compares exact float32 cosine search with:
+- int8 scalar quantization (ecp.index.Int8VectorIndex), with and without
+  float32 rescoring of the top candidates
+- halfvec (float16, as stored by pgvector's halfvec column), simulated by
+  rounding each component through IEEE half precision
+
+over a synthetic corpus embedded with the configured embedder.
+
+Usage:
+    python scripts/bench_quantization.py [--rows 2000] [--queries 20] [--top-k 10]
+"""
+
+import argparse
+import heapq
+import json
+import random
+import struct
+import time
+
+from ecp.index import Int8VectorIndex
+from ecp.index.embedding import get_embedder
+
+VOCABULARY = (
+    "revenue net gross margin refunds churn customers region apac emea fiscal calendar "
+    "quarter month daily orders product pipeline bookings arr subscription discount cost "
+    "goods sold forecast budget variance migration snowflake oracle incomplete data late "
+    "backfill adjustment currency exchange rate tax accrual deferred recognized policy"
+).split()
+
+
+def _texts(n: int, rng: random.Random) -> list[str]:
+    return [" ".join(rng.choices(VOCABULARY, k=rng.randint(6, 16))) for _ in range(n)]
+
+
+def _dot(a: list[float], b: list[float]) -> float:
+    return sum(x * y for x, y in zip(a, b, strict=True))
+
+
+def _to_half(vector: list[float]) -> list[float]:
+    packed = struct.pack(f"{len(vector)}e", *vector)
+    return list(struct.unpack(f"{len(vector)}e", packed))
+
+
+def _top(query: list[float], vectors: list[list[float]], k: int) -> list[int]:
+    return [i for _, i in heapq.nlargest(k, ((_dot(query, v), i) for i, v in enumerate(vectors)))]
+
+
+def _recall(found: list[list[int]], truth: list[list[int]]) -> float:
+    hits = sum(len(set(f) & set(t)) for f, t in zip(found, truth, strict=True))
+    return round(hits / sum(len(t) for t in truth), 4)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--rescore-factor", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    embedder = get_embedder()
+    dims = embedder.dimensions
+    vectors = embedder.embed(_texts(args.rows, rng))
+    queries = embedder.embed(_texts(args.queries, rng))
+    ids = [str(i) for i in range(args.rows)]
+    k = args.top_k
+
+    truth = [_top(q, vectors, k) for q in queries]
+    results: dict[str, dict[str, float]] = {
+        "float32": {"bytes_per_vector": dims * 4, "recall": 1.0},
+    }
+
+    index = Int8VectorIndex(dimensions=dims, keep_full_precision=True)
+    index.add(ids, vectors)
+    for name, factor in (
+        ("int8", 1),
+        (f"int8+rescore x{args.rescore_factor}", args.rescore_factor),
+    ):
+        start = time.perf_counter()
+        found = [[int(i) for i, _ in index.search(q, k, rescore_factor=factor)] for q in queries]
+        results[name] = {
+            "bytes_per_vector": dims + 4,
+            "recall": _recall(found, truth),
+            "ms_per_query": round((time.perf_counter() - start) * 1000 / len(queries), 2),
+        }
+    # The rescore variant also needs the float32 vectors (in Postgres, or in memory)
+    results[f"int8+rescore x{args.rescore_factor}"]["bytes_per_vector"] += dims * 4
+
+    # halfvec bytes are the HNSW index payload; the float32 column stays in the heap for rescoring
+    half = [_to_half(v) for v in vectors]
+    candidates = [_top(q, half, k * args.rescore_factor) for q in queries]
+    results["halfvec"] = {
+        "bytes_per_vector": dims * 2,
+        "recall": _recall([c[:k] for c in candidates], truth),
+    }
+    rescored = [
+        [i for _, i in heapq.nlargest(k, ((_dot(q, vectors[i]), i) for i in c))]
+        for q, c in zip(queries, candidates, strict=True)
+    ]
+    results[f"halfvec+rescore x{args.rescore_factor}"] = {
+        "bytes_per_vector": dims * 2,
+        "recall": _recall(rescored, truth),
+    }
+
+    print(
+        json.dumps(
+            {"rows": args.rows, "dimensions": dims, "top_k": k, "results": results}, indent=2
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+-- Change tracking for incremental re-embedding (python -m ecp.ingest.sync)
+-- Run against ecp_registry database. Idempotent.
+
+-- Keyset scan of recently changed assets: (updated_at, id) > watermark
+CREATE INDEX IF NOT EXISTS idx_assets_updated_at_id ON assets(updated_at, id);
+
+-- Keep updated_at honest and bump version when content changes
+CREATE OR REPLACE FUNCTION assets_track_update() RETURNS trigger AS $$
+BEGIN
+    NEW.updated_at := NOW();
+    IF NEW.version = OLD.version
+       AND (NEW.content IS DISTINCT FROM OLD.content OR NEW.metadata IS DISTINCT FROM OLD.metadata) THEN
+        NEW.version := OLD.version + 1;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_assets_track_update ON assets;
+CREATE TRIGGER trg_assets_track_update
+    BEFORE UPDATE ON assets
+    FOR EACH ROW EXECUTE FUNCTION assets_track_update();
+
+-- Tombstones so the sync job can delete embeddings without scanning the corpus
+CREATE TABLE IF NOT EXISTS asset_deletions (
+    asset_id VARCHAR(50) NOT NULL,
+    type VARCHAR(50) NOT NULL,
+    version INT NOT NULL,
+    deleted_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_asset_deletions_deleted_at ON asset_deletions(deleted_at);
+
+CREATE OR REPLACE FUNCTION assets_track_delete() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO asset_deletions (asset_id, type, version) VALUES (OLD.id, OLD.type, OLD.version);
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_assets_track_delete ON assets;
+CREATE TRIGGER trg_assets_track_delete
+    AFTER DELETE ON assets
+    FOR EACH ROW EXECUTE FUNCTION assets_track_delete();
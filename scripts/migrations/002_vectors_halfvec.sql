@@ -0,0 +1,17 @@
+-- Half-precision copy of embeddings for quantized search (VECTOR_QUANTIZATION=halfvec)
+-- Run against ecp_vectors database. Requires pgvector >= 0.7. Idempotent.
+--
+-- The generated column is maintained by Postgres, so ingestion keeps writing
+-- only the float32 column. The HNSW index over halfvec is about half the size
+-- of the float32 one; queries take the top candidates from it and rescore them
+-- against the float32 column (see PgVectorStore).
+
+ALTER TABLE embeddings
+    ADD COLUMN IF NOT EXISTS embedding_half halfvec(384)
+    GENERATED ALWAYS AS (embedding::halfvec(384)) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_embeddings_vector_half
+    ON embeddings USING hnsw (embedding_half halfvec_cosine_ops);
+
+-- With VECTOR_QUANTIZATION=halfvec the float32 index is no longer used for search:
+-- DROP INDEX IF EXISTS idx_embeddings_vector;
@@ -0,0 +1,27 @@
+-- Per-type partial indexes for multi-type search (PgVectorStore.search_multi)
+-- Run against ecp_vectors database. Idempotent.
+--
+-- search_multi probes each asset type with `type = $t AND metadata @> $filter`.
+-- A partial HNSW index per type keeps each probe inside its own graph (a global
+-- index filtered afterwards can return fewer than top_k rows for small types),
+-- and a partial GIN index per type serves selective metadata prefilters such as
+-- {"domain": "finance"}.
+
+CREATE INDEX IF NOT EXISTS idx_embeddings_vector_glossary
+    ON embeddings USING hnsw (embedding vector_cosine_ops)
+    WHERE type = 'glossary_term';
+CREATE INDEX IF NOT EXISTS idx_embeddings_vector_tribal
+    ON embeddings USING hnsw (embedding vector_cosine_ops)
+    WHERE type = 'tribal_knowledge';
+
+CREATE INDEX IF NOT EXISTS idx_embeddings_metadata_glossary
+    ON embeddings USING GIN (metadata jsonb_path_ops)
+    WHERE type = 'glossary_term';
+CREATE INDEX IF NOT EXISTS idx_embeddings_metadata_tribal
+    ON embeddings USING GIN (metadata jsonb_path_ops)
+    WHERE type = 'tribal_knowledge';
+
+-- With VECTOR_QUANTIZATION=halfvec (migration 002), index embedding_half per type instead:
+-- CREATE INDEX IF NOT EXISTS idx_embeddings_vector_half_glossary
+--     ON embeddings USING hnsw (embedding_half halfvec_cosine_ops)
+--     WHERE type = 'glossary_term';
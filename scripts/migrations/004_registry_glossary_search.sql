@@ -0,0 +1,31 @@
+-- Indexed full-text and trigram search for glossary terms (PostgresAssetRegistry.search_glossary)
+-- Run against ecp_registry database. Idempotent.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Weighted document: names (A), synonyms (B), definition (C)
+ALTER TABLE assets ADD COLUMN IF NOT EXISTS search_tsv tsvector GENERATED ALWAYS AS (
+    setweight(to_tsvector('english',
+        coalesce(content->>'canonical_name', '') || ' ' || coalesce(content->>'display_name', '')), 'A')
+    || setweight(to_tsvector('english', coalesce((content->'synonyms')::text, '')), 'B')
+    || setweight(to_tsvector('english', coalesce(content->>'definition', '')), 'C')
+) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_assets_glossary_tsv
+    ON assets USING GIN (search_tsv)
+    WHERE type = 'glossary_term';
+
+-- Fuzzy (similarity) and substring (ILIKE '%q%') matching on names and definitions
+CREATE INDEX IF NOT EXISTS idx_assets_glossary_name_trgm
+    ON assets USING GIN ((content->>'canonical_name') gin_trgm_ops)
+    WHERE type = 'glossary_term';
+CREATE INDEX IF NOT EXISTS idx_assets_glossary_definition_trgm
+    ON assets USING GIN ((content->>'definition') gin_trgm_ops)
+    WHERE type = 'glossary_term';
+
+-- Domain filter
+CREATE INDEX IF NOT EXISTS idx_assets_glossary_domain
+    ON assets ((metadata->>'domain'))
+    WHERE type = 'glossary_term';
+
+ANALYZE assets;
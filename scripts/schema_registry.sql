@@ -16,3 +16,5 @@ CREATE TABLE IF NOT EXISTS assets (
 CREATE INDEX IF NOT EXISTS idx_assets_type ON assets(type);
 CREATE INDEX IF NOT EXISTS idx_assets_content ON assets USING GIN(content);
 CREATE INDEX IF NOT EXISTS idx_assets_metadata ON assets USING GIN(metadata);
+-- Keyset pagination over (type, id) for streaming reads (embedding ingestion, exports)
+CREATE INDEX IF NOT EXISTS idx_assets_type_id ON assets(type, id);
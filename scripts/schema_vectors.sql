@@ -16,3 +16,11 @@ CREATE INDEX IF NOT EXISTS idx_embeddings_type ON embeddings(type);
 CREATE INDEX IF NOT EXISTS idx_embeddings_metadata ON embeddings USING GIN(metadata);
 -- Vector similarity index (use ivfflat or hnsw depending on pgvector version)
 CREATE INDEX IF NOT EXISTS idx_embeddings_vector ON embeddings USING hnsw (embedding vector_cosine_ops);
+
+-- Resumable ingestion jobs (python -m ecp.ingest.embeddings) record their keyset cursor here
+CREATE TABLE IF NOT EXISTS ingest_checkpoints (
+    job VARCHAR(100) PRIMARY KEY,
+    cursor JSONB NOT NULL,
+    rows_done BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT NOW()
+);
@@ -17,9 +17,17 @@ echo "Seeding Asset Registry (ecp_registry)..."
 psql -h "$PGHOST" -p "$PGPORT" -U "$PGUSER" -d ecp_registry -f scripts/schema_registry.sql
 psql -h "$PGHOST" -p "$PGPORT" -U "$PGUSER" -d ecp_registry -f scripts/seed_registry.sql
 
+echo "Applying migrations..."
+for f in scripts/migrations/*_registry_*.sql; do
+  [ -e "$f" ] && psql -h "$PGHOST" -p "$PGPORT" -U "$PGUSER" -d ecp_registry -f "$f"
+done
+
 echo "Seeding Vector store (ecp_vectors)..."
 psql -h "$PGHOST" -p "$PGPORT" -U "$PGUSER" -d ecp_vectors -f scripts/schema_vectors.sql
 psql -h "$PGHOST" -p "$PGPORT" -U "$PGUSER" -d ecp_vectors -f scripts/seed_vectors.sql
+for f in scripts/migrations/*_vectors_*.sql; do
+  [ -e "$f" ] && psql -h "$PGHOST" -p "$PGPORT" -U "$PGUSER" -d ecp_vectors -f "$f"
+done
 
 echo "Seeding Synthetic DW (ecp_dw)..."
 psql -h "$PGHOST" -p "$PGPORT" -U "$PGUSER" -d ecp_dw -f scripts/schema_dw.sql
@@ -1,5 +1,6 @@
 -- Seed vector store with placeholder embeddings (deterministic for tests)
 -- In production, use real embeddings (e.g. sentence-transformers). For local/demo we use fixed vectors so semantic search returns known results.
+-- To embed the registry for real: python -m ecp.ingest.embeddings --restart
 -- pgvector: build vector(384) from repeated float.
 
 INSERT INTO embeddings (id, type, content_text, embedding, metadata)
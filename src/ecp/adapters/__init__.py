@@ -4,7 +4,9 @@ from ecp.adapters.graph import GraphStore, Neo4jGraphStore
 from ecp.adapters.vector import VectorStore, PgVectorStore
 from ecp.adapters.registry import AssetRegistry, PostgresAssetRegistry
 from ecp.adapters.semantic import SemanticLayerClient, CubeClient
+from ecp.adapters.sql_semantic import RoutedSemanticLayer, SqlSemanticLayer
 from ecp.adapters.policy import PolicyEngine, OPAEngine
+from ecp.adapters.embedded_policy import EmbeddedPolicyEngine
 
 __all__ = [
     "GraphStore",
@@ -15,6 +17,9 @@ __all__ = [
     "PostgresAssetRegistry",
     "SemanticLayerClient",
     "CubeClient",
+    "SqlSemanticLayer",
+    "RoutedSemanticLayer",
     "PolicyEngine",
     "OPAEngine",
+    "EmbeddedPolicyEngine",
 ]
@@ -1,8 +1,14 @@
 """Abstract interfaces for store adapters - swap and mock in tests."""
 
+import asyncio
+import json
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
 from typing import Any
 
+from ecp.config import settings
+from ecp.index.documents import metadata_matches
+
 
 class GraphStore(ABC):
     """Knowledge graph - entities, metrics, lineage."""
@@ -41,6 +47,46 @@ class VectorStore(ABC):
         """Semantic search; return list of {id, type, content_text, metadata, score}."""
         ...
 
+    async def search_hybrid(
+        self, query_text: str, type_filter: str | None = None, top_k: int = 5
+    ) -> list[dict[str, Any]]:
+        """Lexical + vector search fused by rank; defaults to plain search."""
+        return await self.search(query_text, type_filter=type_filter, top_k=top_k)
+
+    async def search_multi(
+        self,
+        query_text: str,
+        types: list[str],
+        top_k: int = 5,
+        filters: dict[str, dict[str, Any]] | None = None,
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Per-type top-k for one query, e.g. glossary terms and tribal knowledge together.
+
+        Args:
+            query_text: Query text
+            types: Asset types to search (e.g. ["glossary_term", "tribal_knowledge"])
+            top_k: Results per type
+            filters: Optional metadata prefilter per type,
+                e.g. {"glossary_term": {"domain": "finance"}}
+
+        Returns:
+            {type: results} with an entry (possibly empty) for every requested type
+        """
+        # Default: one search per type, filtered here; stores override with a single round-trip
+        filters = filters or {}
+        results = await asyncio.gather(
+            *(
+                self.search(query_text, type_filter=t, top_k=top_k * (4 if filters.get(t) else 1))
+                for t in types
+            )
+        )
+        return {
+            t: [h for h in hits if metadata_matches(h.get("metadata") or {}, filters.get(t))][
+                :top_k
+            ]
+            for t, hits in zip(types, results, strict=True)
+        }
+
     @abstractmethod
     async def health(self) -> bool:
         """Health check."""
@@ -55,11 +101,46 @@ class AssetRegistry(ABC):
         """Return asset by id (content + metadata) or None."""
         ...
 
+    async def get_assets(self, asset_ids: list[str]) -> dict[str, dict[str, Any]]:
+        """Return {id: asset} for the ids that exist; defaults to one get_asset per id."""
+        assets = await asyncio.gather(*(self.get_asset(i) for i in dict.fromkeys(asset_ids)))
+        return {a["id"]: a for a in assets if a}
+
     @abstractmethod
     async def get_assets_by_type(self, asset_type: str, limit: int = 100) -> list[dict[str, Any]]:
         """Return assets of given type."""
         ...
 
+    @abstractmethod
+    async def get_assets_page(
+        self, asset_type: str, after_id: str | None = None, limit: int = 100
+    ) -> list[dict[str, Any]]:
+        """Return up to limit assets of a type with id > after_id, ordered by id.
+
+        Keyset pagination: pass the last id of one page as after_id of the next.
+        Each page should be one indexed range read, not a scan of the whole type.
+        """
+        ...
+
+    async def stream_assets_by_type(
+        self, asset_type: str, batch_size: int | None = None
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Yield every asset of a type, one keyset page in memory at a time.
+
+        Args:
+            asset_type: Asset type (e.g. "glossary_term")
+            batch_size: Rows per page (default settings.registry_stream_batch_size)
+        """
+        batch_size = batch_size or settings.registry_stream_batch_size
+        after_id: str | None = None
+        while True:
+            page = await self.get_assets_page(asset_type, after_id=after_id, limit=batch_size)
+            for asset in page:
+                yield asset
+            if len(page) < batch_size:
+                return
+            after_id = page[-1]["id"]
+
     @abstractmethod
     async def search_glossary(self, query: str, domain: str | None = None, limit: int = 10) -> list[dict[str, Any]]:
         """Search glossary terms (e.g. by canonical_name or definition)."""
@@ -74,11 +155,26 @@ class AssetRegistry(ABC):
 class SemanticLayerClient(ABC):
     """Executable metric queries - Cube/dbt semantic layer."""
 
+    async def start(self) -> None:
+        """Open long-lived resources (HTTP connection pools); called from the app lifespan."""
+        return None
+
+    async def close(self) -> None:
+        """Release resources opened by start()."""
+        return None
+
     @abstractmethod
     async def execute_query(self, measure: str, dimensions: list[str], filters: dict[str, Any]) -> dict[str, Any]:
         """Run metric query; return {data, annotation}."""
         ...
 
+    async def poll_query(self, query_id: str) -> dict[str, Any] | None:
+        """Check a query that execute_query returned as {"status": "pending", "query_id": ...}.
+
+        Returns results, the pending handle again, or None if the handle is unknown.
+        """
+        return None
+
     @abstractmethod
     async def health(self) -> bool:
         """Health check."""
@@ -88,11 +184,46 @@ class SemanticLayerClient(ABC):
 class PolicyEngine(ABC):
     """Runtime policy evaluation - access control."""
 
+    async def start(self) -> None:
+        """Load policies and start background refresh; called from the app lifespan."""
+        return None
+
+    async def close(self) -> None:
+        """Stop work started by start()."""
+        return None
+
     @abstractmethod
     async def evaluate(self, user: dict[str, Any], action: str, data_product: dict[str, Any]) -> dict[str, Any]:
         """Evaluate policy; return {allow: bool, ...}."""
         ...
 
+    async def evaluate_many(
+        self, user: dict[str, Any], action: str, data_products: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        """Evaluate one action on several data products; decisions in input order.
+
+        Identical products are evaluated once. The default evaluates distinct
+        products concurrently; engines with a batch API override this.
+        """
+        keys = [json.dumps(p, sort_keys=True, default=str) for p in data_products]
+        unique = dict(zip(keys, data_products, strict=True))
+        decided = await asyncio.gather(*(self.evaluate(user, action, p) for p in unique.values()))
+        decisions = dict(zip(unique, decided, strict=True))
+        return [decisions[k] for k in keys]
+
+    async def row_filters(
+        self, user: dict[str, Any], action: str, data_product: dict[str, Any]
+    ) -> dict[str, list[Any]] | None:
+        """Row-level constraints on a data product, for pushdown into query filters.
+
+        Returns:
+            {column: allowed values}; {} when every row is visible, None when none is.
+            The default applies the region restriction in user["allowed_regions"]
+            (policies/row_filters.rego) in-process.
+        """
+        allowed = user.get("allowed_regions")
+        return {} if allowed is None else {"region": list(allowed)}
+
     @abstractmethod
     async def health(self) -> bool:
         """Health check."""
@@ -0,0 +1,308 @@
+"""Compile a subset of Cube schema definitions into parameterized SQL.
+
+Supported subset (enough for simple certified measures):
+- cube(name, {sql, measures, dimensions}) from cube/schema/*.js, or the same
+  structure as a JSON export ({"cubes": [{"name", "sql", "measures", "dimensions"}]})
+- measures of type sum, count, countDistinct, avg, min, max
+- dimensions of type string, number, boolean, time
+- filters with equals, notEquals, gt, gte, lt, lte, set, notSet
+- {CUBE} / ${CUBE} references in member sql
+
+Anything else (joins, segments, pre-aggregations, template expressions other
+than CUBE) makes the query unsupported, and the caller routes it to Cube.
+
+Usage:
+    from ecp.adapters.cube_schema import load_schema
+
+    schema = load_schema("cube/schema")
+    sql, params = schema.compile(query, placeholder="$")
+"""
+
+import json
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from ecp.observability import get_logger
+
+logger = get_logger(__name__)
+
+_AGGREGATES = {
+    "sum": "SUM({sql})",
+    "count": "COUNT({sql})",
+    "countDistinct": "COUNT(DISTINCT {sql})",
+    "avg": "AVG({sql})",
+    "min": "MIN({sql})",
+    "max": "MAX({sql})",
+}
+_DIMENSION_TYPES = {"string", "number", "boolean", "time"}
+_COMPARISONS = {"gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+_CUBE_REF = re.compile(r"\$?\{CUBE\}")
+# Filter values arrive as strings; Postgres parameters are bound as text and cast
+_PG_CASTS = {"time": "timestamp", "number": "numeric", "boolean": "boolean"}
+
+
+class UnsupportedQueryError(ValueError):
+    """The query or schema uses Cube features outside the compiled subset."""
+
+
+@dataclass(frozen=True)
+class Member:
+    name: str  # "Cube.member"
+    sql: str
+    type: str
+    meta: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class CubeDefinition:
+    name: str
+    sql: str
+    measures: dict[str, Member]
+    dimensions: dict[str, Member]
+
+
+class CubeSchema:
+    """Compiled cubes, keyed by name."""
+
+    def __init__(self, cubes: list[CubeDefinition]) -> None:
+        self.cubes = {c.name: c for c in cubes}
+
+    def measure(self, name: str) -> Member:
+        cube_name, _, member = name.partition(".")
+        cube = self.cubes.get(cube_name)
+        if cube is None or member not in cube.measures:
+            raise UnsupportedQueryError(f"unknown measure {name}")
+        return cube.measures[member]
+
+    def dimension(self, name: str) -> Member:
+        cube_name, _, member = name.partition(".")
+        cube = self.cubes.get(cube_name)
+        if cube is None or member not in cube.dimensions:
+            raise UnsupportedQueryError(f"unknown dimension {name}")
+        return cube.dimensions[member]
+
+    def compile(self, query: dict[str, Any], placeholder: str = "$") -> tuple[str, list[Any]]:
+        """Compile a Cube /load query into SQL over the cube's base sql.
+
+        Args:
+            query: {"measures", "dimensions", "filters"} as sent to Cube
+            placeholder: "$" for $1-style (asyncpg) or "?" for qmark (sqlite3)
+
+        Returns:
+            (sql, params); result columns are named by member ("Revenue.region")
+
+        Raises:
+            UnsupportedQueryError: If the query leaves the supported subset
+        """
+        measures = [self.measure(m) for m in query.get("measures") or []]
+        dimensions = [self.dimension(d) for d in query.get("dimensions") or []]
+        if not measures:
+            raise UnsupportedQueryError("query has no measures")
+        if query.get("timeDimensions") or query.get("segments"):
+            raise UnsupportedQueryError("timeDimensions/segments are not compiled")
+        members = measures + dimensions
+        cube_names = {m.name.partition(".")[0] for m in members}
+        filters = query.get("filters") or []
+        cube_names |= {f.get("member", "").partition(".")[0] for f in filters}
+        if len(cube_names) != 1:
+            raise UnsupportedQueryError("multi-cube queries need Cube's join graph")
+        cube = self.cubes[cube_names.pop()]
+
+        params: list[Any] = []
+
+        def bind(value: Any, member_type: str = "string") -> str:
+            if placeholder != "$":
+                params.append(value)
+                return "?"
+            params.append(str(value) if member_type in _PG_CASTS else value)
+            cast = _PG_CASTS.get(member_type)
+            return f"${len(params)}::text::{cast}" if cast else f"${len(params)}"
+
+        select = [f'{d.sql} AS "{d.name}"' for d in dimensions]
+        select += [f'{_AGGREGATES[m.type].format(sql=m.sql)} AS "{m.name}"' for m in measures]
+        where = [_compile_filter(self.dimension(f.get("member", "")), f, bind) for f in filters]
+
+        sql = f'SELECT {", ".join(select)} FROM ({cube.sql}) AS "{cube.name}"'
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        if dimensions:
+            positions = ", ".join(str(i + 1) for i in range(len(dimensions)))
+            sql += f" GROUP BY {positions} ORDER BY {positions}"
+        if query.get("limit"):
+            sql += f" LIMIT {bind(int(query['limit']), 'limit')}"
+        return sql, params
+
+
+def _compile_filter(dimension: Member, f: dict[str, Any], bind: Any) -> str:
+    operator = f.get("operator")
+    values = f.get("values") or []
+    if operator == "set":
+        return f"{dimension.sql} IS NOT NULL"
+    if operator == "notSet":
+        return f"{dimension.sql} IS NULL"
+    if operator in ("equals", "notEquals"):
+        if not values:
+            raise UnsupportedQueryError(f"{operator} filter needs values")
+        in_list = ", ".join(bind(v, dimension.type) for v in values)
+        return f"{dimension.sql} {'NOT IN' if operator == 'notEquals' else 'IN'} ({in_list})"
+    if operator in _COMPARISONS and len(values) == 1:
+        return f"{dimension.sql} {_COMPARISONS[operator]} {bind(values[0], dimension.type)}"
+    raise UnsupportedQueryError(f"filter operator {operator}")
+
+
+def _member(cube: str, name: str, spec: dict[str, Any], kind: str) -> Member | None:
+    member_type = spec.get("type")
+    if kind == "measure":
+        if member_type not in _AGGREGATES:
+            return None
+        sql = spec.get("sql") or ("*" if member_type == "count" else None)
+    else:
+        if member_type not in _DIMENSION_TYPES:
+            return None
+        sql = spec.get("sql")
+    if not isinstance(sql, str) or "${" in _CUBE_REF.sub("", sql):
+        return None
+    return Member(
+        f"{cube}.{name}", _CUBE_REF.sub(f'"{cube}"', sql), member_type, spec.get("meta") or {}
+    )
+
+
+def _cube(name: str, spec: dict[str, Any]) -> CubeDefinition | None:
+    sql = spec.get("sql")
+    if not isinstance(sql, str) or "${" in sql or spec.get("joins"):
+        logger.info("cube_schema_cube_skipped", cube=name, reason="unsupported sql or joins")
+        return None
+    measures = {
+        k: m
+        for k, v in (spec.get("measures") or {}).items()
+        if (m := _member(name, k, v, "measure"))
+    }
+    dimensions = {
+        k: m
+        for k, v in (spec.get("dimensions") or {}).items()
+        if (m := _member(name, k, v, "dimension"))
+    }
+    return CubeDefinition(name, sql, measures, dimensions)
+
+
+# --- Parsing ---------------------------------------------------------------
+
+_TOKEN_RE = re.compile(
+    r"""
+    (?P<ws>\s+|//[^\n]*|/\*.*?\*/)
+  | (?P<string>'(?:\\.|[^'\\])*'|"(?:\\.|[^"\\])*"|`(?:\\.|[^`\\])*`)
+  | (?P<number>-?\d+(?:\.\d+)?)
+  | (?P<ident>[A-Za-z_$][\w$]*)
+  | (?P<punct>[{}\[\]():,])
+  | (?P<other>\S)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "\\": "\\", "'": "'", '"': '"', "`": "`"}
+
+
+def _tokens(source: str) -> list[tuple[str, str]]:
+    # Anything outside cube(...) calls (";", requires, ...) is tokenised and ignored
+    out: list[tuple[str, str]] = []
+    pos = 0
+    while pos < len(source):
+        m = _TOKEN_RE.match(source, pos)
+        pos = m.end()
+        if m.lastgroup != "ws":
+            out.append((m.lastgroup, m.group()))
+    return out
+
+
+class _Parser:
+    """Recursive-descent reader for the JSON-like object literals in Cube schema files."""
+
+    def __init__(self, tokens: list[tuple[str, str]]) -> None:
+        self._tokens = tokens
+        self._i = 0
+
+    def _next(self) -> tuple[str, str]:
+        token = self._tokens[self._i]
+        self._i += 1
+        return token
+
+    def _peek(self) -> str:
+        return self._tokens[self._i][1] if self._i < len(self._tokens) else ""
+
+    def _expect(self, value: str) -> None:
+        kind, text = self._next()
+        if text != value:
+            raise UnsupportedQueryError(f"expected {value!r}, got {text!r}")
+
+    def value(self) -> Any:
+        kind, text = self._next()
+        if text == "{":
+            obj: dict[str, Any] = {}
+            while self._peek() != "}":
+                key_kind, key = self._next()
+                obj[_unquote(key) if key_kind == "string" else key] = (
+                    self._expect(":"),
+                    self.value(),
+                )[1]
+                if self._peek() == ",":
+                    self._next()
+            self._next()
+            return obj
+        if text == "[":
+            items = []
+            while self._peek() != "]":
+                items.append(self.value())
+                if self._peek() == ",":
+                    self._next()
+            self._next()
+            return items
+        if kind == "string":
+            return _unquote(text)
+        if kind == "number":
+            return float(text) if "." in text else int(text)
+        if text in ("true", "false", "null"):
+            return {"true": True, "false": False, "null": None}[text]
+        raise UnsupportedQueryError(f"unsupported expression {text!r}")
+
+    def cubes(self) -> list[tuple[str, dict[str, Any]]]:
+        found = []
+        while self._i < len(self._tokens):
+            kind, text = self._next()
+            if text == "cube" and self._peek() == "(":
+                self._next()
+                name = self.value()
+                self._expect(",")
+                found.append((name, self.value()))
+                self._expect(")")
+        return found
+
+
+def _unquote(text: str) -> str:
+    return re.sub(r"\\(.)", lambda m: _ESCAPES.get(m.group(1), m.group(1)), text[1:-1])
+
+
+def parse_cube_js(source: str) -> list[CubeDefinition]:
+    """Parse cube(...) calls from a Cube schema .js file."""
+    return [c for name, spec in _Parser(_tokens(source)).cubes() if (c := _cube(name, spec))]
+
+
+def load_schema(path: str | Path) -> CubeSchema:
+    """Load cubes from a schema directory (*.js, *.json) or a single file.
+
+    Files that fail to parse are skipped with a warning; their cubes stay on Cube.
+    """
+    path = Path(path)
+    files = sorted(path.glob("*.js")) + sorted(path.glob("*.json")) if path.is_dir() else [path]
+    cubes: list[CubeDefinition] = []
+    for file in files:
+        try:
+            if file.suffix == ".json":
+                export = json.loads(file.read_text())
+                cubes += [c for spec in export.get("cubes", []) if (c := _cube(spec["name"], spec))]
+            else:
+                cubes += parse_cube_js(file.read_text())
+        except (UnsupportedQueryError, ValueError, KeyError, IndexError) as e:
+            logger.warning("cube_schema_file_skipped", file=str(file), error=str(e))
+    logger.info("cube_schema_loaded", cubes=[c.name for c in cubes])
+    return CubeSchema(cubes)
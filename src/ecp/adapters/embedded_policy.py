@@ -0,0 +1,299 @@
+"""In-process evaluation of the data_access policy, with OPA as the authority.
+
+policies/data_access.rego is a table lookup: allow when the action matches,
+the role is set, and user_max_tier[role] >= certification_tier. That shape is
+compiled into a data-only CompiledPolicy (the action, the table) and evaluated
+with a dict lookup, skipping the HTTP round-trip to OPA.
+
+The compiler accepts exactly that rule shape. Anything else in the module
+(other statements in allow, more allow rules, non-literal tables) means the
+policy cannot be compiled and every decision goes to OPA. Inputs outside the
+compiled domain (a certification_tier that is not a number) also go to OPA,
+since Rego's cross-type comparisons are not reproduced here.
+
+Policies are loaded from OPA's policies API (POLICY_EMBEDDED_SOURCE=opa), so
+the evaluator tracks whatever OPA serves, or from a local .rego file or
+compiled .json, and reloaded every POLICY_EMBEDDED_REFRESH_SECONDS.
+
+Row filters use PolicyEngine.row_filters, the in-process form of
+policies/row_filters.rego, rather than OPA's Compile API.
+
+Enable with POLICY_ENGINE=embedded.
+"""
+
+import asyncio
+import hashlib
+import json
+import re
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from ecp.adapters.base import PolicyEngine
+from ecp.config import settings
+from ecp.observability import get_logger, metrics
+from ecp.resilience.degradation import cached_policy_fallback
+
+logger = get_logger(__name__)
+
+_COMMENT_RE = re.compile(r"#[^\n]*")
+_PACKAGE_RE = re.compile(r"^\s*package\s+([\w.]+)\s*$", re.MULTILINE)
+_DEFAULT_RE = re.compile(r"^\s*default\s+allow\s*:?=\s*false\s*$", re.MULTILINE)
+_ALLOW_RE = re.compile(r"^\s*allow\s+(?:if\s+)?\{(.*?)^\s*\}", re.MULTILINE | re.DOTALL)
+_IMPORT_RE = re.compile(r"^\s*import\s+(?:rego\.v1|future\.keywords(?:\.\w+)?)\s*$", re.MULTILINE)
+_ACTION_RE = re.compile(r'^input\.action == "([^"\\]*)"$')
+_ROLE_SET = 'input.user.role != ""'
+_TIER_RE = re.compile(r"^(\w+)\[input\.user\.role\] >= input\.data_product\.certification_tier$")
+_TABLE_RE = r"^\s*{name}\s*:?=\s*(\{{.*?^\s*\}})"
+
+
+class PolicyCompileError(ValueError):
+    """The policy uses Rego outside the compiled subset."""
+
+
+@dataclass(frozen=True)
+class CompiledPolicy:
+    """Data-only form of the data_access policy."""
+
+    package: str
+    action: str | None
+    require_role: bool
+    table_name: str
+    table: dict[str, float]
+    revision: str = ""
+
+    def allow(self, input_doc: dict[str, Any]) -> bool | None:
+        """Decision for an input document, or None if it must go to OPA."""
+        user = input_doc.get("user")
+        data_product = input_doc.get("data_product")
+        role = user.get("role") if isinstance(user, dict) else None
+        tier = data_product.get("certification_tier") if isinstance(data_product, dict) else None
+        if tier is not None and (isinstance(tier, bool) or not isinstance(tier, (int, float))):
+            return None
+        # Undefined references make the rule body undefined, i.e. allow = false
+        if self.action is not None and input_doc.get("action") != self.action:
+            return False
+        if not isinstance(role, str) or (self.require_role and role == ""):
+            return False
+        if tier is None or role not in self.table:
+            return False
+        return self.table[role] >= tier
+
+    def document(self, allowed: bool) -> dict[str, Any]:
+        """The package document OPA returns for data/<package>."""
+        return {"allow": allowed, self.table_name: dict(self.table)}
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "CompiledPolicy":
+        return cls(**data)
+
+
+def compile_rego(source: str) -> CompiledPolicy:
+    """Compile a data_access-shaped Rego module.
+
+    Raises:
+        PolicyCompileError: If the module is not a role/tier table lookup
+    """
+    text = _COMMENT_RE.sub("", source)
+    package = _PACKAGE_RE.search(text)
+    if package is None:
+        raise PolicyCompileError("no package declaration")
+    if not _DEFAULT_RE.search(text):
+        raise PolicyCompileError("allow must default to false")
+    bodies = _ALLOW_RE.findall(text)
+    if len(bodies) != 1:
+        raise PolicyCompileError(f"expected one allow rule, found {len(bodies)}")
+
+    action: str | None = None
+    require_role = False
+    table_name: str | None = None
+    for statement in (s.strip() for s in re.split(r"[\n;]", bodies[0])):
+        statement = " ".join(statement.split())
+        if not statement:
+            continue
+        if m := _ACTION_RE.match(statement):
+            action = m.group(1)
+        elif statement == _ROLE_SET:
+            require_role = True
+        elif m := _TIER_RE.match(statement):
+            table_name = m.group(1)
+        else:
+            raise PolicyCompileError(f"unsupported statement: {statement}")
+    if table_name is None:
+        raise PolicyCompileError("allow has no tier lookup")
+
+    literal = re.search(
+        _TABLE_RE.format(name=re.escape(table_name)), text, re.MULTILINE | re.DOTALL
+    )
+    if literal is None:
+        raise PolicyCompileError(f"{table_name} is not an object literal")
+    try:
+        table = json.loads(re.sub(r",\s*}", "}", literal.group(1)))
+    except json.JSONDecodeError as e:
+        raise PolicyCompileError(f"{table_name} is not a literal table: {e}") from e
+    if not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in table.values()):
+        raise PolicyCompileError(f"{table_name} values must be numbers")
+    # Any other rule would be part of the package document (and might matter)
+    rest = text
+    for known in (package.group(0), _DEFAULT_RE.search(text).group(0), literal.group(0)):
+        rest = rest.replace(known, "")
+    rest = _ALLOW_RE.sub("", rest)
+    rest = _IMPORT_RE.sub("", rest)
+    if rest.strip():
+        raise PolicyCompileError(f"unsupported rules: {' '.join(rest.split())[:80]}")
+    return CompiledPolicy(
+        package=package.group(1),
+        action=action,
+        require_role=require_role,
+        table_name=table_name,
+        table=table,
+        revision=hashlib.sha256(source.encode()).hexdigest()[:16],
+    )
+
+
+class EmbeddedPolicyEngine(PolicyEngine):
+    """Compiled data_access policy evaluated in-process; OPA for everything else."""
+
+    def __init__(
+        self,
+        fallback: PolicyEngine | None = None,
+        source: str | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self._fallback = fallback
+        self._source = source or settings.policy_embedded_source
+        self._transport = transport
+        self._policy: CompiledPolicy | None = None
+        self._refresh_task: asyncio.Task[None] | None = None
+
+    @property
+    def policy(self) -> CompiledPolicy | None:
+        return self._policy
+
+    async def start(self) -> None:
+        await self.refresh()
+        if self._fallback is not None:
+            await self._fallback.start()
+        if settings.policy_embedded_refresh_seconds > 0:
+            self._refresh_task = asyncio.create_task(self._run_refresh_loop())
+
+    async def close(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+        if self._fallback is not None:
+            await self._fallback.close()
+
+    async def _load(self) -> CompiledPolicy:
+        if self._source != "opa":
+            path = Path(self._source)
+            text = await asyncio.to_thread(path.read_text)
+            if path.suffix == ".json":
+                return CompiledPolicy.from_dict(json.loads(text))
+            return compile_rego(text)
+        package = settings.opa_policy_path.replace("/", ".")
+        async with httpx.AsyncClient(timeout=10.0, transport=self._transport) as client:
+            r = await client.get(f"{settings.opa_url.rstrip('/')}/policies")
+            r.raise_for_status()
+        modules = [
+            m.get("raw", "")
+            for m in r.json().get("result", [])
+            if (found := _PACKAGE_RE.search(_COMMENT_RE.sub("", m.get("raw", ""))))
+            and found.group(1) == package
+        ]
+        if len(modules) != 1:
+            # Several modules in one package merge into one document; leave that to OPA
+            raise PolicyCompileError(f"OPA serves {len(modules)} modules for package {package}")
+        return compile_rego(modules[0])
+
+    async def refresh(self) -> None:
+        """Reload and recompile the policy.
+
+        A module that no longer compiles clears the compiled policy, sending
+        every decision to OPA; a failed load keeps the previous one.
+        """
+        try:
+            policy = await self._load()
+        except PolicyCompileError as e:
+            logger.warning("embedded_policy_not_compiled", reason=str(e), message="using OPA")
+            self._policy = None
+            return
+        except Exception as e:
+            logger.warning(
+                "embedded_policy_load_failed",
+                source=self._source,
+                error=str(e),
+                error_type=type(e).__name__,
+            )
+            return
+        if self._policy is None or policy.revision != self._policy.revision:
+            logger.info("embedded_policy_loaded", package=policy.package, revision=policy.revision)
+        self._policy = policy
+
+    async def _run_refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(settings.policy_embedded_refresh_seconds)
+            await self.refresh()
+
+    async def evaluate(
+        self,
+        user: dict[str, Any],
+        action: str,
+        data_product: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Evaluate in-process when the policy and input are compiled, else ask OPA.
+
+        Fails secure (deny) when neither can answer.
+        """
+        policy = self._policy
+        if policy is not None:
+            allowed = policy.allow({"user": user, "action": action, "data_product": data_product})
+            if allowed is not None:
+                metrics.record_policy_engine("embedded")
+                return policy.document(allowed)
+        if self._fallback is None:
+            return cached_policy_fallback(user, action, data_product)
+        metrics.record_policy_engine("opa")
+        return await self._fallback.evaluate(user, action, data_product)
+
+    async def evaluate_many(
+        self,
+        user: dict[str, Any],
+        action: str,
+        data_products: list[dict[str, Any]],
+    ) -> list[dict[str, Any]]:
+        """Decide compiled inputs in-process; send the rest to OPA as one batch."""
+        start = time.time()
+        policy = self._policy
+        decisions: list[dict[str, Any] | None] = [None] * len(data_products)
+        if policy is not None:
+            for i, product in enumerate(data_products):
+                allowed = policy.allow({"user": user, "action": action, "data_product": product})
+                if allowed is not None:
+                    decisions[i] = policy.document(allowed)
+        rest = [i for i, d in enumerate(decisions) if d is None]
+        metrics.record_policy_engine("embedded", len(data_products) - len(rest))
+        if rest and self._fallback is not None:
+            metrics.record_policy_engine("opa", len(rest))
+            # The fallback records the batch metric for the call it makes
+            remote = await self._fallback.evaluate_many(
+                user, action, [data_products[i] for i in rest]
+            )
+            for i, decision in zip(rest, remote, strict=True):
+                decisions[i] = decision
+        else:
+            for i in rest:
+                decisions[i] = cached_policy_fallback(user, action, data_products[i])
+            metrics.record_policy_batch(len(data_products), time.time() - start)
+        return [d for d in decisions if d is not None]
+
+    async def health(self) -> bool:
+        if self._policy is not None:
+            return True
+        return self._fallback is not None and await self._fallback.health()
@@ -8,7 +8,7 @@ from neo4j.exceptions import ServiceUnavailable, SessionExpired
 from ecp.adapters.base import GraphStore
 from ecp.config import settings
 from ecp.observability import get_logger, metrics
-from ecp.resilience import with_retry
+from ecp.resilience import with_concurrency_limit, with_retry
 from ecp.resilience.degradation import DegradationMode, registry_only_fallback
 from ecp.resilience.exceptions import StoreConnectionError
 
@@ -39,6 +39,7 @@ class Neo4jGraphStore(GraphStore):
         await self._driver.close()
 
     @with_retry(max_attempts=3, store_name="neo4j")
+    @with_concurrency_limit("neo4j", latency_target=settings.neo4j_latency_target_seconds)
     async def get_metric_by_id(self, metric_id: str) -> dict[str, Any] | None:
         """Get metric by ID with retry protection.
 
@@ -70,6 +71,7 @@ class Neo4jGraphStore(GraphStore):
             raise StoreConnectionError("neo4j", str(e)) from e
 
     @with_retry(max_attempts=3, store_name="neo4j")
+    @with_concurrency_limit("neo4j", latency_target=settings.neo4j_latency_target_seconds)
     async def resolve_region(self, region_code: str, context: str | None) -> dict[str, Any] | None:
         """Resolve region code to countries with retry protection.
 
@@ -103,6 +105,7 @@ class Neo4jGraphStore(GraphStore):
             raise StoreConnectionError("neo4j", str(e)) from e
 
     @with_retry(max_attempts=3, store_name="neo4j")
+    @with_concurrency_limit("neo4j", latency_target=settings.neo4j_latency_target_seconds)
     async def get_lineage(self, target: str, depth: int = 3) -> dict[str, Any]:
         """Get data lineage for a target asset with retry protection.
 
@@ -139,6 +142,7 @@ class Neo4jGraphStore(GraphStore):
             raise StoreConnectionError("neo4j", str(e)) from e
 
     @with_retry(max_attempts=3, store_name="neo4j")
+    @with_concurrency_limit("neo4j", latency_target=settings.neo4j_latency_target_seconds)
     async def list_metrics_for_dimension(self, dimension: str, domain: str | None, certification_tier: int | None) -> list[dict[str, Any]]:
         """List metrics that use a specific dimension with retry protection.
 
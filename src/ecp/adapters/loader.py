@@ -0,0 +1,77 @@
+"""Request-scoped batching loader for Asset Registry lookups.
+
+Asset references come from many places during one resolution (graph nodes
+carry asset_registry_id for glossary terms, tribal knowledge and metrics).
+AssetLoader collects every load() issued in the same event-loop tick, drops
+duplicates, and answers them with a single AssetRegistry.get_assets() call,
+so hydrating N references costs one pool acquire and one query instead of N.
+
+Create one loader per request; results are cached for its lifetime.
+"""
+
+import asyncio
+from typing import Any
+
+from ecp.adapters.base import AssetRegistry
+from ecp.observability import get_logger
+
+logger = get_logger(__name__)
+
+
+class AssetLoader:
+    """Batches and dedupes get_asset calls made in the same event-loop tick."""
+
+    def __init__(self, registry: AssetRegistry, max_batch_size: int = 500) -> None:
+        self._registry = registry
+        self._max_batch_size = max_batch_size
+        self._cache: dict[str, asyncio.Future[dict[str, Any] | None]] = {}
+        self._pending: list[str] = []
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def load(self, asset_id: str) -> dict[str, Any] | None:
+        """Return the asset (or None), batched with other loads from this tick."""
+        future = self._cache.get(asset_id)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._cache[asset_id] = future
+            self._pending.append(asset_id)
+            if len(self._pending) == 1:
+                loop.call_soon(self._dispatch)
+        # Shield so one cancelled caller does not cancel the shared result
+        return await asyncio.shield(future)
+
+    async def load_many(self, asset_ids: list[str]) -> dict[str, dict[str, Any]]:
+        """Return {id: asset} for the ids that exist (one batch for all of them)."""
+        assets = await asyncio.gather(*(self.load(i) for i in asset_ids))
+        return {i: a for i, a in zip(asset_ids, assets, strict=True) if a}
+
+    def clear(self, asset_id: str | None = None) -> None:
+        """Forget cached results (one id, or all) so the next load refetches."""
+        if asset_id is None:
+            self._cache = {i: f for i, f in self._cache.items() if not f.done()}
+        elif (future := self._cache.get(asset_id)) is not None and future.done():
+            del self._cache[asset_id]
+
+    def _dispatch(self) -> None:
+        pending, self._pending = self._pending, []
+        for start in range(0, len(pending), self._max_batch_size):
+            task = asyncio.create_task(self._fetch(pending[start : start + self._max_batch_size]))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _fetch(self, asset_ids: list[str]) -> None:
+        logger.debug("asset_loader_batch", size=len(asset_ids))
+        try:
+            found = await self._registry.get_assets(asset_ids)
+        except Exception as e:
+            for asset_id in asset_ids:
+                # Failed lookups are not cached; a later load retries
+                future = self._cache.pop(asset_id)
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for asset_id in asset_ids:
+            future = self._cache[asset_id]
+            if not future.done():
+                future.set_result(found.get(asset_id))
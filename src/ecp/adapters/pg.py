@@ -0,0 +1,183 @@
+"""Shared asyncpg helpers for the Postgres-backed stores.
+
+- init_connection: pool init hook registering orjson json/jsonb codecs
+- PgPoolManager: process-wide pools keyed by DSN, configured from Settings,
+  created and warmed in the API lifespan and closed on shutdown. Stores that
+  point at the same database share one pool (asyncpg pools are per
+  database, so stores on different databases of one server still get one
+  pool each).
+- InstrumentedPool: records acquire wait time and pool utilization
+"""
+
+import asyncio
+import json
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+from urllib.parse import urlsplit
+
+import asyncpg
+
+from ecp.config import settings
+from ecp.observability import get_logger, metrics
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is a declared dependency
+    orjson = None
+
+logger = get_logger(__name__)
+
+
+def json_dumps(value: Any) -> str:
+    """Encode a Python value for a json/jsonb parameter."""
+    if orjson is not None:
+        return orjson.dumps(value).decode()
+    return json.dumps(value, separators=(",", ":"))
+
+
+json_loads = orjson.loads if orjson is not None else json.loads
+
+
+async def init_connection(conn: asyncpg.Connection) -> None:
+    """Pool ``init`` hook: decode json/jsonb columns straight to Python objects.
+
+    Without a codec asyncpg hands JSONB back as text and every caller pays for
+    its own json.loads plus a dict copy; with it each value is parsed once,
+    in the protocol layer.
+    """
+    for typename in ("json", "jsonb"):
+        await conn.set_type_codec(
+            typename,
+            encoder=json_dumps,
+            decoder=json_loads,
+            schema="pg_catalog",
+            format="text",
+        )
+
+
+def asyncpg_dsn(url: str) -> str:
+    """Strip the SQLAlchemy driver suffix so asyncpg accepts the URL."""
+    return url.replace("postgresql+asyncpg", "postgresql")
+
+
+def pool_name(dsn: str) -> str:
+    """Metric label for a DSN: host/database, without credentials."""
+    parts = urlsplit(dsn)
+    return f"{parts.hostname or 'localhost'}/{parts.path.lstrip('/') or 'postgres'}"
+
+
+class InstrumentedPool:
+    """asyncpg pool wrapper that exports acquire wait time and utilization."""
+
+    def __init__(self, pool: asyncpg.Pool, name: str) -> None:
+        self._pool = pool
+        self.name = name
+
+    @asynccontextmanager
+    async def acquire(self, timeout: float | None = None) -> AsyncIterator[asyncpg.Connection]:
+        start = time.perf_counter()
+        async with self._pool.acquire(timeout=timeout) as conn:
+            metrics.record_db_pool_acquire(self.name, time.perf_counter() - start)
+            self._report()
+            try:
+                yield conn
+            finally:
+                # Reported before release so the gauge reflects peak use
+                self._report()
+
+    def _report(self) -> None:
+        size = self._pool.get_size()
+        metrics.set_db_pool_utilization(
+            self.name,
+            in_use=size - self._pool.get_idle_size(),
+            size=size,
+            max_size=self._pool.get_max_size(),
+        )
+
+    async def close(self) -> None:
+        await self._pool.close()
+
+    def __getattr__(self, item: str) -> Any:
+        return getattr(self._pool, item)
+
+
+class PgPoolManager:
+    """Process-wide asyncpg pools, one per DSN."""
+
+    _pools: dict[str, InstrumentedPool] = {}
+    _lock: asyncio.Lock | None = None
+
+    @classmethod
+    async def get(cls, dsn: str) -> InstrumentedPool:
+        """Return the pool for a DSN, creating it on first use.
+
+        Raises:
+            Exception: Whatever asyncpg raises when the server is unreachable
+        """
+        dsn = asyncpg_dsn(dsn)
+        pool = cls._pools.get(dsn)
+        if pool is not None:
+            return pool
+        if cls._lock is None:
+            cls._lock = asyncio.Lock()
+        async with cls._lock:
+            if dsn not in cls._pools:
+                raw = await asyncpg.create_pool(
+                    dsn,
+                    min_size=settings.pg_pool_min_size,
+                    max_size=settings.pg_pool_max_size,
+                    statement_cache_size=settings.pg_statement_cache_size,
+                    command_timeout=settings.pg_command_timeout_seconds,
+                    max_inactive_connection_lifetime=settings.pg_max_inactive_connection_lifetime,
+                    timeout=settings.pg_connect_timeout_seconds,
+                    init=init_connection,
+                )
+                cls._pools[dsn] = InstrumentedPool(raw, pool_name(dsn))
+                logger.info(
+                    "pg_pool_created",
+                    pool=pool_name(dsn),
+                    min_size=settings.pg_pool_min_size,
+                    max_size=settings.pg_pool_max_size,
+                )
+            return cls._pools[dsn]
+
+    @classmethod
+    async def warm(cls, dsns: list[str]) -> dict[str, bool]:
+        """Create pools and open their minimum connections before traffic arrives.
+
+        Failures are logged, not raised: a store that is down at startup is
+        handled by the adapters' retry and degradation paths.
+
+        Returns:
+            {pool name: warmed}
+        """
+
+        async def _warm(dsn: str) -> bool:
+            try:
+                pool = await cls.get(dsn)
+                # Touch every idle connection so init hooks and TLS are done up front
+                async def _ping() -> None:
+                    async with pool.acquire() as conn:
+                        await conn.fetchval("SELECT 1")
+
+                await asyncio.gather(*(_ping() for _ in range(settings.pg_pool_min_size)))
+                return True
+            except Exception as e:
+                logger.warning("pg_pool_warmup_failed", pool=pool_name(dsn), error=str(e))
+                return False
+
+        unique = list(dict.fromkeys(asyncpg_dsn(d) for d in dsns))
+        results = await asyncio.gather(*(_warm(d) for d in unique))
+        return {pool_name(d): ok for d, ok in zip(unique, results, strict=True)}
+
+    @classmethod
+    async def close_all(cls) -> None:
+        """Close every pool (API shutdown)."""
+        pools, cls._pools = cls._pools, {}
+        for pool in pools.values():
+            try:
+                await pool.close()
+            except Exception as e:
+                logger.warning("pg_pool_close_failed", pool=pool.name, error=str(e))
@@ -1,19 +1,221 @@
-"""OPA policy engine adapter with retry and circuit breaker protection."""
+"""OPA policy engine adapter with retry and circuit breaker protection.
 
+Decisions are cached locally (DecisionCache) keyed by a hash of the input
+document, which has very low cardinality ({role, action, certification_tier}).
+Entries expire after a TTL, are refreshed in the background shortly before
+they expire so hot inputs never wait on OPA, and are flushed as soon as OPA
+reports a different bundle revision. Fallback (degraded) decisions are never
+cached.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
 from typing import Any
 
 import httpx
-from pybreaker import CircuitBreakerError
 
 from ecp.adapters.base import PolicyEngine
 from ecp.config import settings
 from ecp.observability import get_logger, metrics
 from ecp.resilience import with_circuit_breaker, with_retry
 from ecp.resilience.degradation import DegradationMode, cached_policy_fallback
-from ecp.resilience.exceptions import StoreConnectionError, StoreTimeoutError
+from ecp.resilience.exceptions import CircuitBreakerError, StoreConnectionError, StoreTimeoutError
 
 logger = get_logger(__name__)
 
+# (decision, bundle revision or None)
+Evaluation = tuple[dict[str, Any], str | None]
+
+
+def decision_key(input_doc: dict[str, Any]) -> str:
+    """Stable key for a policy input document (sha256 of canonical JSON)."""
+    canonical = json.dumps(input_doc, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def bundle_revision(provenance: dict[str, Any] | None) -> str | None:
+    """Revision fingerprint from OPA's ?provenance=true response, or None without bundles."""
+    if not provenance:
+        return None
+    bundles = provenance.get("bundles") or {}
+    if bundles:
+        return ",".join(f"{name}={b.get('revision', '')}" for name, b in sorted(bundles.items()))
+    return provenance.get("revision")
+
+
+class ResidualNotSupportedError(ValueError):
+    """A partial-evaluation residual that cannot be expressed as query filters."""
+
+
+# Operator refs of unification (=) and comparison (==) in Compile API output
+_EQUALITY = ([{"type": "var", "value": "eq"}], [{"type": "var", "value": "equal"}])
+
+
+def _row_column(term: dict[str, Any]) -> str | None:
+    # input.row.<column> -> column
+    value = term.get("value")
+    if term.get("type") != "ref" or not isinstance(value, list) or len(value) != 3:
+        return None
+    head, row, column = value
+    if head != {"type": "var", "value": "input"} or row != {"type": "string", "value": "row"}:
+        return None
+    return column.get("value") if column.get("type") == "string" else None
+
+
+def residual_filters(queries: list[list[dict[str, Any]]] | None) -> dict[str, list[Any]] | None:
+    """Turn a Compile API residual on input.row into {column: allowed values}.
+
+    Supported residuals are a disjunction of single equalities between one
+    row column and a scalar, e.g. input.row.region = "JP" OR = "KR". An
+    empty query (always true) means no restriction; no queries means no row
+    is visible.
+
+    Raises:
+        ResidualNotSupportedError: For any other residual shape
+    """
+    if not queries:
+        return None
+    allowed: dict[str, list[Any]] = {}
+    for query in queries:
+        if not query:
+            return {}
+        if len(query) != 1 or query[0].get("negated"):
+            raise ResidualNotSupportedError("only single equalities are pushed down")
+        terms = query[0].get("terms")
+        if not isinstance(terms, list) or len(terms) != 3:
+            raise ResidualNotSupportedError("expression is not a comparison")
+        operator, left, right = terms
+        if operator.get("value") not in _EQUALITY:
+            raise ResidualNotSupportedError(f"operator {operator.get('value')}")
+        column = _row_column(left) or _row_column(right)
+        scalar = right if _row_column(left) else left
+        if column is None or scalar.get("type") not in ("string", "number", "boolean"):
+            raise ResidualNotSupportedError("comparison is not row column = scalar")
+        allowed.setdefault(column, []).append(scalar["value"])
+    if len(allowed) > 1:
+        # Disjunction across columns is not a conjunction of IN filters
+        raise ResidualNotSupportedError(f"residual spans columns {sorted(allowed)}")
+    return allowed
+
+
+@dataclass
+class _Decision:
+    result: dict[str, Any]
+    revision: str | None
+    expires_at: float
+
+
+class DecisionCache:
+    """TTL cache of policy decisions with refresh-ahead and revision flush.
+
+    Concurrent misses for the same input share one evaluation. A hit inside
+    the refresh-ahead window returns the cached decision and starts a
+    background refresh, so steady traffic keeps its entries warm.
+    """
+
+    def __init__(
+        self,
+        ttl: float | None = None,
+        refresh_ahead: float | None = None,
+        max_entries: int | None = None,
+    ) -> None:
+        self._ttl = settings.opa_decision_cache_ttl_seconds if ttl is None else ttl
+        self._refresh_ahead = (
+            settings.opa_decision_cache_refresh_ahead_seconds
+            if refresh_ahead is None
+            else refresh_ahead
+        )
+        self._max_entries = max_entries or settings.opa_decision_cache_max_entries
+        self._entries: OrderedDict[str, _Decision] = OrderedDict()
+        self._revision: str | None = None
+        self._inflight: dict[str, asyncio.Task[dict[str, Any]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def revision(self) -> str | None:
+        """Bundle revision the cached decisions were made under."""
+        return self._revision
+
+    def flush(self) -> None:
+        """Drop every cached decision."""
+        self._entries.clear()
+        metrics.record_policy_cache("flush")
+
+    def observe_revision(self, revision: str | None) -> None:
+        """Flush the cache if OPA reports a different bundle revision."""
+        if revision is None or revision == self._revision:
+            return
+        if self._revision is not None:
+            logger.info("policy_bundle_revision_changed", old=self._revision, new=revision)
+            self.flush()
+        self._revision = revision
+
+    def get(self, input_doc: dict[str, Any]) -> dict[str, Any] | None:
+        """Cached decision for input_doc, or None (no background refresh)."""
+        key = decision_key(input_doc)
+        entry = self._entries.get(key)
+        now = time.monotonic()
+        if entry is None or now >= entry.expires_at or entry.revision != self._revision:
+            metrics.record_policy_cache("miss")
+            return None
+        self._entries.move_to_end(key)
+        metrics.record_policy_cache("hit")
+        return entry.result
+
+    def put(self, input_doc: dict[str, Any], result: dict[str, Any], revision: str | None) -> None:
+        """Store a decision made under a bundle revision; degraded decisions are ignored."""
+        self._put(decision_key(input_doc), result, revision)
+
+    def _put(self, key: str, result: dict[str, Any], revision: str | None) -> None:
+        if result.get("degraded"):
+            return
+        self.observe_revision(revision)
+        self._entries[key] = _Decision(result, self._revision, time.monotonic() + self._ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    async def get_or_evaluate(
+        self, input_doc: dict[str, Any], evaluate: Callable[[], Awaitable[Evaluation]]
+    ) -> dict[str, Any]:
+        """Cached decision for input_doc, evaluating (once per input) on a miss."""
+        key = decision_key(input_doc)
+        entry = self._entries.get(key)
+        now = time.monotonic()
+        if entry is not None and now < entry.expires_at and entry.revision == self._revision:
+            self._entries.move_to_end(key)
+            metrics.record_policy_cache("hit")
+            if now >= entry.expires_at - self._refresh_ahead and key not in self._inflight:
+                metrics.record_policy_cache("refresh")
+                self._start(key, evaluate)
+            return entry.result
+        metrics.record_policy_cache("miss")
+        task = self._inflight.get(key) or self._start(key, evaluate)
+        # Shielded: a cancelled caller must not cancel the evaluation others wait on
+        return await asyncio.shield(task)
+
+    def _start(
+        self, key: str, evaluate: Callable[[], Awaitable[Evaluation]]
+    ) -> asyncio.Task[dict[str, Any]]:
+        task = asyncio.get_running_loop().create_task(self._load(key, evaluate))
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return task
+
+    async def _load(
+        self, key: str, evaluate: Callable[[], Awaitable[Evaluation]]
+    ) -> dict[str, Any]:
+        result, revision = await evaluate()
+        self._put(key, result, revision)
+        return result
+
 
 class OPAEngine(PolicyEngine):
     """OPA policy engine with resilience patterns.
@@ -22,6 +224,7 @@ class OPAEngine(PolicyEngine):
     - Automatic retry on transient failures
     - Circuit breaker to prevent cascading failures
     - Fail-secure: deny access when OPA is unavailable
+    - Local decision cache with refresh-ahead and bundle-revision flush
     """
 
     def __init__(
@@ -29,24 +232,32 @@ class OPAEngine(PolicyEngine):
         base_url: str | None = None,
         policy_path: str | None = None,
         fail_open: bool = False,
+        decision_cache: DecisionCache | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
     ) -> None:
         self._base_url = (base_url or settings.opa_url).rstrip("/")
         self._policy_path = policy_path or settings.opa_policy_path
+        self._batch_policy_path = settings.opa_batch_policy_path
+        self._row_filter_path = settings.opa_row_filter_path
         # fail_open=True allows access when OPA is down (DANGEROUS, only for dev)
         self._fail_open = fail_open
+        if decision_cache is None and settings.opa_decision_cache_enabled:
+            decision_cache = DecisionCache()
+        self._cache = decision_cache
+        self._transport = transport
 
     @with_retry(max_attempts=3, store_name="opa")
     async def _evaluate_with_retry(
         self,
         input_doc: dict[str, Any],
-    ) -> dict[str, Any]:
+    ) -> Evaluation:
         """Evaluate policy with retry logic (internal method).
 
         Args:
             input_doc: OPA input document
 
         Returns:
-            Policy decision
+            (policy decision, bundle revision or None)
 
         Raises:
             StoreConnectionError: If cannot connect to OPA
@@ -54,14 +265,16 @@ class OPAEngine(PolicyEngine):
         """
         try:
             path = self._policy_path.replace(".", "/")
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            async with httpx.AsyncClient(timeout=10.0, transport=self._transport) as client:
                 r = await client.post(
                     f"{self._base_url}/data/{path}",
+                    params={"provenance": "true"},
                     json={"input": input_doc},
                 )
                 r.raise_for_status()
                 data = r.json()
-                return data.get("result", data)
+                revision = bundle_revision(data.pop("provenance", None))
+                return data.get("result", data), revision
         except httpx.ConnectError as e:
             raise StoreConnectionError("opa", str(e)) from e
         except httpx.TimeoutException as e:
@@ -78,6 +291,185 @@ class OPAEngine(PolicyEngine):
             # 5xx errors will be retried
             raise StoreConnectionError("opa", f"HTTP {e.response.status_code}") from e
 
+    @with_retry(max_attempts=3, store_name="opa")
+    async def _evaluate_batch_with_retry(
+        self,
+        input_docs: list[dict[str, Any]],
+    ) -> tuple[list[dict[str, Any]] | None, str | None]:
+        """Evaluate several inputs in one call via the batch helper rule.
+
+        Returns:
+            (decisions in input order, or None if the helper is not loaded; bundle revision)
+        """
+        path = self._batch_policy_path.replace(".", "/")
+        try:
+            async with httpx.AsyncClient(timeout=10.0, transport=self._transport) as client:
+                r = await client.post(
+                    f"{self._base_url}/data/{path}/decisions",
+                    params={"provenance": "true"},
+                    json={"input": {"batch": input_docs}},
+                )
+                r.raise_for_status()
+                data = r.json()
+        except httpx.ConnectError as e:
+            raise StoreConnectionError("opa", str(e)) from e
+        except httpx.TimeoutException as e:
+            raise StoreTimeoutError("opa", "evaluate_batch", 10.0) from e
+        except httpx.HTTPStatusError as e:
+            if 400 <= e.response.status_code < 500:
+                logger.error("opa_client_error", status_code=e.response.status_code, error=str(e))
+                raise
+            raise StoreConnectionError("opa", f"HTTP {e.response.status_code}") from e
+        revision = bundle_revision(data.get("provenance"))
+        if "result" not in data:
+            return None, revision
+        decisions = data["result"]
+        # Indices missing from the result had an undefined decision: deny
+        return [decisions.get(str(i), {"allow": False}) for i in range(len(input_docs))], revision
+
+    async def _evaluate_batch_uncached(
+        self, input_docs: list[dict[str, Any]]
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        """One OPA call for all inputs; per-input calls if the helper rule is missing."""
+        try:
+            async with with_circuit_breaker("opa"):
+                decisions, revision = await self._evaluate_batch_with_retry(input_docs)
+                if DegradationMode.is_degraded("opa"):
+                    DegradationMode.mark_recovered("opa")
+        except Exception as e:
+            logger.error(
+                "opa_batch_evaluation_failed",
+                batch_size=len(input_docs),
+                error=str(e),
+                error_type=type(e).__name__,
+                fail_open=self._fail_open,
+                message="OPA evaluation failed, using fail-secure fallback",
+            )
+            if not isinstance(e, CircuitBreakerError):
+                DegradationMode.mark_degraded("opa", str(e))
+                metrics.record_error(error_type=type(e).__name__, component="opa")
+            fallback = [
+                cached_policy_fallback(
+                    doc["user"], doc["action"], doc["data_product"], default_allow=self._fail_open
+                )
+                for doc in input_docs
+            ]
+            return fallback, None
+        if decisions is None:
+            logger.warning(
+                "opa_batch_helper_missing",
+                policy_path=self._batch_policy_path,
+                message="evaluating batch inputs one by one",
+            )
+            evaluated = await asyncio.gather(*(self._evaluate_uncached(d) for d in input_docs))
+            return [result for result, _ in evaluated], revision
+        return decisions, revision
+
+    async def evaluate_many(
+        self,
+        user: dict[str, Any],
+        action: str,
+        data_products: list[dict[str, Any]],
+    ) -> list[dict[str, Any]]:
+        """Evaluate one action on several data products with a single OPA call.
+
+        Identical inputs are evaluated once and cached decisions are reused;
+        the remaining inputs go to OPA together through the batch helper rule
+        (policies/data_access_batch.rego).
+
+        Returns:
+            Decisions in the order of data_products
+        """
+        start = time.time()
+        input_docs = [{"user": user, "action": action, "data_product": p} for p in data_products]
+        keys = [decision_key(doc) for doc in input_docs]
+        unique = dict(zip(keys, input_docs, strict=True))
+        decided: dict[str, dict[str, Any]] = {}
+        if self._cache is not None:
+            for key, doc in unique.items():
+                if (cached := self._cache.get(doc)) is not None:
+                    decided[key] = cached
+        misses = {k: doc for k, doc in unique.items() if k not in decided}
+        if misses:
+            results, revision = await self._evaluate_batch_uncached(list(misses.values()))
+            for (key, doc), result in zip(misses.items(), results, strict=True):
+                decided[key] = result
+                if self._cache is not None:
+                    self._cache.put(doc, result, revision)
+        metrics.record_policy_batch(len(data_products), time.time() - start)
+        return [decided[k] for k in keys]
+
+    @with_retry(max_attempts=3, store_name="opa")
+    async def _compile_with_retry(self, input_doc: dict[str, Any]) -> Evaluation:
+        """Partially evaluate the row rule with input.row unknown (Compile API).
+
+        Returns:
+            ({"row_filters": {column: values} or None}, None)
+        """
+        query = f"data.{self._row_filter_path.replace('/', '.')}.allow_row == true"
+        try:
+            async with httpx.AsyncClient(timeout=10.0, transport=self._transport) as client:
+                r = await client.post(
+                    f"{self._base_url}/compile",
+                    json={"query": query, "input": input_doc, "unknowns": ["input.row"]},
+                )
+                r.raise_for_status()
+                data = r.json()
+        except httpx.ConnectError as e:
+            raise StoreConnectionError("opa", str(e)) from e
+        except httpx.TimeoutException as e:
+            raise StoreTimeoutError("opa", "compile", 10.0) from e
+        except httpx.HTTPStatusError as e:
+            if 400 <= e.response.status_code < 500:
+                logger.error("opa_client_error", status_code=e.response.status_code, error=str(e))
+                raise
+            raise StoreConnectionError("opa", f"HTTP {e.response.status_code}") from e
+        result = data.get("result") or {}
+        if result.get("support"):
+            raise ResidualNotSupportedError("residual needs support modules")
+        return {"row_filters": residual_filters(result.get("queries"))}, None
+
+    async def _row_filters_uncached(self, input_doc: dict[str, Any]) -> Evaluation:
+        try:
+            async with with_circuit_breaker("opa"):
+                return await self._compile_with_retry(input_doc)
+        except Exception as e:
+            logger.error(
+                "opa_row_filter_failed",
+                user_role=input_doc["user"].get("role"),
+                error=str(e),
+                error_type=type(e).__name__,
+                fail_open=self._fail_open,
+                message="Row filters unavailable, using fail-secure fallback",
+            )
+            if not isinstance(e, (CircuitBreakerError, ResidualNotSupportedError)):
+                metrics.record_error(error_type=type(e).__name__, component="opa")
+            # Fail secure: no rows (fail open: no restriction)
+            return {"row_filters": {} if self._fail_open else None, "degraded": True}, None
+
+    async def row_filters(
+        self,
+        user: dict[str, Any],
+        action: str,
+        data_product: dict[str, Any],
+    ) -> dict[str, list[Any]] | None:
+        """Row-level constraints from partial evaluation of the row rule.
+
+        OPA evaluates data.<opa_row_filter_path>.allow_row with input.row
+        unknown; the residual becomes {column: allowed values}. Residuals
+        that are not simple equalities, and OPA failures, fail secure (None:
+        no rows). Results share the decision cache.
+        """
+        input_doc = {"user": user, "action": action, "data_product": data_product}
+        if self._cache is None:
+            result, _ = await self._row_filters_uncached(input_doc)
+        else:
+            result = await self._cache.get_or_evaluate(
+                {**input_doc, "partial": "input.row"},
+                lambda: self._row_filters_uncached(input_doc),
+            )
+        return result["row_filters"]
+
     async def evaluate(
         self,
         user: dict[str, Any],
@@ -86,7 +478,8 @@ class OPAEngine(PolicyEngine):
     ) -> dict[str, Any]:
         """Evaluate policy for user action on data product.
 
-        Includes retry logic, circuit breaker, and fail-secure fallback.
+        Includes decision caching, retry logic, circuit breaker, and
+        fail-secure fallback.
 
         CRITICAL: When OPA is unavailable, this fails SECURE by default
         (denies access) unless fail_open=True was set in constructor.
@@ -104,14 +497,21 @@ class OPAEngine(PolicyEngine):
             "action": action,
             "data_product": data_product,
         }
+        if self._cache is None:
+            result, _ = await self._evaluate_uncached(input_doc)
+            return result
+        return await self._cache.get_or_evaluate(
+            input_doc, lambda: self._evaluate_uncached(input_doc)
+        )
 
+    async def _evaluate_uncached(self, input_doc: dict[str, Any]) -> Evaluation:
+        """Ask OPA, falling back to the fail-secure decision (revision None) on failure."""
+        user = input_doc["user"]
+        action = input_doc["action"]
+        data_product = input_doc["data_product"]
         try:
             # Execute with circuit breaker protection
-            async with with_circuit_breaker(
-                "opa",
-                failure_threshold=5,
-                recovery_timeout=60,
-            ):
+            async with with_circuit_breaker("opa"):
                 result = await self._evaluate_with_retry(input_doc)
 
                 # Mark as recovered if it was degraded
@@ -130,7 +530,10 @@ class OPAEngine(PolicyEngine):
                 message="OPA circuit breaker is open, using fail-secure fallback",
             )
             DegradationMode.mark_degraded("opa", "circuit_breaker_open")
-            return cached_policy_fallback(user, action, data_product, default_allow=self._fail_open)
+            return (
+                cached_policy_fallback(user, action, data_product, default_allow=self._fail_open),
+                None,
+            )
 
         except Exception as e:
             # Other errors: log, mark degraded, use fail-secure fallback
@@ -145,7 +548,10 @@ class OPAEngine(PolicyEngine):
             )
             DegradationMode.mark_degraded("opa", str(e))
             metrics.record_error(error_type=type(e).__name__, component="opa")
-            return cached_policy_fallback(user, action, data_product, default_allow=self._fail_open)
+            return (
+                cached_policy_fallback(user, action, data_product, default_allow=self._fail_open),
+                None,
+            )
 
     async def health(self) -> bool:
         """Check if OPA is healthy.
@@ -154,7 +560,7 @@ class OPAEngine(PolicyEngine):
             True if healthy, False otherwise
         """
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
+            async with httpx.AsyncClient(timeout=5.0, transport=self._transport) as client:
                 r = await client.get(f"{self._base_url.replace('/v1', '')}/health")
                 return r.status_code == 200
         except Exception as e:
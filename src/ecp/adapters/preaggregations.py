@@ -0,0 +1,249 @@
+"""Pre-aggregation advisor: rank Cube rollups by the latency they would save.
+
+Candidates come from the observed workload (ecp.observability.workload):
+each query shape suggests a rollup over its measures and its dimensions plus
+filtered members, and pairs of shapes on the same cube suggest their union
+(up to settings.preagg_max_dimensions dimensions), so one rollup can serve
+several query shapes.
+
+A rollup serves a query when it has all of the query's measures, every
+dimension and filtered member, and the same time dimension at an equal or
+finer granularity. Measures that do not re-aggregate (countDistinct, avg)
+need an exact dimension match. Latency saved is estimated as
+count * (mean latency - settings.preagg_rollup_latency_seconds) over the
+shapes served. Rollups are picked greedily, so each shape's saving is
+counted once and the list is not padded with overlapping rollups.
+
+Usage:
+    from ecp.adapters.preaggregations import recommend_rollups, render_pre_aggregations
+
+    rollups = recommend_rollups(workload.shapes(), schema=load_schema("cube/schema"))
+    print(render_pre_aggregations(rollups)["Revenue"])  # paste into Revenue.js
+"""
+
+import re
+from dataclasses import dataclass, field
+from itertools import combinations
+from typing import Any
+
+from ecp.adapters.cube_schema import CubeSchema, UnsupportedQueryError
+from ecp.config import settings
+from ecp.observability.workload import QueryShape, ShapeStats
+
+_GRANULARITIES = ["second", "minute", "hour", "day", "week", "month", "quarter", "year"]
+_NON_ADDITIVE = {"countDistinct", "avg"}
+# Pair unions are only formed among a cube's most valuable shapes
+_UNION_CANDIDATES = 16
+
+
+@dataclass
+class Rollup:
+    cube: str
+    measures: tuple[str, ...]
+    dimensions: tuple[str, ...]
+    time_dimension: str | None = None
+    granularity: str | None = None
+    name: str = ""
+    saved_seconds: float = 0.0
+    queries: int = 0
+    shapes: list[QueryShape] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "cube": self.cube,
+            "measures": list(self.measures),
+            "dimensions": list(self.dimensions),
+            "time_dimension": self.time_dimension,
+            "granularity": self.granularity,
+            "estimated_saved_seconds": round(self.saved_seconds, 3),
+            "queries_served": self.queries,
+            "shapes_served": len(self.shapes),
+        }
+
+
+def _grain(granularity: str | None) -> int:
+    # Queries on a time dimension without a granularity are served from daily rollups
+    return _GRANULARITIES.index(granularity) if granularity in _GRANULARITIES else 3
+
+
+def _candidate(shape: QueryShape) -> Rollup:
+    return Rollup(
+        cube=shape.cube,
+        measures=shape.measures,
+        dimensions=tuple(sorted(set(shape.dimensions) | set(shape.filters))),
+        time_dimension=shape.time_dimension,
+        granularity=(shape.granularity or "day") if shape.time_dimension else None,
+    )
+
+
+def _key(rollup: Rollup) -> tuple[Any, ...]:
+    return (
+        rollup.cube,
+        rollup.measures,
+        rollup.dimensions,
+        rollup.time_dimension,
+        rollup.granularity,
+    )
+
+
+def _union(a: Rollup, b: Rollup) -> Rollup | None:
+    if a.time_dimension and b.time_dimension and a.time_dimension != b.time_dimension:
+        return None
+    granularities = [r.granularity for r in (a, b) if r.granularity]
+    return Rollup(
+        cube=a.cube,
+        measures=tuple(sorted(set(a.measures) | set(b.measures))),
+        dimensions=tuple(sorted(set(a.dimensions) | set(b.dimensions))),
+        time_dimension=a.time_dimension or b.time_dimension,
+        granularity=min(granularities, key=_grain) if granularities else None,
+    )
+
+
+def _additive(measures: tuple[str, ...], schema: CubeSchema | None) -> bool:
+    if schema is None:
+        return True
+    try:
+        return all(schema.measure(m).type not in _NON_ADDITIVE for m in measures)
+    except UnsupportedQueryError:
+        # Not in the compiled subset; Cube decides, assume it re-aggregates
+        return True
+
+
+def serves(rollup: Rollup, shape: QueryShape, schema: CubeSchema | None = None) -> bool:
+    """True if Cube could answer the query shape from the rollup."""
+    if rollup.cube != shape.cube or not set(shape.measures) <= set(rollup.measures):
+        return False
+    needed = set(shape.dimensions) | set(shape.filters)
+    if not needed <= set(rollup.dimensions):
+        return False
+    if shape.time_dimension:
+        if rollup.time_dimension != shape.time_dimension:
+            return False
+        if _grain(rollup.granularity) > _grain(shape.granularity):
+            return False
+    if _additive(shape.measures, schema):
+        return True
+    return needed == set(rollup.dimensions) and (
+        rollup.time_dimension == shape.time_dimension
+        and (not shape.time_dimension or rollup.granularity == (shape.granularity or "day"))
+    )
+
+
+def _saving(stats: ShapeStats, rollup_latency: float) -> float:
+    return stats.count * max(0.0, stats.mean_seconds - rollup_latency)
+
+
+def _name(rollup: Rollup, taken: set[str]) -> str:
+    measures = [m.partition(".")[2] for m in rollup.measures]
+    dimensions = [d.partition(".")[2] for d in rollup.dimensions]
+    name = measures[0] if len(measures) == 1 else "measures"
+    if dimensions:
+        name += "By" + "".join(d[:1].upper() + d[1:] for d in dimensions)
+    if rollup.granularity:
+        name += rollup.granularity.capitalize()
+    name = re.sub(r"\W", "", name) or "rollup"
+    base, i = name, 2
+    while name in taken:
+        name, i = f"{base}{i}", i + 1
+    taken.add(name)
+    return name
+
+
+def recommend_rollups(
+    shapes: list[ShapeStats],
+    schema: CubeSchema | None = None,
+    top: int = 10,
+    rollup_latency: float | None = None,
+    max_dimensions: int | None = None,
+) -> list[Rollup]:
+    """Rank candidate rollups by estimated latency saved.
+
+    Args:
+        shapes: Workload shapes from WorkloadRecorder.shapes()
+        schema: Compiled Cube schema, used to tell which measures re-aggregate
+        top: Maximum number of rollups to return
+        rollup_latency: Expected query latency from a rollup (seconds)
+        max_dimensions: Largest union rollup to propose
+
+    Returns:
+        Rollups in pick order, each with its marginal saving and the shapes it serves
+    """
+    rollup_latency = (
+        settings.preagg_rollup_latency_seconds if rollup_latency is None else rollup_latency
+    )
+    max_dimensions = max_dimensions or settings.preagg_max_dimensions
+    remaining = {s.shape: s for s in shapes if _saving(s, rollup_latency) > 0}
+
+    candidates: dict[tuple[Any, ...], Rollup] = {}
+    by_cube: dict[str, list[Rollup]] = {}
+    for stats in sorted(remaining.values(), key=lambda s: _saving(s, rollup_latency), reverse=True):
+        rollup = _candidate(stats.shape)
+        key = _key(rollup)
+        if key not in candidates:
+            candidates[key] = rollup
+            by_cube.setdefault(rollup.cube, []).append(rollup)
+    for cube_candidates in by_cube.values():
+        for a, b in combinations(cube_candidates[:_UNION_CANDIDATES], 2):
+            union = _union(a, b)
+            if union is None or len(union.dimensions) > max_dimensions:
+                continue
+            candidates.setdefault(_key(union), union)
+
+    picked: list[Rollup] = []
+    taken: set[str] = set()
+    while remaining and len(picked) < top:
+        best: Rollup | None = None
+        best_served: list[ShapeStats] = []
+        best_score: tuple[float, int] = (0.0, 0)
+        for rollup in candidates.values():
+            served = [s for s in remaining.values() if serves(rollup, s.shape, schema)]
+            # Ties go to the narrower rollup, which is cheaper to build and refresh
+            score = (sum(_saving(s, rollup_latency) for s in served), -len(rollup.dimensions))
+            if score[0] > 0 and (best is None or score > best_score):
+                best, best_served, best_score = rollup, served, score
+        if best is None:
+            break
+        best_saving = best_score[0]
+        best.saved_seconds = best_saving
+        best.queries = sum(s.count for s in best_served)
+        best.shapes = [s.shape for s in best_served]
+        best.name = _name(best, taken)
+        picked.append(best)
+        for s in best_served:
+            del remaining[s.shape]
+        candidates = {k: c for k, c in candidates.items() if c is not best}
+    return picked
+
+
+def _member(name: str) -> str:
+    return f"CUBE.{name.partition('.')[2]}"
+
+
+def render_pre_aggregations(rollups: list[Rollup]) -> dict[str, str]:
+    """Cube `preAggregations` blocks, one per cube, ready to paste into <Cube>.js."""
+    blocks: dict[str, list[str]] = {}
+    for rollup in rollups:
+        lines = [
+            f"    // ~{rollup.saved_seconds:.1f}s saved over {rollup.queries} observed queries",
+            f"    {rollup.name}: {{",
+            f"      measures: [{', '.join(_member(m) for m in rollup.measures)}],",
+        ]
+        if rollup.dimensions:
+            lines.append(f"      dimensions: [{', '.join(_member(d) for d in rollup.dimensions)}],")
+        if rollup.time_dimension:
+            lines.append(f"      timeDimension: {_member(rollup.time_dimension)},")
+            lines.append(f"      granularity: `{rollup.granularity}`,")
+        lines += [
+            f"      refreshKey: {{ every: `{settings.preagg_refresh_every}` }},",
+            "    },",
+        ]
+        blocks.setdefault(rollup.cube, []).extend(lines)
+    return {
+        cube: "\n".join(
+            [f"  // {cube}.js - add inside cube('{cube}', {{ ... }})", "  preAggregations: {"]
+            + lines
+            + ["  },"]
+        )
+        for cube, lines in blocks.items()
+    }
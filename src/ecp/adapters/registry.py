@@ -5,26 +5,63 @@ from typing import Any
 import asyncpg
 
 from ecp.adapters.base import AssetRegistry
+from ecp.adapters.pg import InstrumentedPool, PgPoolManager, asyncpg_dsn
 from ecp.config import settings
+from ecp.observability import get_logger
+
+logger = get_logger(__name__)
+
+# Full-text match (GIN on search_tsv), fuzzy name match (pg_trgm %) or substring
+# match (trigram-indexed ILIKE); ranked by ts_rank, then name similarity
+_SEARCH_GLOSSARY_SQL = """
+WITH q AS (SELECT websearch_to_tsquery('english', $1) AS tsq)
+SELECT id, type, content, metadata,
+       ts_rank(search_tsv, q.tsq) AS rank,
+       similarity(content->>'canonical_name', $1) AS name_similarity
+FROM assets, q
+WHERE type = 'glossary_term'{domain}
+  AND (
+      search_tsv @@ q.tsq
+      OR (content->>'canonical_name') % $1
+      OR (content->>'canonical_name') ILIKE '%' || $1 || '%'
+      OR (content->>'definition') ILIKE '%' || $1 || '%'
+  )
+ORDER BY rank DESC, name_similarity DESC, id
+LIMIT {limit}
+"""
+
+# Pre-migration behaviour (sequential scan)
+_SEARCH_GLOSSARY_ILIKE_SQL = """
+SELECT id, type, content, metadata FROM assets
+WHERE type = 'glossary_term'{domain}
+AND (content->>'canonical_name' ILIKE $1 OR content->>'definition' ILIKE $1)
+ORDER BY id LIMIT {limit}
+"""
+
+
+def _glossary_sql(template: str, domain: str | None) -> str:
+    # Separate statements with and without the domain predicate: a single
+    # "$2 IS NULL OR ..." form gets one generic plan that cannot use
+    # idx_assets_glossary_domain
+    if domain is None:
+        return template.format(domain="", limit="$2")
+    return template.format(domain="\n  AND metadata->>'domain' = $2", limit="$3")
 
 
 class PostgresAssetRegistry(AssetRegistry):
     def __init__(self, database_url: str | None = None) -> None:
-        url = database_url or settings.sync_registry_url
-        if "+asyncpg" in url:
-            url = url.replace("postgresql+asyncpg", "postgresql")
-        self._url = url
-        self._pool: asyncpg.Pool | None = None
+        self._url = asyncpg_dsn(database_url or settings.sync_registry_url)
+        self._pool: InstrumentedPool | None = None
+        self._fts_available = True
 
-    async def _get_pool(self) -> asyncpg.Pool:
+    async def _get_pool(self) -> InstrumentedPool:
         if self._pool is None:
-            self._pool = await asyncpg.create_pool(self._url, min_size=1, max_size=5)
+            self._pool = await PgPoolManager.get(self._url)
         return self._pool
 
     async def close(self) -> None:
-        if self._pool:
-            await self._pool.close()
-            self._pool = None
+        # The pool may be shared; PgPoolManager.close_all() closes it at shutdown
+        self._pool = None
 
     async def get_asset(self, asset_id: str) -> dict[str, Any] | None:
         pool = await self._get_pool()
@@ -33,14 +70,18 @@ class PostgresAssetRegistry(AssetRegistry):
                 "SELECT id, type, content, metadata FROM assets WHERE id = $1",
                 asset_id,
             )
-            if not row:
-                return None
-            return {
-                "id": row["id"],
-                "type": row["type"],
-                "content": dict(row["content"]) if row["content"] else {},
-                "metadata": dict(row["metadata"]) if row["metadata"] else {},
-            }
+            return _to_asset(row) if row else None
+
+    async def get_assets(self, asset_ids: list[str]) -> dict[str, dict[str, Any]]:
+        if not asset_ids:
+            return {}
+        pool = await self._get_pool()
+        async with pool.acquire() as conn:
+            rows = await conn.fetch(
+                "SELECT id, type, content, metadata FROM assets WHERE id = ANY($1::text[])",
+                list(dict.fromkeys(asset_ids)),
+            )
+            return {r["id"]: _to_asset(r) for r in rows}
 
     async def get_assets_by_type(self, asset_type: str, limit: int = 100) -> list[dict[str, Any]]:
         pool = await self._get_pool()
@@ -50,51 +91,54 @@ class PostgresAssetRegistry(AssetRegistry):
                 asset_type,
                 limit,
             )
-            return [
-                {
-                    "id": r["id"],
-                    "type": r["type"],
-                    "content": dict(r["content"]) if r["content"] else {},
-                    "metadata": dict(r["metadata"]) if r["metadata"] else {},
-                }
-                for r in rows
-            ]
+            return [_to_asset(r) for r in rows]
+
+    async def get_assets_page(
+        self, asset_type: str, after_id: str | None = None, limit: int = 100
+    ) -> list[dict[str, Any]]:
+        # Served by idx_assets_type_id; each page is an index range scan
+        pool = await self._get_pool()
+        async with pool.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT id, type, content, metadata FROM assets
+                WHERE type = $1 AND id > $2
+                ORDER BY id LIMIT $3
+                """,
+                asset_type,
+                after_id or "",
+                limit,
+            )
+            return [_to_asset(r) for r in rows]
 
     async def search_glossary(self, query: str, domain: str | None = None, limit: int = 10) -> list[dict[str, Any]]:
+        """Search glossary terms, best match first.
+
+        Uses the weighted tsvector and trigram indexes from
+        scripts/migrations/004_registry_glossary_search.sql: full-text matches
+        rank by ts_rank, with name similarity breaking ties and catching typos.
+        Without the migration this degrades to an unindexed ILIKE scan.
+        """
+        args = [limit] if domain is None else [domain, limit]
         pool = await self._get_pool()
         async with pool.acquire() as conn:
-            if domain:
-                rows = await conn.fetch(
-                    """
-                    SELECT id, type, content, metadata FROM assets
-                    WHERE type = 'glossary_term' AND (metadata->>'domain') = $1
-                    AND (content->>'canonical_name' ILIKE $2 OR content->>'definition' ILIKE $2)
-                    ORDER BY id LIMIT $3
-                    """,
-                    domain,
-                    f"%{query}%",
-                    limit,
-                )
-            else:
+            if self._fts_available:
+                try:
+                    rows = await conn.fetch(
+                        _glossary_sql(_SEARCH_GLOSSARY_SQL, domain), query, *args
+                    )
+                except (asyncpg.UndefinedColumnError, asyncpg.UndefinedFunctionError) as e:
+                    logger.warning(
+                        "registry_glossary_search_unindexed",
+                        error=str(e),
+                        message="apply scripts/migrations/004_registry_glossary_search.sql",
+                    )
+                    self._fts_available = False
+            if not self._fts_available:
                 rows = await conn.fetch(
-                    """
-                    SELECT id, type, content, metadata FROM assets
-                    WHERE type = 'glossary_term'
-                    AND (content->>'canonical_name' ILIKE $1 OR content->>'definition' ILIKE $1)
-                    ORDER BY id LIMIT $2
-                    """,
-                    f"%{query}%",
-                    limit,
+                    _glossary_sql(_SEARCH_GLOSSARY_ILIKE_SQL, domain), f"%{query}%", *args
                 )
-            return [
-                {
-                    "id": r["id"],
-                    "type": r["type"],
-                    "content": dict(r["content"]) if r["content"] else {},
-                    "metadata": dict(r["metadata"]) if r["metadata"] else {},
-                }
-                for r in rows
-            ]
+            return [_to_asset(r) for r in rows]
 
     async def health(self) -> bool:
         try:
@@ -104,3 +148,13 @@ class PostgresAssetRegistry(AssetRegistry):
             return True
         except Exception:
             return False
+
+
+def _to_asset(row: asyncpg.Record) -> dict[str, Any]:
+    # content/metadata arrive decoded (see ecp.adapters.pg.init_connection); no per-row copies
+    return {
+        "id": row["id"],
+        "type": row["type"],
+        "content": row["content"] or {},
+        "metadata": row["metadata"] or {},
+    }
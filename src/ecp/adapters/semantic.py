@@ -1,19 +1,68 @@
-"""Cube semantic layer client with retry and circuit breaker protection."""
+"""Cube semantic layer client with retry and circuit breaker protection.
 
+Queries go through one long-lived httpx.AsyncClient per CubeClient, opened in
+the API lifespan (start()) and closed on shutdown, so connections are kept
+alive and reused instead of paying a TCP/TLS handshake per query.
+
+Slow queries answer {"error": "Continue wait"}; they are re-polled with a
+short, growing interval within the request deadline, and handed back as a
+pending query handle if they outlast it.
+"""
+
+import asyncio
+import time
+import uuid
 from typing import Any
 
 import httpx
-from pybreaker import CircuitBreakerError
 
 from ecp.adapters.base import SemanticLayerClient
 from ecp.config import settings
+from ecp.domain.columnar import ColumnarResult
 from ecp.observability import get_logger, metrics
-from ecp.resilience import with_circuit_breaker, with_retry
+from ecp.resilience import deadline, with_circuit_breaker, with_concurrency_limit, with_retry
 from ecp.resilience.degradation import DegradationMode, approximate_results_fallback
-from ecp.resilience.exceptions import StoreConnectionError, StoreTimeoutError
+from ecp.resilience.exceptions import (
+    CircuitBreakerError,
+    StoreConnectionError,
+    StoreOverloadedError,
+    StoreTimeoutError,
+)
+from ecp.resilience.last_known_good import LastKnownGoodStore
+
+try:
+    import h2  # noqa: F401  # enables httpx HTTP/2 support
+
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
 
 logger = get_logger(__name__)
 
+# Cube's answer to a /load that is still running; the client is expected to re-send it
+CONTINUE_WAIT = "Continue wait"
+
+
+def build_query(measure: str, dimensions: list[str], filters: dict[str, Any]) -> dict[str, Any]:
+    """Cube /load query for a measure, dimensions and equality filters."""
+    measures = [measure] if isinstance(measure, str) else measure
+    query: dict[str, Any] = {
+        "measures": measures,
+        "dimensions": dimensions,
+        "timeDimensions": [],
+    }
+    if filters:
+        query["filters"] = [
+            {"member": k, "operator": "equals", "values": v if isinstance(v, list) else [v]}
+            for k, v in filters.items()
+        ]
+    return query
+
+
+def _columnar(body: dict[str, Any]) -> dict[str, Any]:
+    # Cube returns row dicts; hold them column-wise from here on
+    return {**body, "data": ColumnarResult.coerce(body.get("data"))}
+
 
 class CubeClient(SemanticLayerClient):
     """Cube semantic layer client with resilience patterns.
@@ -22,11 +71,86 @@ class CubeClient(SemanticLayerClient):
     - Automatic retry on transient failures
     - Circuit breaker to prevent cascading failures
     - Graceful degradation with fallback results
+    - Pooled keep-alive connections (optionally HTTP/2) with pool metrics
+    - Last-known-good results (result_store) served when Cube is down
     """
 
-    def __init__(self, base_url: str | None = None, token: str | None = None) -> None:
+    def __init__(
+        self,
+        base_url: str | None = None,
+        token: str | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        result_store: LastKnownGoodStore | None = None,
+    ) -> None:
         self._base_url = (base_url or settings.cube_api_url).rstrip("/")
         self._token = token or settings.cube_api_token
+        self._transport = transport
+        self._result_store = result_store
+        self._client: httpx.AsyncClient | None = None
+        self._in_flight = 0
+        # query_id -> (Cube query, monotonic time of first submit)
+        self._pending: dict[str, tuple[dict[str, Any], float]] = {}
+
+    async def start(self) -> None:
+        """Open the pooled HTTP client (idempotent)."""
+        self._get_client()
+
+    async def close(self) -> None:
+        """Close the HTTP client and its pooled connections."""
+        client, self._client = self._client, None
+        if client is not None:
+            await client.aclose()
+        if self._result_store is not None:
+            await self._result_store.close()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # Created lazily too, so scripts and tests work without a lifespan
+        if self._client is None:
+            http2 = settings.cube_http2 and _HTTP2_AVAILABLE
+            if settings.cube_http2 and not http2:
+                logger.warning(
+                    "cube_http2_unavailable",
+                    message='install the http2 extra (pip install -e ".[http2]"); using HTTP/1.1',
+                )
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(
+                    connect=settings.cube_connect_timeout_seconds,
+                    read=settings.cube_read_timeout_seconds,
+                    write=settings.cube_read_timeout_seconds,
+                    pool=settings.cube_pool_timeout_seconds,
+                ),
+                limits=httpx.Limits(
+                    max_connections=settings.cube_max_connections,
+                    max_keepalive_connections=settings.cube_max_keepalive_connections,
+                    keepalive_expiry=settings.cube_keepalive_expiry_seconds,
+                ),
+                http2=http2,
+                transport=self._transport,
+            )
+            logger.info(
+                "cube_client_opened", http2=http2, max_connections=settings.cube_max_connections
+            )
+        return self._client
+
+    async def _send(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        client = self._get_client()
+        self._in_flight += 1
+        try:
+            return await client.request(method, url, headers=self._headers(), **kwargs)
+        finally:
+            self._in_flight -= 1
+            self._record_pool(client)
+
+    def _record_pool(self, client: httpx.AsyncClient) -> None:
+        # httpx has no public pool stats; read httpcore's pool when the default transport is in use
+        connections = getattr(getattr(client._transport, "_pool", None), "connections", [])
+        metrics.set_http_pool_utilization(
+            "cube_api",
+            in_flight=self._in_flight,
+            open_=len(connections),
+            idle=sum(1 for c in connections if c.is_idle()),
+            max_size=settings.cube_max_connections,
+        )
 
     def _headers(self) -> dict[str, str]:
         h: dict[str, str] = {"Content-Type": "application/json"}
@@ -35,6 +159,7 @@ class CubeClient(SemanticLayerClient):
         return h
 
     @with_retry(max_attempts=3, store_name="cube_api")
+    @with_concurrency_limit("cube_api", latency_target=settings.cube_latency_target_seconds)
     async def _execute_query_with_retry(
         self,
         query: dict[str, Any],
@@ -52,18 +177,19 @@ class CubeClient(SemanticLayerClient):
             StoreTimeoutError: If query times out
         """
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                r = await client.post(
-                    f"{self._base_url}/load",
-                    json={"query": query},
-                    headers=self._headers(),
-                )
-                r.raise_for_status()
-                return r.json()
+            r = await self._send("POST", f"{self._base_url}/load", json={"query": query})
+            r.raise_for_status()
+            return r.json()
         except httpx.ConnectError as e:
             raise StoreConnectionError("cube_api", str(e)) from e
+        except httpx.PoolTimeout as e:
+            raise StoreTimeoutError(
+                "cube_api", "acquire_connection", settings.cube_pool_timeout_seconds
+            ) from e
         except httpx.TimeoutException as e:
-            raise StoreTimeoutError("cube_api", "execute_query", 30.0) from e
+            raise StoreTimeoutError(
+                "cube_api", "execute_query", settings.cube_read_timeout_seconds
+            ) from e
         except httpx.HTTPStatusError as e:
             # Don't retry 4xx errors
             if 400 <= e.response.status_code < 500:
@@ -76,6 +202,52 @@ class CubeClient(SemanticLayerClient):
             # 5xx errors will be retried
             raise StoreConnectionError("cube_api", f"HTTP {e.response.status_code}") from e
 
+    async def _load(self, query: dict[str, Any]) -> dict[str, Any]:
+        """One /load round trip under the circuit breaker (retries happen inside)."""
+        async with with_circuit_breaker("cube_api"):
+            return await self._execute_query_with_retry(query)
+
+    async def _wait_for_result(self, query: dict[str, Any]) -> dict[str, Any] | None:
+        """Poll through "Continue wait" answers.
+
+        Each poll is its own short breaker/retry scope, so a long warehouse
+        query is never counted as a failure. The interval starts small and
+        doubles up to cube_poll_max_interval_seconds; waiting stops at
+        cube_max_wait_seconds or the request deadline, whichever is first.
+
+        Returns:
+            The Cube response, or None if the query is still running
+        """
+        budget = settings.cube_max_wait_seconds
+        left = deadline.remaining()
+        if left is not None:
+            budget = min(budget, left)
+        give_up = time.monotonic() + budget
+        interval = settings.cube_poll_initial_interval_seconds
+        polls = 0
+        while True:
+            body = await self._load(query)
+            polls += 1
+            if body.get("error") != CONTINUE_WAIT:
+                if polls > 1:
+                    logger.debug("cube_query_ready", polls=polls)
+                return body
+            if time.monotonic() + interval >= give_up:
+                return None
+            await asyncio.sleep(interval)
+            interval = min(interval * 2, settings.cube_poll_max_interval_seconds)
+
+    def _pending_handle(self, query: dict[str, Any], query_id: str | None = None) -> dict[str, Any]:
+        now = time.monotonic()
+        ttl = settings.cube_pending_query_ttl_seconds
+        for stale in [k for k, (_, created) in self._pending.items() if now - created > ttl]:
+            del self._pending[stale]
+        query_id = query_id or f"cq_{uuid.uuid4().hex}"
+        created = self._pending.get(query_id, (query, now))[1]
+        self._pending[query_id] = (query, created)
+        logger.info("cube_query_pending", query_id=query_id)
+        return {"status": "pending", "query_id": query_id, "data": []}
+
     async def execute_query(
         self,
         measure: str,
@@ -85,6 +257,8 @@ class CubeClient(SemanticLayerClient):
         """Execute a query against Cube semantic layer.
 
         Includes retry logic, circuit breaker, and graceful degradation.
+        Queries still running when the wait budget runs out return a handle,
+        {"status": "pending", "query_id": ..., "data": []}, for poll_query.
 
         Args:
             measure: Measure(s) to query
@@ -92,55 +266,103 @@ class CubeClient(SemanticLayerClient):
             filters: Query filters
 
         Returns:
-            Query results or fallback results if Cube is unavailable
+            Query results, a pending handle, or fallback results if Cube is unavailable
         """
-        measures = [measure] if isinstance(measure, str) else measure
-        query: dict[str, Any] = {
-            "measures": measures,
-            "dimensions": dimensions,
-            "timeDimensions": [],
-        }
-        if filters:
-            query["filters"] = [
-                {"member": k, "operator": "equals", "values": v if isinstance(v, list) else [v]}
-                for k, v in filters.items()
-            ]
+        query = build_query(measure, dimensions, filters)
 
         try:
-            # Execute with circuit breaker protection
-            async with with_circuit_breaker(
-                "cube_api",
-                failure_threshold=5,
-                recovery_timeout=60,
-            ):
-                result = await self._execute_query_with_retry(query)
+            result = await self._wait_for_result(query)
 
-                # Mark as recovered if it was degraded
-                if DegradationMode.is_degraded("cube_api"):
-                    DegradationMode.mark_recovered("cube_api")
+            # Mark as recovered if it was degraded
+            if DegradationMode.is_degraded("cube_api"):
+                DegradationMode.mark_recovered("cube_api")
 
-                return result
+            if result is None:
+                return self._pending_handle(query)
+            result = _columnar(result)
+            self._remember(query, result)
+            return result
 
-        except CircuitBreakerError:
+        except StoreOverloadedError:
+            # Shed locally at the concurrency limit; Cube itself is fine, so
+            # let the caller answer 503 + Retry-After instead of a fallback
+            raise
+        except Exception as e:
+            return await self._fallback(query, e)
+
+    async def _fallback(self, query: dict[str, Any], error: Exception) -> dict[str, Any]:
+        """Mark Cube degraded and answer from last-known-good or approximate results."""
+        if isinstance(error, CircuitBreakerError):
             # Circuit is open, use fallback immediately
             logger.warning(
                 "cube_circuit_breaker_open",
                 message="Cube API circuit breaker is open, using fallback",
             )
             DegradationMode.mark_degraded("cube_api", "circuit_breaker_open")
-            return approximate_results_fallback(measure, dimensions, filters)
-
-        except Exception as e:
+        else:
             # Other errors: log, mark degraded, use fallback
             logger.error(
                 "cube_query_failed",
-                error=str(e),
-                error_type=type(e).__name__,
+                error=str(error),
+                error_type=type(error).__name__,
                 message="Cube query failed, using fallback",
             )
-            DegradationMode.mark_degraded("cube_api", str(e))
-            metrics.record_error(error_type=type(e).__name__, component="cube_api")
-            return approximate_results_fallback(measure, dimensions, filters)
+            DegradationMode.mark_degraded("cube_api", str(error))
+            metrics.record_error(error_type=type(error).__name__, component="cube_api")
+        measures = query["measures"]
+        filters = {f["member"]: f["values"] for f in query.get("filters", [])}
+        return approximate_results_fallback(
+            measures[0] if len(measures) == 1 else measures,
+            query["dimensions"],
+            filters,
+            await self._last_known_good(query),
+        )
+
+    def _remember(self, query: dict[str, Any], result: dict[str, Any]) -> None:
+        if self._result_store is not None and "error" not in result:
+            self._result_store.put_nowait(query, result)
+
+    async def _last_known_good(self, query: dict[str, Any]) -> tuple[dict[str, Any], float] | None:
+        if self._result_store is None:
+            return None
+        hit = await self._result_store.get(query)
+        return (_columnar(hit[0]), hit[1]) if hit else None
+
+    async def poll_query(self, query_id: str) -> dict[str, Any] | None:
+        """Check on a pending query, waiting up to the usual budget.
+
+        Args:
+            query_id: Handle returned by execute_query
+
+        Returns:
+            Results (the handle is released), the pending handle again,
+            fallback results if Cube is unavailable (as in execute_query), or
+            None for an unknown or expired handle
+        """
+        entry = self._pending.get(query_id)
+        if entry is None:
+            return None
+        query, created = entry
+        if time.monotonic() - created > settings.cube_pending_query_ttl_seconds:
+            del self._pending[query_id]
+            logger.info("cube_pending_query_expired", query_id=query_id)
+            return None
+        try:
+            result = await self._wait_for_result(query)
+        except StoreOverloadedError:
+            # The handle stays valid; the caller polls again after Retry-After
+            raise
+        except Exception as e:
+            self._pending.pop(query_id, None)
+            return await self._fallback(query, e)
+        if DegradationMode.is_degraded("cube_api"):
+            DegradationMode.mark_recovered("cube_api")
+        if result is None:
+            return self._pending_handle(query, query_id)
+        self._pending.pop(query_id, None)
+        result = _columnar(result)
+        self._remember(query, result)
+        return result
 
     async def health(self) -> bool:
         """Check if Cube API is healthy.
@@ -149,12 +371,8 @@ class CubeClient(SemanticLayerClient):
             True if healthy, False otherwise
         """
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                r = await client.get(
-                    f"{self._base_url.replace('/v1', '')}/readyz",
-                    headers=self._headers(),
-                )
-                return r.status_code == 200
+            r = await self._send("GET", f"{self._base_url.replace('/v1', '')}/readyz", timeout=5.0)
+            return r.status_code == 200
         except Exception as e:
             logger.debug("cube_health_check_failed", error=str(e))
             return False
@@ -0,0 +1,205 @@
+"""Semantic layer queries compiled from the Cube schema and run without Cube.
+
+- SqlSemanticLayer compiles Cube queries (ecp.adapters.cube_schema) to
+  parameterized SQL and runs them on a SqlExecutor: PostgresExecutor over a
+  pooled asyncpg connection to the warehouse, or SqliteExecutor (embedded,
+  for tests and local development).
+- RoutedSemanticLayer routes each query by measure: certified measures that
+  compile run on the warehouse directly, saving the Cube hop; everything else,
+  and any embedded failure, goes to Cube.
+
+Enable with SEMANTIC_ENGINE=routed.
+"""
+
+import asyncio
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+
+from ecp.adapters.base import SemanticLayerClient
+from ecp.adapters.cube_schema import CubeSchema, UnsupportedQueryError
+from ecp.adapters.pg import InstrumentedPool, PgPoolManager, asyncpg_dsn
+from ecp.adapters.semantic import build_query
+from ecp.domain.columnar import ColumnarResult
+from ecp.observability import get_logger, metrics
+
+logger = get_logger(__name__)
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+class SqlExecutor(ABC):
+    """Runs compiled SQL and returns the result column-wise."""
+
+    placeholder = "$"
+
+    @abstractmethod
+    async def fetch(self, sql: str, params: list[Any]) -> ColumnarResult:
+        """Execute a query and return its result."""
+        ...
+
+    @abstractmethod
+    async def health(self) -> bool:
+        """Health check."""
+        ...
+
+
+class PostgresExecutor(SqlExecutor):
+    """Warehouse queries over the shared asyncpg pool for the DSN."""
+
+    placeholder = "$"
+
+    def __init__(self, dsn: str) -> None:
+        self._dsn = asyncpg_dsn(dsn)
+        self._pool: InstrumentedPool | None = None
+
+    async def _get_pool(self) -> InstrumentedPool:
+        if self._pool is None:
+            self._pool = await PgPoolManager.get(self._dsn)
+        return self._pool
+
+    async def fetch(self, sql: str, params: list[Any]) -> ColumnarResult:
+        pool = await self._get_pool()
+        async with pool.acquire() as conn:
+            # Prepared (and cached per connection) so column names are known even for 0 rows
+            statement = await conn.prepare(sql)
+            rows = await statement.fetch(*params)
+            columns = [a.name for a in statement.get_attributes()]
+        result = ColumnarResult.from_tuples(columns, rows)
+        result.values = [[_jsonable(v) for v in col] for col in result.values]
+        return result
+
+    async def health(self) -> bool:
+        try:
+            pool = await self._get_pool()
+            async with pool.acquire() as conn:
+                await conn.fetchval("SELECT 1")
+            return True
+        except Exception:
+            return False
+
+
+class SqliteExecutor(SqlExecutor):
+    """Embedded SQLite engine; queries run in a worker thread."""
+
+    placeholder = "?"
+
+    def __init__(self, database: str = ":memory:", script: str | None = None) -> None:
+        self._conn = sqlite3.connect(database, check_same_thread=False)
+        self._lock = threading.Lock()
+        if script:
+            self._conn.executescript(script)
+
+    def _fetch(self, sql: str, params: list[Any]) -> ColumnarResult:
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+            columns = [c[0] for c in cursor.description]
+            return ColumnarResult.from_tuples(columns, cursor.fetchall())
+
+    async def fetch(self, sql: str, params: list[Any]) -> ColumnarResult:
+        return await asyncio.to_thread(self._fetch, sql, params)
+
+    async def health(self) -> bool:
+        return True
+
+
+class SqlSemanticLayer(SemanticLayerClient):
+    """Semantic layer over compiled Cube schema, executed directly on SQL."""
+
+    def __init__(self, schema: CubeSchema, executor: SqlExecutor) -> None:
+        self._schema = schema
+        self._executor = executor
+
+    def supports(self, query: dict[str, Any], certified_only: bool = True) -> bool:
+        """True if the query compiles (and every measure is certified, if required)."""
+        try:
+            self._schema.compile(query, self._executor.placeholder)
+            measures = [self._schema.measure(m) for m in query.get("measures") or []]
+        except UnsupportedQueryError:
+            return False
+        return not certified_only or all(m.meta.get("certification_tier") for m in measures)
+
+    async def execute_query(
+        self, measure: str, dimensions: list[str], filters: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Compile and run a query.
+
+        Raises:
+            UnsupportedQueryError: If the query is outside the compiled subset
+        """
+        return await self.execute_compiled(build_query(measure, dimensions, filters))
+
+    async def execute_compiled(self, query: dict[str, Any]) -> dict[str, Any]:
+        """Run a Cube-shaped query ({measures, dimensions, filters})."""
+        sql, params = self._schema.compile(query, self._executor.placeholder)
+        start = time.time()
+        try:
+            data = await self._executor.fetch(sql, params)
+        except Exception as e:
+            metrics.record_store_query("warehouse", time.time() - start, error=type(e).__name__)
+            raise
+        metrics.record_store_query("warehouse", time.time() - start)
+        members = {
+            "measures": {m: self._schema.measure(m).type for m in query.get("measures") or []},
+            "dimensions": {
+                d: self._schema.dimension(d).type for d in query.get("dimensions") or []
+            },
+        }
+        return {"data": data, "annotation": {**members, "engine": "embedded"}}
+
+    async def health(self) -> bool:
+        return await self._executor.health()
+
+
+class RoutedSemanticLayer(SemanticLayerClient):
+    """Per-measure routing between the embedded SQL engine and Cube."""
+
+    def __init__(self, cube: SemanticLayerClient, embedded: SqlSemanticLayer) -> None:
+        self._cube = cube
+        self._embedded = embedded
+
+    async def start(self) -> None:
+        await self._cube.start()
+
+    async def close(self) -> None:
+        await self._cube.close()
+
+    async def execute_query(
+        self, measure: str, dimensions: list[str], filters: dict[str, Any]
+    ) -> dict[str, Any]:
+        query = build_query(measure, dimensions, filters)
+        if self._embedded.supports(query):
+            try:
+                result = await self._embedded.execute_compiled(query)
+                metrics.record_semantic_route("embedded")
+                return result
+            except Exception as e:
+                logger.warning(
+                    "embedded_semantic_query_failed",
+                    measure=measure,
+                    error=str(e),
+                    error_type=type(e).__name__,
+                    message="falling back to Cube",
+                )
+                metrics.record_semantic_route("embedded_fallback")
+        else:
+            metrics.record_semantic_route("cube")
+        return await self._cube.execute_query(measure, dimensions, filters)
+
+    async def poll_query(self, query_id: str) -> dict[str, Any] | None:
+        # Only Cube queries can be pending
+        return await self._cube.poll_query(query_id)
+
+    async def health(self) -> bool:
+        cube_ok, embedded_ok = await asyncio.gather(self._cube.health(), self._embedded.health())
+        return cube_ok or embedded_ok
@@ -1,68 +1,115 @@
 """pgvector store adapter with retry protection - semantic search over glossary and tribal knowledge."""
 
 import asyncio
+import time
 from typing import Any
 
 import asyncpg
 
 from ecp.adapters.base import VectorStore
+from ecp.adapters.pg import InstrumentedPool, PgPoolManager, json_dumps
 from ecp.config import settings
-from ecp.observability import get_logger
-from ecp.resilience import with_retry
+from ecp.index.embedding import Embedder, get_embedder
+from ecp.index.fusion import reciprocal_rank_fusion
+from ecp.index.keyword import KeywordIndex
+from ecp.observability import get_logger, metrics
+from ecp.resilience import with_concurrency_limit, with_retry
 from ecp.resilience.degradation import DegradationMode, keyword_search_fallback
-from ecp.resilience.exceptions import StoreConnectionError, StoreTimeoutError
+from ecp.resilience.exceptions import (
+    StoreConnectionError,
+    StoreOverloadedError,
+    StoreTimeoutError,
+)
 
 logger = get_logger(__name__)
 
+# Quantized first pass over the halfvec HNSW index (migration 002), then exact
+# float32 rescoring of top_k * settings.vector_rescore_factor candidates
+_HALFVEC_SEARCH_SQL = """
+WITH candidates AS (
+    SELECT id, type, content_text, metadata, embedding FROM embeddings
+    {where}
+    ORDER BY embedding_half <=> $1::real[]::vector::halfvec LIMIT $2
+)
+SELECT id, type, content_text, metadata,
+       1 - (embedding <=> $1::real[]::vector) AS score
+FROM candidates
+ORDER BY embedding <=> $1::real[]::vector LIMIT $3
+"""
+
+# Per-type top-k in one statement: one LATERAL probe per (type, metadata filter)
+# pair, each served by that type's partial indexes (migration 003)
+_MULTI_SEARCH_SQL = """
+SELECT t.type, h.id, h.content_text, h.metadata, h.score
+FROM unnest($2::text[], $3::text[]) AS t(type, filter)
+CROSS JOIN LATERAL (
+    SELECT c.id, c.content_text, c.metadata, 1 - (c.embedding <=> $1::real[]::vector) AS score
+    FROM (
+        SELECT e.id, e.content_text, e.metadata, e.embedding FROM embeddings e
+        WHERE e.type = t.type AND e.metadata @> t.filter::jsonb
+        ORDER BY {distance} LIMIT $5
+    ) c
+    ORDER BY c.embedding <=> $1::real[]::vector LIMIT $4
+) h
+ORDER BY t.type, h.score DESC
+"""
+
 
 class PgVectorStore(VectorStore):
     """pgvector store with resilience patterns.
 
     Features:
     - Automatic retry on transient failures
-    - Connection pooling
-    - Graceful degradation with keyword fallback
+    - Shared, pre-warmed connection pool (PgPoolManager)
+    - Graceful degradation with BM25 keyword index fallback
+    - Hybrid lexical + vector retrieval with reciprocal rank fusion
+    - Optional halfvec first pass with float32 rescoring (settings.vector_quantization)
     """
 
-    def __init__(self, connection_string: str | None = None) -> None:
+    def __init__(
+        self,
+        connection_string: str | None = None,
+        keyword_index: KeywordIndex | None = None,
+        embedder: Embedder | None = None,
+    ) -> None:
         self._conn_str = connection_string or settings.pgvector_connection_string
-        self._pool: asyncpg.Pool | None = None
+        self._pool: InstrumentedPool | None = None
+        self._keyword_index = keyword_index
+        self._embedder = embedder
+
+    async def _embed_query(self, query_text: str) -> list[float]:
+        # Must match the embedder used by ecp.ingest.embeddings. Loading and
+        # running the model are CPU-bound, so both stay off the event loop.
+        if self._embedder is None:
+            self._embedder = await asyncio.to_thread(get_embedder)
+        vectors = await asyncio.to_thread(self._embedder.embed, [query_text])
+        return vectors[0]
 
-    async def _get_pool(self) -> asyncpg.Pool:
+    async def _get_pool(self) -> InstrumentedPool:
         if self._pool is None:
             try:
-                self._pool = await asyncpg.create_pool(
-                    self._conn_str,
-                    min_size=1,
-                    max_size=5,
-                    timeout=10.0,
-                )
+                self._pool = await PgPoolManager.get(self._conn_str)
             except Exception as e:
                 logger.error("pgvector_pool_creation_failed", error=str(e))
                 raise StoreConnectionError("pgvector", str(e)) from e
         return self._pool
 
     async def close(self) -> None:
-        if self._pool:
-            await self._pool.close()
-            self._pool = None
+        # The pool may be shared; PgPoolManager.close_all() closes it at shutdown
+        self._pool = None
 
     @with_retry(max_attempts=3, store_name="pgvector")
-    async def search(
+    @with_concurrency_limit("pgvector", latency_target=settings.pgvector_latency_target_seconds)
+    async def _search_with_retry(
         self,
-        query_text: str,
-        type_filter: str | None = None,
-        top_k: int = 5,
+        query_vector: list[float],
+        type_filter: str | None,
+        top_k: int,
     ) -> list[dict[str, Any]]:
-        """Search for similar embeddings with retry protection.
+        """Search for similar embeddings with retry logic (internal method).
 
-        Args:
-            query_text: Query text
-            type_filter: Optional type filter (e.g., "glossary_term")
-            top_k: Number of results to return
-
-        Returns:
-            List of search results with scores
+        Takes the query already embedded, so retries and the concurrency
+        limit cover only the database round-trip.
 
         Raises:
             StoreConnectionError: If cannot connect to pgvector
@@ -70,49 +117,127 @@ class PgVectorStore(VectorStore):
         """
         try:
             pool = await self._get_pool()
-            # Simple text match for demo (no embedding of query_text)
-            # In production: use query embedding and similarity search
             async with pool.acquire(timeout=5.0) as conn:
-                if type_filter:
+                if settings.vector_quantization == "halfvec":
+                    candidates = top_k * max(settings.vector_rescore_factor, 1)
                     rows = await conn.fetch(
-                        "SELECT id, type, content_text, metadata FROM embeddings WHERE type = $1 LIMIT $2",
-                        type_filter,
+                        _HALFVEC_SEARCH_SQL.format(where="WHERE type = $4" if type_filter else ""),
+                        query_vector,
+                        candidates,
                         top_k,
+                        *([type_filter] if type_filter else []),
                     )
-                else:
+                elif type_filter:
                     rows = await conn.fetch(
-                        "SELECT id, type, content_text, metadata FROM embeddings WHERE content_text ILIKE $1 LIMIT $2",
-                        f"%{query_text}%",
+                        """
+                        SELECT id, type, content_text, metadata,
+                               1 - (embedding <=> $1::real[]::vector) AS score
+                        FROM embeddings WHERE type = $2
+                        ORDER BY embedding <=> $1::real[]::vector LIMIT $3
+                        """,
+                        query_vector,
+                        type_filter,
                         top_k,
                     )
-                if not rows and not type_filter:
+                else:
                     rows = await conn.fetch(
-                        "SELECT id, type, content_text, metadata FROM embeddings LIMIT $1",
+                        """
+                        SELECT id, type, content_text, metadata,
+                               1 - (embedding <=> $1::real[]::vector) AS score
+                        FROM embeddings
+                        ORDER BY embedding <=> $1::real[]::vector LIMIT $2
+                        """,
+                        query_vector,
                         top_k,
                     )
 
-                # Mark as recovered if it was degraded
-                if DegradationMode.is_degraded("pgvector"):
-                    DegradationMode.mark_recovered("pgvector")
-
-                return [
-                    {
-                        "id": r["id"],
-                        "type": r["type"],
-                        "content_text": r["content_text"],
-                        "metadata": dict(r["metadata"]) if r["metadata"] else {},
-                        "score": 0.85,
-                    }
-                    for r in rows
-                ]
+                return [_to_hit(r) for r in rows]
         except asyncpg.PostgresConnectionError as e:
             logger.error("pgvector_connection_error", error=str(e))
             raise StoreConnectionError("pgvector", str(e)) from e
-        except asyncio.TimeoutError as e:
+        except TimeoutError as e:
             logger.error("pgvector_timeout", error=str(e))
             raise StoreTimeoutError("pgvector", "search", 5.0) from e
+
+    @with_retry(max_attempts=3, store_name="pgvector")
+    @with_concurrency_limit("pgvector", latency_target=settings.pgvector_latency_target_seconds)
+    async def _search_multi_with_retry(
+        self,
+        query_vector: list[float],
+        types: list[str],
+        top_k: int,
+        filters: dict[str, dict[str, Any]],
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Per-type search in a single round-trip with retry logic (internal method).
+
+        Takes the query already embedded, like _search_with_retry.
+
+        Raises:
+            StoreConnectionError: If cannot connect to pgvector
+            StoreTimeoutError: If query times out
+        """
+        if settings.vector_quantization == "halfvec":
+            distance = "e.embedding_half <=> $1::real[]::vector::halfvec"
+            candidates = top_k * max(settings.vector_rescore_factor, 1)
+        else:
+            distance = "e.embedding <=> $1::real[]::vector"
+            candidates = top_k
+        try:
+            pool = await self._get_pool()
+            async with pool.acquire(timeout=5.0) as conn:
+                rows = await conn.fetch(
+                    _MULTI_SEARCH_SQL.format(distance=distance),
+                    query_vector,
+                    types,
+                    [json_dumps(filters.get(t) or {}) for t in types],
+                    top_k,
+                    candidates,
+                )
+        except asyncpg.PostgresConnectionError as e:
+            logger.error("pgvector_connection_error", error=str(e))
+            raise StoreConnectionError("pgvector", str(e)) from e
+        except TimeoutError as e:
+            logger.error("pgvector_timeout", error=str(e))
+            raise StoreTimeoutError("pgvector", "search_multi", 5.0) from e
+
+        results: dict[str, list[dict[str, Any]]] = {t: [] for t in types}
+        for r in rows:
+            results[r["type"]].append(_to_hit(r))
+        return results
+
+    async def search(
+        self,
+        query_text: str,
+        type_filter: str | None = None,
+        top_k: int = 5,
+    ) -> list[dict[str, Any]]:
+        """Search for similar embeddings.
+
+        Includes retry logic and graceful degradation: when pgvector cannot
+        answer, results come from the in-memory BM25 keyword index.
+
+        Args:
+            query_text: Query text
+            type_filter: Optional type filter (e.g., "glossary_term")
+            top_k: Number of results to return
+
+        Returns:
+            List of search results with scores
+        """
+        try:
+            query_vector = await self._embed_query(query_text)
+            results = await self._search_with_retry(query_vector, type_filter, top_k)
+
+            # Mark as recovered if it was degraded
+            if DegradationMode.is_degraded("pgvector"):
+                DegradationMode.mark_recovered("pgvector")
+
+            return results
+        except StoreOverloadedError:
+            # Shed locally, pgvector is fine: the caller answers 503 + Retry-After
+            raise
         except Exception as e:
-            # Other errors - mark degraded and use fallback
+            # Mark degraded and serve from the keyword index
             logger.error(
                 "pgvector_search_failed",
                 query=query_text,
@@ -120,8 +245,152 @@ class PgVectorStore(VectorStore):
                 error_type=type(e).__name__,
             )
             DegradationMode.mark_degraded("pgvector", str(e))
-            # Use keyword fallback
-            return keyword_search_fallback(query_text, top_k)
+            return keyword_search_fallback(
+                query_text,
+                top_k,
+                type_filter=type_filter,
+                index=self._keyword_index,
+            )
+
+    async def search_multi(
+        self,
+        query_text: str,
+        types: list[str],
+        top_k: int = 5,
+        filters: dict[str, dict[str, Any]] | None = None,
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Per-type top-k (e.g. glossary and tribal knowledge) in one pgvector round-trip.
+
+        Falls back to the keyword index per type when pgvector cannot answer.
+
+        Args:
+            query_text: Query text
+            types: Asset types to search
+            top_k: Results per type
+            filters: Optional metadata prefilter per type,
+                e.g. {"glossary_term": {"domain": "finance"}}
+
+        Returns:
+            {type: results} with an entry (possibly empty) for every requested type
+        """
+        filters = filters or {}
+        try:
+            query_vector = await self._embed_query(query_text)
+            results = await self._search_multi_with_retry(query_vector, types, top_k, filters)
+            if DegradationMode.is_degraded("pgvector"):
+                DegradationMode.mark_recovered("pgvector")
+            return results
+        except StoreOverloadedError:
+            raise
+        except Exception as e:
+            logger.error(
+                "pgvector_search_multi_failed",
+                query=query_text,
+                types=types,
+                error=str(e),
+                error_type=type(e).__name__,
+            )
+            DegradationMode.mark_degraded("pgvector", str(e))
+            return {
+                t: keyword_search_fallback(
+                    query_text,
+                    top_k,
+                    type_filter=t,
+                    index=self._keyword_index,
+                    metadata_filter=filters.get(t),
+                )
+                for t in types
+            }
+
+    async def search_hybrid(
+        self,
+        query_text: str,
+        type_filter: str | None = None,
+        top_k: int = 5,
+    ) -> list[dict[str, Any]]:
+        """Hybrid search: BM25 keyword index and pgvector, fused by rank.
+
+        Both retrievers run concurrently and each contributes up to
+        settings.hybrid_search_candidates results before fusion. Exact-term
+        queries are carried by the lexical side, paraphrases by the vector
+        side. Without a keyword index this is the same as search().
+
+        Args:
+            query_text: Query text
+            type_filter: Optional type filter (e.g., "glossary_term")
+            top_k: Number of fused results to return
+
+        Returns:
+            Fused results with RRF "score" and contributing "sources"
+        """
+        if self._keyword_index is None:
+            return await self.search(query_text, type_filter=type_filter, top_k=top_k)
+
+        candidates = max(top_k, settings.hybrid_search_candidates)
+        durations: dict[str, float] = {}
+
+        async def _vector(query_vector: list[float]) -> list[dict[str, Any]]:
+            try:
+                hits = await self._search_with_retry(query_vector, type_filter, candidates)
+                if DegradationMode.is_degraded("pgvector"):
+                    DegradationMode.mark_recovered("pgvector")
+                return hits
+            except StoreOverloadedError:
+                raise
+            except Exception as e:
+                # The lexical side still answers; only the vector ranking is lost
+                _vector_failed(e)
+                return []
+            finally:
+                durations["vector"] = time.perf_counter() - vector_start
+
+        def _vector_failed(e: Exception) -> None:
+            logger.error(
+                "pgvector_hybrid_search_failed",
+                error=str(e),
+                error_type=type(e).__name__,
+            )
+            DegradationMode.mark_degraded("pgvector", str(e))
+            metrics.record_error(error_type=type(e).__name__, component="pgvector")
+
+        # Embed once, up front: the retried, concurrency-limited call below
+        # covers only the pgvector round-trip
+        vector_start = time.perf_counter()
+        vector_task: asyncio.Task[list[dict[str, Any]]] | None = None
+        try:
+            query_vector = await self._embed_query(query_text)
+        except Exception as e:
+            _vector_failed(e)
+            durations["vector"] = time.perf_counter() - vector_start
+        else:
+            vector_task = asyncio.create_task(_vector(query_vector))
+            # Let the task run up to its first await (the pgvector round-trip)
+            # so the in-memory lookup below runs while the query is in flight
+            await asyncio.sleep(0)
+
+        start = time.perf_counter()
+        lexical_hits = self._keyword_index.search(
+            query_text, type_filter=type_filter, top_k=candidates
+        )
+        durations["lexical"] = time.perf_counter() - start
+
+        vector_hits = await vector_task if vector_task is not None else []
+
+        fused = reciprocal_rank_fusion(
+            {"lexical": lexical_hits, "vector": vector_hits},
+            k=settings.hybrid_rrf_k,
+            top_k=top_k,
+        )
+        metrics.record_hybrid_search(durations, fused)
+        logger.debug(
+            "hybrid_search_complete",
+            lexical_hits=len(lexical_hits),
+            vector_hits=len(vector_hits),
+            fused=len(fused),
+            lexical_seconds=durations["lexical"],
+            vector_seconds=durations["vector"],
+        )
+        return fused
 
     async def health(self) -> bool:
         """Check if pgvector is healthy.
@@ -137,3 +406,13 @@ class PgVectorStore(VectorStore):
         except Exception as e:
             logger.debug("pgvector_health_check_failed", error=str(e))
             return False
+
+
+def _to_hit(row: Any) -> dict[str, Any]:
+    return {
+        "id": row["id"],
+        "type": row["type"],
+        "content_text": row["content_text"],
+        "metadata": row["metadata"] or {},
+        "score": row["score"],
+    }
@@ -0,0 +1,117 @@
+"""Column-oriented query results.
+
+Semantic layer results are held as column names plus one value list per
+column instead of a list of row dicts, so large results do not repeat every
+column name per row in memory or on the wire. The API renders them as row
+JSON (default), compact columnar JSON, or an Arrow IPC stream.
+
+Usage:
+    from ecp.domain.columnar import ColumnarResult
+
+    result = ColumnarResult.from_rows(cube_body["data"])
+    result.to_dict()   # {"columns": [...], "values": [[...], ...], "num_rows": n}
+    result.to_arrow()  # pyarrow.Table (needs the arrow extra)
+    result.to_arrow_ipc({"ecp": provenance_json})  # Arrow IPC stream bytes
+"""
+
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+except ImportError:  # pragma: no cover - optional dependency
+    pyarrow = None
+
+ARROW_AVAILABLE = pyarrow is not None
+
+
+class ColumnarResult:
+    """Query result stored column-wise."""
+
+    __slots__ = ("columns", "values")
+
+    def __init__(self, columns: list[str], values: list[list[Any]]) -> None:
+        self.columns = columns
+        self.values = values
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[dict[str, Any]]) -> "ColumnarResult":
+        """Build from row dicts (Cube's /load format); missing keys become None."""
+        columns: list[str] = []
+        values: list[list[Any]] = []
+        index: dict[str, int] = {}
+        n = 0
+        for row in rows:
+            for key in row:
+                if key not in index:
+                    index[key] = len(columns)
+                    columns.append(key)
+                    values.append([None] * n)
+            for key, i in index.items():
+                values[i].append(row.get(key))
+            n += 1
+        return cls(columns, values)
+
+    @classmethod
+    def from_tuples(cls, columns: list[str], rows: Sequence[Sequence[Any]]) -> "ColumnarResult":
+        """Build from positional rows (DB-API / asyncpg records)."""
+        if not rows:
+            return cls(columns, [[] for _ in columns])
+        return cls(columns, [list(col) for col in zip(*rows, strict=True)])
+
+    @classmethod
+    def coerce(cls, data: Any) -> "ColumnarResult":
+        """Accept a ColumnarResult, its to_dict() form, or a list of row dicts."""
+        if isinstance(data, ColumnarResult):
+            return data
+        if isinstance(data, dict) and "columns" in data:
+            return cls(list(data["columns"]), [list(v) for v in data.get("values", [])])
+        return cls.from_rows(data or [])
+
+    @property
+    def num_rows(self) -> int:
+        return len(self.values[0]) if self.values else 0
+
+    def __len__(self) -> int:
+        return self.num_rows
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ColumnarResult):
+            return NotImplemented
+        return self.columns == other.columns and self.values == other.values
+
+    def __repr__(self) -> str:
+        return f"ColumnarResult(columns={self.columns!r}, num_rows={self.num_rows})"
+
+    def to_rows(self) -> list[dict[str, Any]]:
+        """Row dicts, for the default JSON response."""
+        return [dict(zip(self.columns, row, strict=True)) for row in zip(*self.values, strict=True)]
+
+    def to_dict(self) -> dict[str, Any]:
+        """Compact columnar JSON: column names once, one value array per column."""
+        return {"columns": self.columns, "values": self.values, "num_rows": self.num_rows}
+
+    def to_arrow(self) -> Any:
+        """pyarrow.Table with one column per result column.
+
+        Raises:
+            RuntimeError: If pyarrow is not installed
+        """
+        if pyarrow is None:
+            raise RuntimeError('pyarrow is not installed (pip install -e ".[arrow]")')
+        return pyarrow.table(dict(zip(self.columns, self.values, strict=True)))
+
+    def to_arrow_ipc(self, metadata: dict[str, str] | None = None) -> bytes:
+        """Serialize as an Arrow IPC stream, with optional schema metadata.
+
+        Raises:
+            RuntimeError: If pyarrow is not installed
+        """
+        table = self.to_arrow()
+        if metadata:
+            table = table.replace_schema_metadata(metadata)
+        sink = pyarrow.BufferOutputStream()
+        with pyarrow.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
@@ -0,0 +1,7 @@
+"""In-memory indexes over registry assets - lexical search and friends."""
+
+from ecp.index.keyword import KeywordIndex
+from ecp.index.quantized import Int8VectorIndex
+from ecp.index.scope import ScopeIndex
+
+__all__ = ["Int8VectorIndex", "KeywordIndex", "ScopeIndex"]
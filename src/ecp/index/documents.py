@@ -0,0 +1,113 @@
+"""Turn registry assets into searchable documents.
+
+Shared by the keyword index and the embedding pipeline so that lexical and
+vector search see the same text for the same asset.
+"""
+
+import hashlib
+import json
+from typing import Any
+
+# Asset types that are searchable (glossary and tribal knowledge)
+SEARCHABLE_TYPES = ("glossary_term", "tribal_knowledge")
+
+# Relative weight of each content field; names count more than prose
+_GLOSSARY_FIELDS: tuple[tuple[str, float], ...] = (
+    ("canonical_name", 3.0),
+    ("display_name", 3.0),
+    ("synonyms", 2.0),
+    ("definition", 1.0),
+)
+_TRIBAL_FIELDS: tuple[tuple[str, float], ...] = (
+    ("description", 2.0),
+    ("reason", 1.0),
+    ("impact", 1.0),
+    ("workaround", 1.0),
+)
+
+
+def embedding_id(asset_id: str) -> str:
+    """Map a registry asset id to its document id (ar_g_001 -> vec_g_001)."""
+    if asset_id.startswith("ar_"):
+        return f"vec_{asset_id[3:]}"
+    return f"vec_{asset_id}"
+
+
+def _as_text(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, (list, tuple)):
+        return " ".join(_as_text(v) for v in value)
+    if isinstance(value, dict):
+        return " ".join(_as_text(v) for v in value.values())
+    return str(value)
+
+
+def asset_fields(asset: dict[str, Any]) -> list[tuple[str, float]]:
+    """Return (text, weight) pairs for an asset's searchable content."""
+    content = asset.get("content") or {}
+    fields = _GLOSSARY_FIELDS if asset.get("type") == "glossary_term" else _TRIBAL_FIELDS
+    out = [(_as_text(content.get(name)), weight) for name, weight in fields]
+    if asset.get("type") == "glossary_term":
+        # Context-specific names (e.g. "bookings" for sales revenue)
+        variations = content.get("variations") or []
+        names = " ".join(_as_text(v.get("name")) for v in variations if isinstance(v, dict))
+        out.append((names, 2.0))
+    else:
+        scope = content.get("scope") or {}
+        out.append((_as_text(scope.get("dimensions")), 1.0))
+    return [(text, weight) for text, weight in out if text]
+
+
+def asset_text(asset: dict[str, Any]) -> str:
+    """Flatten an asset into a single text string (for display and embedding)."""
+    content = asset.get("content") or {}
+    if asset.get("type") == "glossary_term":
+        name = content.get("display_name") or content.get("canonical_name") or asset.get("id", "")
+        text = f"{name}: {content.get('definition', '')}".strip()
+        synonyms = content.get("synonyms") or []
+        if synonyms:
+            text += f" Synonyms: {', '.join(str(s) for s in synonyms)}."
+        return text
+    return " ".join(_as_text(content.get(name)) for name, _ in _TRIBAL_FIELDS if content.get(name))
+
+
+def asset_metadata(asset: dict[str, Any]) -> dict[str, Any]:
+    """Build search-result metadata in the same shape as the embeddings table."""
+    content = asset.get("content") or {}
+    metadata = asset.get("metadata") or {}
+    out: dict[str, Any] = {"asset_registry_id": asset["id"]}
+    if asset.get("type") == "glossary_term":
+        out["term"] = content.get("canonical_name")
+        if metadata.get("domain"):
+            out["domain"] = metadata["domain"]
+    else:
+        scope = content.get("scope") or {}
+        out["scope_tables"] = list(scope.get("tables") or [])
+        out["scope_dimensions"] = [f"{k}={v}" for k, v in (scope.get("dimensions") or {}).items()]
+    return out
+
+
+def content_hash(asset: dict[str, Any]) -> str:
+    """Hash of everything an embedding row is derived from (text + metadata).
+
+    Stored in embeddings.metadata so re-embedding can be skipped when an
+    asset edit does not change what is indexed.
+    """
+    payload = json.dumps([asset_text(asset), asset_metadata(asset)], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def metadata_matches(metadata: dict[str, Any], metadata_filter: dict[str, Any] | None) -> bool:
+    """Containment check with the semantics of Postgres ``metadata @> filter``.
+
+    Scalar filter values must be equal; list values must all be present.
+    """
+    for key, expected in (metadata_filter or {}).items():
+        actual = metadata.get(key)
+        if isinstance(expected, list):
+            if not isinstance(actual, list) or any(v not in actual for v in expected):
+                return False
+        elif actual != expected:
+            return False
+    return True
@@ -0,0 +1,93 @@
+"""Text embedders for the vector index.
+
+Embedding is CPU-bound and synchronous; callers that embed in bulk run it in
+an executor (see ecp.ingest.embeddings). The same embedder must be used for
+ingestion and for query-time search.
+
+Embedders:
+- hashing: deterministic feature-hashing embedder, no extra dependencies.
+  Good enough for local/demo data and tests.
+- sentence-transformers/<model>: real semantic embeddings
+  (pip install sentence-transformers), e.g.
+  "sentence-transformers/all-MiniLM-L6-v2" (384 dimensions).
+"""
+
+import hashlib
+import math
+from abc import ABC, abstractmethod
+from functools import lru_cache
+
+from ecp.config import settings
+from ecp.index.keyword import tokenize
+
+
+class Embedder(ABC):
+    """Maps texts to fixed-size dense vectors."""
+
+    dimensions: int
+
+    @abstractmethod
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        """Return one L2-normalized vector per input text."""
+        ...
+
+
+@lru_cache(maxsize=65536)
+def _feature_slot(feature: str, dimensions: int) -> tuple[int, float]:
+    digest = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "big")
+    return digest % dimensions, 1.0 if digest >> 63 else -1.0
+
+
+class HashingEmbedder(Embedder):
+    """Signed feature hashing over unigrams and bigrams.
+
+    Texts sharing words end up close in cosine space; there is no notion of
+    synonymy, so paraphrase recall depends on the lexical side of hybrid search.
+    """
+
+    def __init__(self, dimensions: int | None = None) -> None:
+        self.dimensions = dimensions or settings.embedding_dimensions
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        return [self._embed_one(text) for text in texts]
+
+    def _embed_one(self, text: str) -> list[float]:
+        vector = [0.0] * self.dimensions
+        tokens = tokenize(text)
+        features = [(t, 1.0) for t in tokens]
+        features += [(f"{a} {b}", 0.5) for a, b in zip(tokens, tokens[1:], strict=False)]
+        for feature, weight in features:
+            slot, sign = _feature_slot(feature, self.dimensions)
+            vector[slot] += sign * weight
+        norm = math.sqrt(sum(v * v for v in vector))
+        if norm:
+            vector = [v / norm for v in vector]
+        return vector
+
+
+class SentenceTransformerEmbedder(Embedder):
+    """Embeddings from a sentence-transformers model (optional dependency)."""
+
+    def __init__(self, model_name: str) -> None:
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise RuntimeError(
+                "sentence-transformers not available; install it or set EMBEDDING_MODEL=hashing."
+            ) from e
+        self._model = SentenceTransformer(model_name)
+        self.dimensions = self._model.get_sentence_embedding_dimension()
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        vectors = self._model.encode(texts, normalize_embeddings=True, convert_to_numpy=True)
+        return [v.tolist() for v in vectors]
+
+
+def get_embedder(name: str | None = None) -> Embedder:
+    """Build the embedder named in settings (or by name)."""
+    name = name or settings.embedding_model
+    if name == "hashing":
+        return HashingEmbedder()
+    if name.startswith("sentence-transformers/"):
+        return SentenceTransformerEmbedder(name)
+    raise ValueError(f"Unknown embedding model: {name}")
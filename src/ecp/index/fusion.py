@@ -0,0 +1,36 @@
+"""Rank fusion for combining result lists from different retrievers."""
+
+from typing import Any
+
+
+def reciprocal_rank_fusion(
+    ranked: dict[str, list[dict[str, Any]]],
+    k: int = 60,
+    top_k: int = 5,
+) -> list[dict[str, Any]]:
+    """Fuse ranked result lists with reciprocal rank fusion (RRF).
+
+    Each document scores sum(1 / (k + rank)) over the lists it appears in,
+    so agreement between retrievers outweighs a high rank in only one.
+    Scores from the individual retrievers are not compared, which is what
+    makes RRF safe for mixing BM25 and cosine similarity.
+
+    Args:
+        ranked: Source name -> results ordered best first (each with an "id")
+        k: RRF damping constant (60 is the usual default)
+        top_k: Number of fused results to return
+
+    Returns:
+        Fused results, best first. Each keeps the first-seen payload and adds
+        "score" (the RRF score) and "sources" (retrievers that returned it).
+    """
+    fused: dict[str, dict[str, Any]] = {}
+    for source, results in ranked.items():
+        for rank, result in enumerate(results, start=1):
+            entry = fused.get(result["id"])
+            if entry is None:
+                entry = fused[result["id"]] = {**result, "score": 0.0, "sources": []}
+            entry["score"] += 1.0 / (k + rank)
+            entry["sources"].append(source)
+
+    return sorted(fused.values(), key=lambda r: r["score"], reverse=True)[:top_k]
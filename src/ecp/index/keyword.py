@@ -0,0 +1,232 @@
+"""In-memory BM25 keyword index over glossary and tribal knowledge.
+
+Built from Asset Registry content (canonical names, synonyms, definitions,
+tribal-knowledge descriptions) and refreshed periodically so it tracks the
+registry. It backs keyword_search_fallback when pgvector is unavailable and
+can be queried directly for fast lexical lookups.
+
+Results use the same shape as VectorStore.search:
+    {id, type, content_text, metadata, score}
+
+Usage:
+    from ecp.index import KeywordIndex
+
+    index = KeywordIndex()
+    await index.refresh(registry)
+    hits = index.search("net sales", type_filter="glossary_term", top_k=3)
+"""
+
+import asyncio
+import hashlib
+import heapq
+import json
+import math
+import re
+from contextlib import aclosing
+from typing import TYPE_CHECKING, Any
+
+from ecp.config import settings
+from ecp.index.documents import (
+    SEARCHABLE_TYPES,
+    asset_fields,
+    asset_metadata,
+    asset_text,
+    embedding_id,
+    metadata_matches,
+)
+from ecp.observability import get_logger
+
+if TYPE_CHECKING:
+    from ecp.adapters.base import AssetRegistry
+
+logger = get_logger(__name__)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase and split on anything that is not a letter or digit.
+
+    Underscored identifiers are split too, so "net_revenue" matches "net revenue".
+    """
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _signature(asset: dict[str, Any]) -> str:
+    payload = json.dumps([asset.get("content"), asset.get("metadata")], sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+class KeywordIndex:
+    """Inverted index with Okapi BM25 scoring.
+
+    Postings map term -> {doc_id: weighted term frequency}. Document
+    lengths are tracked incrementally so upserts and removals stay cheap.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75) -> None:
+        self._k1 = k1
+        self._b = b
+        self._postings: dict[str, dict[str, float]] = {}
+        self._doc_terms: dict[str, dict[str, float]] = {}
+        self._doc_len: dict[str, float] = {}
+        self._docs: dict[str, dict[str, Any]] = {}
+        self._signatures: dict[str, str] = {}
+        self._total_len = 0.0
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def upsert(self, asset: dict[str, Any]) -> bool:
+        """Index or re-index an asset.
+
+        Args:
+            asset: Registry asset ({id, type, content, metadata})
+
+        Returns:
+            True if the index changed, False if the asset was already current
+        """
+        signature = _signature(asset)
+        if self._signatures.get(asset["id"]) == signature:
+            return False
+
+        doc_id = embedding_id(asset["id"])
+        self._remove_doc(doc_id)
+
+        terms: dict[str, float] = {}
+        for text, weight in asset_fields(asset):
+            for token in tokenize(text):
+                terms[token] = terms.get(token, 0.0) + weight
+        for term, tf in terms.items():
+            self._postings.setdefault(term, {})[doc_id] = tf
+
+        length = sum(terms.values())
+        self._doc_terms[doc_id] = terms
+        self._doc_len[doc_id] = length
+        self._total_len += length
+        self._docs[doc_id] = {
+            "id": doc_id,
+            "type": asset.get("type"),
+            "content_text": asset_text(asset),
+            "metadata": asset_metadata(asset),
+        }
+        self._signatures[asset["id"]] = signature
+        return True
+
+    def remove(self, asset_id: str) -> bool:
+        """Remove an asset from the index; return True if it was present."""
+        self._signatures.pop(asset_id, None)
+        return self._remove_doc(embedding_id(asset_id))
+
+    def _remove_doc(self, doc_id: str) -> bool:
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return False
+        for term in terms:
+            posting = self._postings.get(term)
+            if posting is not None:
+                posting.pop(doc_id, None)
+                if not posting:
+                    del self._postings[term]
+        self._total_len -= self._doc_len.pop(doc_id, 0.0)
+        self._docs.pop(doc_id, None)
+        return True
+
+    def search(
+        self,
+        query: str,
+        type_filter: str | None = None,
+        top_k: int = 5,
+        metadata_filter: dict[str, Any] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Rank documents against a query with BM25.
+
+        Args:
+            query: Free-text query
+            type_filter: Optional asset type (e.g. "glossary_term")
+            top_k: Number of results to return
+            metadata_filter: Optional metadata containment filter (e.g. {"domain": "finance"})
+
+        Returns:
+            List of {id, type, content_text, metadata, score}, best first
+        """
+        n_docs = len(self._docs)
+        if not n_docs:
+            return []
+
+        avg_len = self._total_len / n_docs or 1.0
+        k1, b = self._k1, self._b
+        scores: dict[str, float] = {}
+
+        for term in set(tokenize(query)):
+            posting = self._postings.get(term)
+            if not posting:
+                continue
+            df = len(posting)
+            idf = math.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+            for doc_id, tf in posting.items():
+                norm = k1 * (1.0 - b + b * self._doc_len[doc_id] / avg_len)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (k1 + 1.0) / (tf + norm)
+
+        if type_filter:
+            scores = {d: s for d, s in scores.items() if self._docs[d]["type"] == type_filter}
+        if metadata_filter:
+            scores = {
+                d: s
+                for d, s in scores.items()
+                if metadata_matches(self._docs[d]["metadata"], metadata_filter)
+            }
+
+        best = heapq.nlargest(top_k, scores.items(), key=lambda item: (item[1], item[0]))
+        return [{**self._docs[doc_id], "score": score} for doc_id, score in best]
+
+    async def refresh(self, registry: "AssetRegistry", max_assets: int | None = None) -> int:
+        """Sync the index with the registry.
+
+        Unchanged assets are skipped; assets no longer in the registry are removed.
+
+        Args:
+            registry: Asset registry to read glossary and tribal knowledge from
+            max_assets: Per-type cap on assets read (default from settings)
+
+        Returns:
+            Number of documents added, updated or removed
+        """
+        limit = max_assets or settings.keyword_index_max_assets
+        seen: set[str] = set()
+        changed = 0
+        for asset_type in SEARCHABLE_TYPES:
+            async with aclosing(registry.stream_assets_by_type(asset_type)) as assets:
+                read = 0
+                async for asset in assets:
+                    seen.add(asset["id"])
+                    changed += self.upsert(asset)
+                    read += 1
+                    if read >= limit:
+                        break
+
+        for asset_id in set(self._signatures) - seen:
+            changed += self.remove(asset_id)
+
+        logger.info("keyword_index_refreshed", documents=len(self), changed=changed)
+        return changed
+
+    async def run_refresh_loop(
+        self,
+        registry: "AssetRegistry",
+        interval_seconds: float | None = None,
+    ) -> None:
+        """Refresh immediately, then every interval_seconds until cancelled."""
+        interval = interval_seconds or settings.keyword_index_refresh_seconds
+        while True:
+            try:
+                await self.refresh(registry)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(
+                    "keyword_index_refresh_failed",
+                    error=str(e),
+                    error_type=type(e).__name__,
+                )
+            await asyncio.sleep(interval)
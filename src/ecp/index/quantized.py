@@ -0,0 +1,119 @@
+"""In-memory int8 scalar-quantized vector index with full-precision rescoring.
+
+Each vector is stored as one signed byte per dimension plus a float32 scale
+(symmetric max-abs quantization), a quarter of the float32 footprint. Search
+scores every row against the int8 codes and keeps the best
+top_k * rescore_factor candidates. With keep_full_precision=True those are
+reordered by exact float32 cosine (1.25x the float32 footprint in total, but
+the full pass only touches the int8 codes); otherwise the quantized ranking
+is returned as is. See docs/runbook.md for the memory-versus-recall tradeoff.
+
+Vectors are expected to be L2-normalized (as produced by ecp.index.embedding),
+so the inner product is the cosine similarity.
+"""
+
+import heapq
+import operator
+from array import array
+from typing import Any
+
+from ecp.config import settings
+
+_SCALE_BYTES = 4
+
+
+def quantize(vector: list[float]) -> tuple[array, float]:
+    """Quantize a vector to int8 codes with a single symmetric scale.
+
+    Returns:
+        (codes, scale) such that codes[i] * scale ~= vector[i]
+    """
+    peak = max((abs(v) for v in vector), default=0.0)
+    if peak == 0.0:
+        return array("b", bytes(len(vector))), 0.0
+    scale = peak / 127.0
+    return array("b", (round(v / scale) for v in vector)), scale
+
+
+def _dot(a: Any, b: Any) -> float:
+    return sum(map(operator.mul, a, b))
+
+
+class Int8VectorIndex:
+    """Brute-force cosine search over int8 codes with a float32 rescore pass."""
+
+    def __init__(self, dimensions: int | None = None, keep_full_precision: bool = False) -> None:
+        self.dimensions = dimensions or settings.embedding_dimensions
+        self._keep_full = keep_full_precision
+        self._ids: list[str] = []
+        self._codes = array("b")
+        self._scales = array("f")
+        self._full = array("f")
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, ids: list[str], vectors: list[list[float]]) -> None:
+        """Append vectors (must be L2-normalized and of the index dimension)."""
+        for item_id, vector in zip(ids, vectors, strict=True):
+            if len(vector) != self.dimensions:
+                raise ValueError(
+                    f"Expected {self.dimensions} dimensions, got {len(vector)} for {item_id}"
+                )
+            codes, scale = quantize(vector)
+            self._ids.append(item_id)
+            self._codes.extend(codes)
+            self._scales.append(scale)
+            if self._keep_full:
+                self._full.extend(vector)
+
+    def memory_bytes(self) -> int:
+        """Bytes held by vector data (codes, scales and full-precision copy)."""
+        return (
+            len(self._codes) * self._codes.itemsize
+            + len(self._scales) * _SCALE_BYTES
+            + len(self._full) * self._full.itemsize
+        )
+
+    def search(
+        self,
+        query: list[float],
+        top_k: int = 5,
+        rescore_factor: int | None = None,
+    ) -> list[tuple[str, float]]:
+        """Return (id, cosine score) pairs, best first.
+
+        Args:
+            query: L2-normalized query vector
+            top_k: Number of results
+            rescore_factor: Candidates kept from the int8 pass per result
+                (defaults to settings.vector_rescore_factor); 1 disables rescoring
+
+        Returns:
+            Up to top_k (id, score) pairs
+        """
+        if rescore_factor is None:
+            rescore_factor = settings.vector_rescore_factor
+        dims = self.dimensions
+        codes = memoryview(self._codes)
+        try:
+            # Asymmetric distance: float query against int8 codes
+            approx = (
+                (self._scales[row] * _dot(query, codes[row * dims : (row + 1) * dims]), row)
+                for row in range(len(self._ids))
+            )
+            candidates = heapq.nlargest(top_k * max(rescore_factor, 1), approx)
+        finally:
+            codes.release()
+
+        if not self._keep_full or rescore_factor <= 1:
+            return [(self._ids[row], score) for score, row in candidates[:top_k]]
+
+        full = memoryview(self._full)
+        try:
+            exact = [
+                (_dot(query, full[row * dims : (row + 1) * dims]), row) for _, row in candidates
+            ]
+        finally:
+            full.release()
+        return [(self._ids[row], score) for score, row in heapq.nlargest(top_k, exact)]
@@ -0,0 +1,175 @@
+"""In-memory scope index over tribal knowledge.
+
+Known issues in the registry carry a structured scope, e.g.
+
+    {"tables": ["finance.fact_revenue_daily"],
+     "dimensions": {"region": "APAC", "fiscal_period": "2019-Q4"}}
+
+The index maps each (dimension, value) pair to the ids of the active issues
+scoped to it, so finding the issues that apply to a resolution is a handful
+of dict lookups rather than a registry query. An issue applies when every
+dimension in its scope matches one of the resolution's values and, when
+both sides name tables, the tables overlap.
+
+Usage:
+    from ecp.index import ScopeIndex
+
+    index = ScopeIndex()
+    await index.refresh(registry)
+    issues = index.match({"region": ["APAC", "JP"], "fiscal_period": ["Q4-2019"]})
+"""
+
+import asyncio
+import re
+from contextlib import aclosing
+from typing import TYPE_CHECKING, Any
+
+from ecp.config import settings
+from ecp.observability import get_logger
+
+if TYPE_CHECKING:
+    from ecp.adapters.base import AssetRegistry
+
+logger = get_logger(__name__)
+
+_PERIOD_RE = re.compile(r"^(?:(\d{4})-?q([1-4])|q([1-4])-?(\d{4}))$")
+
+
+def normalize_value(dimension: str, value: Any) -> str:
+    """Canonical form for matching: lowercase, fiscal periods as YYYY-QN."""
+    text = str(value).strip().lower()
+    if dimension == "fiscal_period":
+        m = _PERIOD_RE.match(text.replace(" ", ""))
+        if m:
+            year, quarter = (m.group(1), m.group(2)) if m.group(1) else (m.group(4), m.group(3))
+            return f"{year}-q{quarter}"
+    return text
+
+
+def _table_name(table: str) -> str:
+    # "analytics.finance.fact_revenue_daily" and "fact_revenue_daily" match
+    return table.rsplit(".", 1)[-1].lower()
+
+
+class ScopeIndex:
+    """(dimension, value) -> active tribal-knowledge ids, with table scoping."""
+
+    def __init__(self) -> None:
+        self._postings: dict[tuple[str, str], set[str]] = {}
+        self._keys: dict[str, list[tuple[str, str]]] = {}
+        self._required: dict[str, frozenset[str]] = {}
+        self._tables: dict[str, frozenset[str]] = {}
+        self._assets: dict[str, dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._assets)
+
+    def upsert(self, asset: dict[str, Any]) -> None:
+        """Index (or re-index) one tribal-knowledge asset; inactive ones are dropped."""
+        asset_id = asset["id"]
+        self.remove(asset_id)
+        if (asset.get("metadata") or {}).get("active") is False:
+            return
+        scope = (asset.get("content") or {}).get("scope") or {}
+        dimensions = scope.get("dimensions") or {}
+        keys = [
+            (dimension, normalize_value(dimension, value))
+            for dimension, values in dimensions.items()
+            for value in (values if isinstance(values, list) else [values])
+        ]
+        for key in keys:
+            self._postings.setdefault(key, set()).add(asset_id)
+        self._keys[asset_id] = keys
+        self._required[asset_id] = frozenset(dimensions)
+        self._tables[asset_id] = frozenset(_table_name(t) for t in scope.get("tables") or [])
+        self._assets[asset_id] = asset
+
+    def remove(self, asset_id: str) -> None:
+        """Drop an asset from the index (no-op if absent)."""
+        if self._assets.pop(asset_id, None) is None:
+            return
+        for key in self._keys.pop(asset_id):
+            posting = self._postings[key]
+            posting.discard(asset_id)
+            if not posting:
+                del self._postings[key]
+        del self._required[asset_id]
+        del self._tables[asset_id]
+
+    def match(
+        self,
+        dimensions: dict[str, list[Any]],
+        tables: list[str] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Return the active issues whose scope is covered by a resolution.
+
+        Args:
+            dimensions: Resolved dimension values, e.g. {"region": ["APAC", "JP"]}
+            tables: Tables the plan reads; None skips table scoping
+
+        Returns:
+            Matching tribal-knowledge assets, ordered by id
+        """
+        matched: dict[str, set[str]] = {}
+        for dimension, values in dimensions.items():
+            for value in values:
+                for asset_id in self._postings.get(
+                    (dimension, normalize_value(dimension, value)), ()
+                ):
+                    matched.setdefault(asset_id, set()).add(dimension)
+
+        wanted = {_table_name(t) for t in tables} if tables else None
+        return [
+            self._assets[asset_id]
+            for asset_id in sorted(matched)
+            if matched[asset_id] == self._required[asset_id]
+            and (wanted is None or not self._tables[asset_id] or self._tables[asset_id] & wanted)
+        ]
+
+    async def refresh(self, registry: "AssetRegistry") -> int:
+        """Rebuild from the registry's tribal knowledge; returns the number of active issues."""
+        fresh = ScopeIndex()
+        async with aclosing(registry.stream_assets_by_type("tribal_knowledge")) as assets:
+            async for asset in assets:
+                fresh.upsert(asset)
+        # Swap in one step so concurrent match() calls never see a half-built index
+        self._postings, self._keys = fresh._postings, fresh._keys
+        self._required, self._tables = fresh._required, fresh._tables
+        self._assets = fresh._assets
+        logger.info("scope_index_refreshed", issues=len(self))
+        return len(self)
+
+    async def run_refresh_loop(
+        self,
+        registry: "AssetRegistry",
+        interval_seconds: float | None = None,
+    ) -> None:
+        """Refresh immediately, then every interval_seconds until cancelled."""
+        interval = interval_seconds or settings.scope_index_refresh_seconds
+        while True:
+            try:
+                await self.refresh(registry)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(
+                    "scope_index_refresh_failed",
+                    error=str(e),
+                    error_type=type(e).__name__,
+                )
+            await asyncio.sleep(interval)
+
+
+def known_issue_warning(asset: dict[str, Any]) -> dict[str, Any]:
+    """Format a tribal-knowledge asset as a resolution warning."""
+    content = asset.get("content") or {}
+    warning = {
+        "type": content.get("type") or "known_issue",
+        "message": content.get("description", ""),
+        "asset_id": asset["id"],
+        "severity": (asset.get("metadata") or {}).get("severity"),
+    }
+    for field in ("impact", "workaround"):
+        if content.get(field):
+            warning[field] = content[field]
+    return warning
@@ -0,0 +1,6 @@
+"""Ingestion jobs - populate the vector index from the Asset Registry."""
+
+from ecp.ingest.embeddings import EmbeddingIngestor
+from ecp.ingest.sync import EmbeddingSync
+
+__all__ = ["EmbeddingIngestor", "EmbeddingSync"]
@@ -0,0 +1,369 @@
+"""Bulk embedding ingestion from the Asset Registry into pgvector.
+
+Streams glossary and tribal-knowledge assets out of the registry with keyset
+pagination, embeds them in batches on a worker pool and bulk-loads the
+vectors with COPY. Three stages run concurrently, connected by small bounded
+queues so memory stays flat:
+
+    fetch page N+2  ->  embed page N+1 (worker pool)  ->  COPY + upsert page N
+
+Each page is written in one transaction together with its checkpoint, so an
+interrupted run resumes after the last committed page. A run that completes
+clears its checkpoint, so the next run re-indexes from the start.
+
+Usage:
+    python -m ecp.ingest.embeddings                 # resume from checkpoint
+    python -m ecp.ingest.embeddings --restart       # full re-index
+    python -m ecp.ingest.embeddings --workers 8 --page-size 2000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any
+
+import asyncpg
+
+from ecp.adapters.pg import asyncpg_dsn
+from ecp.config import settings
+from ecp.index.documents import (
+    SEARCHABLE_TYPES,
+    asset_metadata,
+    asset_text,
+    content_hash,
+    embedding_id,
+)
+from ecp.index.embedding import Embedder, get_embedder
+from ecp.observability import get_logger, setup_logging
+
+logger = get_logger(__name__)
+
+CHECKPOINT_DDL = """
+CREATE TABLE IF NOT EXISTS ingest_checkpoints (
+    job VARCHAR(100) PRIMARY KEY,
+    cursor JSONB NOT NULL,
+    rows_done BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT NOW()
+)
+"""
+
+_STAGING_DDL = """
+CREATE TEMP TABLE IF NOT EXISTS embeddings_staging (
+    id VARCHAR(100),
+    type VARCHAR(50),
+    content_text TEXT,
+    embedding REAL[],
+    metadata JSONB
+) ON COMMIT DELETE ROWS
+"""
+
+_STAGING_COLUMNS = ["id", "type", "content_text", "embedding", "metadata"]
+
+_UPSERT_FROM_STAGING = """
+INSERT INTO embeddings (id, type, content_text, embedding, metadata)
+SELECT id, type, content_text, embedding::vector, metadata FROM embeddings_staging
+ON CONFLICT (id) DO UPDATE SET
+    type = EXCLUDED.type,
+    content_text = EXCLUDED.content_text,
+    embedding = EXCLUDED.embedding,
+    metadata = EXCLUDED.metadata
+"""
+
+_SAVE_CHECKPOINT = """
+INSERT INTO ingest_checkpoints (job, cursor, rows_done, updated_at)
+VALUES ($1, $2::jsonb, $3, NOW())
+ON CONFLICT (job) DO UPDATE SET
+    cursor = EXCLUDED.cursor, rows_done = EXCLUDED.rows_done, updated_at = NOW()
+"""
+
+_CLEAR_CHECKPOINT = "DELETE FROM ingest_checkpoints WHERE job = $1"
+
+_FETCH_PAGE = """
+SELECT id, type, version, content, metadata FROM assets
+WHERE type = ANY($1::text[]) AND (type, id) > ($2, $3)
+ORDER BY type, id
+LIMIT $4
+"""
+
+# Per-process embedder for pool workers (models are loaded once per worker)
+_worker_embedder: Embedder | None = None
+
+
+def _init_worker(model_name: str) -> None:
+    global _worker_embedder
+    _worker_embedder = get_embedder(model_name)
+
+
+def _embed_batch(texts: list[str]) -> list[list[float]]:
+    assert _worker_embedder is not None, "worker not initialized"
+    return _worker_embedder.embed(texts)
+
+
+def _json(value: Any) -> dict[str, Any]:
+    if isinstance(value, str):
+        return json.loads(value)
+    return dict(value) if value else {}
+
+
+def row_to_asset(row: Any) -> dict[str, Any]:
+    """Convert a registry row into the asset dict shape used by the indexers."""
+    return {
+        "id": row["id"],
+        "type": row["type"],
+        "version": row["version"],
+        "content": _json(row["content"]),
+        "metadata": _json(row["metadata"]),
+    }
+
+
+def embedding_metadata(asset: dict[str, Any]) -> dict[str, Any]:
+    """Row metadata plus change-tracking fields (source_version, content_hash)."""
+    return {
+        **asset_metadata(asset),
+        "source_version": asset.get("version"),
+        "content_hash": content_hash(asset),
+    }
+
+
+def build_records(
+    assets: list[dict[str, Any]],
+    vectors: list[list[float]],
+) -> list[tuple[Any, ...]]:
+    """Build COPY records (id, type, content_text, embedding, metadata)."""
+    return [
+        (embedding_id(a["id"]), a["type"], asset_text(a), vec, json.dumps(embedding_metadata(a)))
+        for a, vec in zip(assets, vectors, strict=True)
+    ]
+
+
+async def copy_embeddings(
+    conn: asyncpg.Connection,
+    records: list[tuple[Any, ...]],
+    checkpoint: tuple[str, dict[str, Any], int] | None = None,
+) -> None:
+    """COPY records into a staging table and upsert them into embeddings.
+
+    Args:
+        conn: Connection to the vectors database
+        records: Rows from build_records()
+        checkpoint: Optional (job, cursor, rows_done) saved in the same transaction
+    """
+    async with conn.transaction():
+        await conn.execute(_STAGING_DDL)
+        if records:
+            await conn.copy_records_to_table(
+                "embeddings_staging", records=records, columns=_STAGING_COLUMNS
+            )
+            await conn.execute(_UPSERT_FROM_STAGING)
+        if checkpoint is not None:
+            await save_checkpoint(conn, *checkpoint)
+
+
+async def save_checkpoint(
+    conn: asyncpg.Connection,
+    job: str,
+    cursor: dict[str, Any],
+    rows_done: int,
+) -> None:
+    """Persist a job's cursor in ingest_checkpoints."""
+    await conn.execute(_SAVE_CHECKPOINT, job, json.dumps(cursor), rows_done)
+
+
+async def embed_assets(
+    assets: list[dict[str, Any]],
+    executor: Executor,
+    batch_size: int,
+) -> list[list[float]]:
+    """Embed assets in batches spread across the executor, preserving order."""
+    loop = asyncio.get_running_loop()
+    texts = [asset_text(a) for a in assets]
+    batches = [texts[i : i + batch_size] for i in range(0, len(texts), batch_size)]
+    results = await asyncio.gather(
+        *(loop.run_in_executor(executor, _embed_batch, batch) for batch in batches)
+    )
+    return [vec for batch in results for vec in batch]
+
+
+def make_executor(workers: int, model_name: str, use_processes: bool = True) -> Executor:
+    """Create the embedding worker pool (processes by default; embedding is CPU-bound)."""
+    pool_cls = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    return pool_cls(max_workers=workers, initializer=_init_worker, initargs=(model_name,))
+
+
+class EmbeddingIngestor:
+    """Full (re-)index of registry assets into the embeddings table."""
+
+    def __init__(
+        self,
+        registry_url: str | None = None,
+        vectors_url: str | None = None,
+        model_name: str | None = None,
+        page_size: int | None = None,
+        batch_size: int | None = None,
+        workers: int | None = None,
+        asset_types: tuple[str, ...] = SEARCHABLE_TYPES,
+        job: str = "embeddings_full",
+        use_processes: bool = True,
+    ) -> None:
+        self._registry_url = asyncpg_dsn(registry_url or settings.sync_registry_url)
+        self._vectors_url = vectors_url or settings.pgvector_connection_string
+        self._model_name = model_name or settings.embedding_model
+        self._page_size = page_size or settings.ingest_page_size
+        self._batch_size = batch_size or settings.ingest_batch_size
+        self._workers = workers or settings.embedding_workers
+        self._asset_types = list(asset_types)
+        self._job = job
+        self._use_processes = use_processes
+
+    async def run(self, restart: bool = False) -> dict[str, Any]:
+        """Run the ingestion.
+
+        Args:
+            restart: Ignore any saved checkpoint and re-index everything
+
+        Returns:
+            Stats: {rows, pages, seconds, rows_per_second, resumed_from}
+        """
+        registry_conn = await asyncpg.connect(self._registry_url)
+        vectors_conn = await asyncpg.connect(self._vectors_url)
+        executor = make_executor(self._workers, self._model_name, self._use_processes)
+        tasks: list[asyncio.Task[Any]] = []
+        try:
+            await vectors_conn.execute(CHECKPOINT_DDL)
+            cursor, rows_done = {"type": "", "id": ""}, 0
+            if not restart:
+                row = await vectors_conn.fetchrow(
+                    "SELECT cursor, rows_done FROM ingest_checkpoints WHERE job = $1", self._job
+                )
+                if row:
+                    cursor, rows_done = _json(row["cursor"]), row["rows_done"]
+            resumed_from = dict(cursor) if cursor["id"] else None
+
+            logger.info(
+                "embedding_ingest_started",
+                job=self._job,
+                resumed_from=resumed_from,
+                page_size=self._page_size,
+                batch_size=self._batch_size,
+                workers=self._workers,
+                model=self._model_name,
+            )
+
+            pages: asyncio.Queue[list[dict[str, Any]] | None] = asyncio.Queue(maxsize=2)
+            embedded: asyncio.Queue[tuple[list[dict[str, Any]], list[list[float]]] | None] = (
+                asyncio.Queue(maxsize=2)
+            )
+            writer = asyncio.create_task(self._write_pages(vectors_conn, embedded, rows_done))
+            tasks = [
+                asyncio.create_task(self._fetch_pages(registry_conn, cursor, pages)),
+                asyncio.create_task(self._embed_pages(pages, embedded, executor)),
+                writer,
+            ]
+            # A failure in any stage propagates here; the others are cancelled below
+            await asyncio.gather(*tasks)
+            stats = writer.result()
+            # Finished: a later run must not resume past the last row
+            await vectors_conn.execute(_CLEAR_CHECKPOINT, self._job)
+            stats["resumed_from"] = resumed_from
+            logger.info("embedding_ingest_complete", job=self._job, **stats)
+            return stats
+        finally:
+            for task in tasks:
+                task.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
+            await registry_conn.close()
+            await vectors_conn.close()
+
+    async def _fetch_pages(
+        self,
+        conn: asyncpg.Connection,
+        cursor: dict[str, str],
+        out: asyncio.Queue,
+    ) -> None:
+        last_type, last_id = cursor["type"], cursor["id"]
+        while True:
+            rows = await conn.fetch(
+                _FETCH_PAGE, self._asset_types, last_type, last_id, self._page_size
+            )
+            if not rows:
+                break
+            await out.put([row_to_asset(r) for r in rows])
+            last_type, last_id = rows[-1]["type"], rows[-1]["id"]
+            if len(rows) < self._page_size:
+                break
+        await out.put(None)
+
+    async def _embed_pages(
+        self,
+        pages: asyncio.Queue,
+        out: asyncio.Queue,
+        executor: Executor,
+    ) -> None:
+        while (assets := await pages.get()) is not None:
+            vectors = await embed_assets(assets, executor, self._batch_size)
+            await out.put((assets, vectors))
+        await out.put(None)
+
+    async def _write_pages(
+        self,
+        conn: asyncpg.Connection,
+        embedded: asyncio.Queue,
+        rows_done: int,
+    ) -> dict[str, Any]:
+        start = time.perf_counter()
+        rows = pages = 0
+        while (item := await embedded.get()) is not None:
+            assets, vectors = item
+            rows += len(assets)
+            pages += 1
+            cursor = {"type": assets[-1]["type"], "id": assets[-1]["id"]}
+            await copy_embeddings(
+                conn, build_records(assets, vectors), (self._job, cursor, rows_done + rows)
+            )
+            elapsed = time.perf_counter() - start
+            logger.info(
+                "embedding_ingest_progress",
+                job=self._job,
+                rows=rows,
+                pages=pages,
+                last_id=cursor["id"],
+                rows_per_second=round(rows / elapsed, 1) if elapsed else None,
+            )
+        elapsed = time.perf_counter() - start
+        return {
+            "rows": rows,
+            "pages": pages,
+            "seconds": round(elapsed, 3),
+            "rows_per_second": round(rows / elapsed, 1) if elapsed else 0.0,
+        }
+
+
+def main(argv: list[str] | None = None) -> None:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Embed registry assets into pgvector.")
+    parser.add_argument("--restart", action="store_true", help="ignore checkpoint, re-index all")
+    parser.add_argument("--page-size", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--model", default=None, help="embedding model (default: settings)")
+    parser.add_argument("--types", nargs="+", default=list(SEARCHABLE_TYPES))
+    parser.add_argument("--job", default="embeddings_full", help="checkpoint name")
+    args = parser.parse_args(argv)
+
+    setup_logging(log_level=settings.log_level, json_logs=(settings.env != "local"))
+    ingestor = EmbeddingIngestor(
+        model_name=args.model,
+        page_size=args.page_size,
+        batch_size=args.batch_size,
+        workers=args.workers,
+        asset_types=tuple(args.types),
+        job=args.job,
+    )
+    stats = asyncio.run(ingestor.run(restart=args.restart))
+    print(json.dumps(stats))
+
+
+if __name__ == "__main__":
+    main()
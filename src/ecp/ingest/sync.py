@@ -0,0 +1,290 @@
+"""Incremental embedding sync driven by asset changes.
+
+Keeps the embeddings table in step with the Asset Registry at a cost that
+scales with churn rather than corpus size:
+
+- Changed assets are found by keyset scan over (updated_at, id) from a saved
+  watermark (requires scripts/migrations/001_registry_change_tracking.sql).
+- Each candidate's content hash is compared with the one stored in
+  embeddings.metadata; only rows whose indexed text or metadata actually
+  changed are re-embedded and upserted.
+- Deleted assets are read from the asset_deletions tombstone table and their
+  embeddings removed. Assets whose type stops being searchable are removed too.
+
+The scan restarts a little before the watermark (settings.sync_overlap_seconds)
+so rows committed out of timestamp order are not missed; re-reading them
+costs a hash comparison, not an embedding.
+
+Usage:
+    python -m ecp.ingest.sync               # incremental
+    python -m ecp.ingest.sync --reconcile   # also diff all ids (no tombstones needed)
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
+from typing import Any
+
+import asyncpg
+
+from ecp.config import settings
+from ecp.index.documents import SEARCHABLE_TYPES, content_hash, embedding_id
+from ecp.ingest.embeddings import (
+    CHECKPOINT_DDL,
+    asyncpg_dsn,
+    build_records,
+    copy_embeddings,
+    embed_assets,
+    make_executor,
+    row_to_asset,
+    save_checkpoint,
+)
+from ecp.observability import get_logger, setup_logging
+
+logger = get_logger(__name__)
+
+_FETCH_CHANGED = """
+SELECT id, type, version, content, metadata, updated_at FROM assets
+WHERE (updated_at, id) > ($1, $2)
+ORDER BY updated_at, id
+LIMIT $3
+"""
+
+_FETCH_DELETIONS = """
+SELECT asset_id, deleted_at FROM asset_deletions
+WHERE (deleted_at, asset_id) > ($1, $2)
+ORDER BY deleted_at, asset_id
+LIMIT $3
+"""
+
+_STORED_HASHES = """
+SELECT id, metadata->>'content_hash' AS content_hash FROM embeddings WHERE id = ANY($1::text[])
+"""
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+class EmbeddingSync:
+    """Re-embed changed assets and drop embeddings of removed ones."""
+
+    def __init__(
+        self,
+        registry_url: str | None = None,
+        vectors_url: str | None = None,
+        model_name: str | None = None,
+        page_size: int | None = None,
+        batch_size: int | None = None,
+        workers: int | None = None,
+        job: str = "embeddings_sync",
+        use_processes: bool = True,
+    ) -> None:
+        self._registry_url = asyncpg_dsn(registry_url or settings.sync_registry_url)
+        self._vectors_url = vectors_url or settings.pgvector_connection_string
+        self._model_name = model_name or settings.embedding_model
+        self._page_size = page_size or settings.ingest_page_size
+        self._batch_size = batch_size or settings.ingest_batch_size
+        self._workers = workers or settings.embedding_workers
+        self._job = job
+        self._use_processes = use_processes
+
+    async def run(self, reconcile: bool = False) -> dict[str, Any]:
+        """Run one sync pass.
+
+        Args:
+            reconcile: Also compare every embedding id against the registry
+                (slow path; use when tombstones are missing)
+
+        Returns:
+            Stats: {scanned, reembedded, unchanged, deleted, seconds}
+        """
+        start = time.perf_counter()
+        registry_conn = await asyncpg.connect(self._registry_url)
+        vectors_conn = await asyncpg.connect(self._vectors_url)
+        executor = make_executor(self._workers, self._model_name, self._use_processes)
+        stats = {"scanned": 0, "reembedded": 0, "unchanged": 0, "deleted": 0}
+        try:
+            await vectors_conn.execute(CHECKPOINT_DDL)
+            state = await self._load_state(vectors_conn)
+
+            await self._sync_changes(registry_conn, vectors_conn, executor, state, stats)
+            await self._sync_deletions(registry_conn, vectors_conn, state, stats)
+            if reconcile:
+                stats["deleted"] += await self._reconcile(registry_conn, vectors_conn)
+
+            stats["seconds"] = round(time.perf_counter() - start, 3)
+            logger.info("embedding_sync_complete", job=self._job, **stats)
+            return stats
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+            await registry_conn.close()
+            await vectors_conn.close()
+
+    async def _load_state(self, conn: asyncpg.Connection) -> dict[str, Any]:
+        row = await conn.fetchrow("SELECT cursor FROM ingest_checkpoints WHERE job = $1", self._job)
+        cursor = row["cursor"] if row else None
+        if isinstance(cursor, str):
+            cursor = json.loads(cursor)
+        cursor = cursor or {}
+        return {
+            "updated_at": _parse_ts(cursor.get("updated_at")),
+            "id": cursor.get("id", ""),
+            "deleted_at": _parse_ts(cursor.get("deleted_at")),
+            "deleted_id": cursor.get("deleted_id", ""),
+        }
+
+    def _checkpoint(self, state: dict[str, Any], rows_done: int) -> tuple[str, dict[str, Any], int]:
+        cursor = {
+            "updated_at": state["updated_at"].isoformat(),
+            "id": state["id"],
+            "deleted_at": state["deleted_at"].isoformat(),
+            "deleted_id": state["deleted_id"],
+        }
+        return self._job, cursor, rows_done
+
+    async def _sync_changes(
+        self,
+        registry_conn: asyncpg.Connection,
+        vectors_conn: asyncpg.Connection,
+        executor: Any,
+        state: dict[str, Any],
+        stats: dict[str, int],
+    ) -> None:
+        overlap = timedelta(seconds=settings.sync_overlap_seconds)
+        last_ts, last_id = max(state["updated_at"] - overlap, _EPOCH), ""
+
+        while True:
+            rows = await registry_conn.fetch(_FETCH_CHANGED, last_ts, last_id, self._page_size)
+            if not rows:
+                break
+            assets = [row_to_asset(r) for r in rows]
+            stats["scanned"] += len(assets)
+
+            searchable = [a for a in assets if a["type"] in SEARCHABLE_TYPES]
+            gone = [embedding_id(a["id"]) for a in assets if a["type"] not in SEARCHABLE_TYPES]
+
+            stored = {
+                r["id"]: r["content_hash"]
+                for r in await vectors_conn.fetch(
+                    _STORED_HASHES, [embedding_id(a["id"]) for a in searchable]
+                )
+            }
+            changed = [
+                a for a in searchable if stored.get(embedding_id(a["id"])) != content_hash(a)
+            ]
+            stats["unchanged"] += len(searchable) - len(changed)
+
+            vectors = await embed_assets(changed, executor, self._batch_size) if changed else []
+            last_ts, last_id = rows[-1]["updated_at"], rows[-1]["id"]
+            state["updated_at"], state["id"] = last_ts, last_id
+
+            async with vectors_conn.transaction():
+                if gone:
+                    stats["deleted"] += await _delete_embeddings(vectors_conn, gone)
+                await copy_embeddings(
+                    vectors_conn,
+                    build_records(changed, vectors),
+                    self._checkpoint(state, stats["scanned"]),
+                )
+            stats["reembedded"] += len(changed)
+
+            if len(rows) < self._page_size:
+                break
+
+    async def _sync_deletions(
+        self,
+        registry_conn: asyncpg.Connection,
+        vectors_conn: asyncpg.Connection,
+        state: dict[str, Any],
+        stats: dict[str, int],
+    ) -> None:
+        while True:
+            try:
+                rows = await registry_conn.fetch(
+                    _FETCH_DELETIONS, state["deleted_at"], state["deleted_id"], self._page_size
+                )
+            except asyncpg.UndefinedTableError:
+                logger.warning(
+                    "embedding_sync_no_tombstones",
+                    message="asset_deletions missing; apply migration 001 or run with --reconcile",
+                )
+                return
+            if not rows:
+                return
+            # Skip ids that were deleted and then re-created
+            ids = [r["asset_id"] for r in rows]
+            alive = {
+                r["id"]
+                for r in await registry_conn.fetch(
+                    "SELECT id FROM assets WHERE id = ANY($1::text[])", ids
+                )
+            }
+            state["deleted_at"], state["deleted_id"] = rows[-1]["deleted_at"], ids[-1]
+            async with vectors_conn.transaction():
+                stats["deleted"] += await _delete_embeddings(
+                    vectors_conn, [embedding_id(i) for i in ids if i not in alive]
+                )
+                await save_checkpoint(vectors_conn, *self._checkpoint(state, stats["scanned"]))
+            if len(rows) < self._page_size:
+                return
+
+    async def _reconcile(
+        self,
+        registry_conn: asyncpg.Connection,
+        vectors_conn: asyncpg.Connection,
+    ) -> int:
+        deleted, last_id = 0, ""
+        while True:
+            rows = await vectors_conn.fetch(
+                """
+                SELECT id, metadata->>'asset_registry_id' AS asset_id FROM embeddings
+                WHERE id > $1 ORDER BY id LIMIT $2
+                """,
+                last_id,
+                self._page_size,
+            )
+            if not rows:
+                return deleted
+            last_id = rows[-1]["id"]
+            asset_ids = [r["asset_id"] for r in rows if r["asset_id"]]
+            alive = {
+                r["id"]
+                for r in await registry_conn.fetch(
+                    "SELECT id FROM assets WHERE id = ANY($1::text[]) AND type = ANY($2::text[])",
+                    asset_ids,
+                    list(SEARCHABLE_TYPES),
+                )
+            }
+            orphans = [r["id"] for r in rows if r["asset_id"] and r["asset_id"] not in alive]
+            deleted += await _delete_embeddings(vectors_conn, orphans)
+
+
+async def _delete_embeddings(conn: asyncpg.Connection, ids: list[str]) -> int:
+    if not ids:
+        return 0
+    result = await conn.execute("DELETE FROM embeddings WHERE id = ANY($1::text[])", ids)
+    return int(result.split()[-1]) if isinstance(result, str) else 0
+
+
+def _parse_ts(value: str | None) -> datetime:
+    return datetime.fromisoformat(value) if value else _EPOCH
+
+
+def main(argv: list[str] | None = None) -> None:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Incrementally sync embeddings with the registry.")
+    parser.add_argument("--reconcile", action="store_true", help="also diff all embedding ids")
+    parser.add_argument("--page-size", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--job", default="embeddings_sync", help="watermark name")
+    args = parser.parse_args(argv)
+
+    setup_logging(log_level=settings.log_level, json_logs=(settings.env != "local"))
+    sync = EmbeddingSync(page_size=args.page_size, workers=args.workers, job=args.job)
+    stats = asyncio.run(sync.run(reconcile=args.reconcile))
+    print(json.dumps(stats))
+
+
+if __name__ == "__main__":
+    main()
@@ -8,11 +8,17 @@ Metric Categories:
 - Store metrics: Query latency per store, error rates
 - Resolution metrics: Confidence scores, disambiguation rates
 - Policy metrics: Authorization decisions
+- Retrieval metrics: Hybrid search per-source latency and contribution
+- Connection pool metrics: Acquire wait time and utilization per pool
+- Resilience metrics: Retries and retry budgets, store concurrency limits, circuit breaker state
 """
 
 from typing import Any
 
-from prometheus_client import Counter, Histogram, Summary
+from prometheus_client import Counter, Gauge, Histogram, Summary
+
+# ecp_circuit_breaker_state values
+_CIRCUIT_STATES = {"closed": 0, "half_open": 1, "open": 2}
 
 
 class Metrics:
@@ -88,6 +94,96 @@ class Metrics:
             buckets=[0.001, 0.005, 0.01, 0.025, 0.05, 0.1],
         )
 
+        self.policy_cache_total = Counter(
+            "ecp_policy_cache_total",
+            "Policy decision cache lookups and maintenance",
+            ["result"],  # labels: hit, miss, refresh, flush
+        )
+
+        self.policy_batch_size = Histogram(
+            "ecp_policy_batch_size",
+            "Data products per batched policy evaluation",
+            buckets=[1, 2, 4, 8, 16, 32, 64],
+        )
+
+        self.policy_evaluations_total = Counter(
+            "ecp_policy_evaluations_total",
+            "Policy evaluations by engine",
+            ["engine"],  # labels: embedded, opa
+        )
+
+        # Hybrid retrieval metrics
+        self.hybrid_source_duration_seconds = Histogram(
+            "ecp_hybrid_source_duration_seconds",
+            "Hybrid search latency per retriever in seconds",
+            ["source"],  # labels: lexical, vector
+            buckets=[0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0],
+        )
+
+        self.hybrid_results_total = Counter(
+            "ecp_hybrid_results_total",
+            "Fused hybrid search results by contributing retriever",
+            ["source"],  # labels: lexical, vector
+        )
+
+        # Connection pool metrics
+        self.db_pool_acquire_wait_seconds = Histogram(
+            "ecp_db_pool_acquire_wait_seconds",
+            "Time spent waiting for a pooled Postgres connection",
+            ["pool"],  # labels: host/database
+            buckets=[0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0],
+        )
+
+        self.db_pool_connections = Gauge(
+            "ecp_db_pool_connections",
+            "Postgres pool connections by state",
+            ["pool", "state"],  # labels: in_use, size, max
+        )
+
+        self.semantic_queries_total = Counter(
+            "ecp_semantic_queries_total",
+            "Semantic layer queries by engine",
+            ["engine"],  # labels: embedded, cube, embedded_fallback
+        )
+
+        self.http_pool_connections = Gauge(
+            "ecp_http_pool_connections",
+            "Outbound HTTP client pool connections by state",
+            ["client", "state"],  # labels: in_flight, open, idle, max
+        )
+
+        # Retry metrics
+        self.retries_total = Counter(
+            "ecp_retries_total",
+            "Retry decisions after a retryable store error",
+            ["store", "outcome"],  # labels: retried, budget_exhausted, deadline
+        )
+
+        self.retry_budget_tokens = Gauge(
+            "ecp_retry_budget_tokens",
+            "Retry tokens left in the store's retry budget",
+            ["store"],
+        )
+
+        # Adaptive concurrency metrics
+        self.store_concurrency = Gauge(
+            "ecp_store_concurrency",
+            "Adaptive concurrency limit, calls in flight and calls queued per store",
+            ["store", "state"],  # labels: limit, in_flight, queued
+        )
+
+        self.store_shed_total = Counter(
+            "ecp_store_shed_total",
+            "Store calls shed at the concurrency limit (503)",
+            ["store"],
+        )
+
+        self.circuit_breaker_state = Gauge(
+            "ecp_circuit_breaker_state",
+            "Circuit breaker state per store (0 closed, 1 half-open, 2 open)",
+            ["store"],
+        )
+
         # Error metrics
         self.errors_total = Counter(
             "ecp_errors_total",
@@ -112,7 +208,7 @@ class Metrics:
         """Record execute request metrics.
 
         Args:
-            status: Request status (success, not_found, error)
+            status: Request status (success, pending, not_found, access_denied, error)
             duration: Request duration in seconds
         """
         self.execute_requests_total.labels(status=status).inc()
@@ -140,6 +236,138 @@ class Metrics:
         self.policy_decisions_total.labels(decision=decision).inc()
         self.policy_evaluation_duration_seconds.observe(duration)
 
+    def record_hybrid_search(
+        self, durations: dict[str, float], results: list[dict[str, Any]]
+    ) -> None:
+        """Record hybrid search metrics.
+
+        Args:
+            durations: Retriever name -> latency in seconds
+            results: Fused results, each with the "sources" that returned it
+        """
+        for source, duration in durations.items():
+            self.hybrid_source_duration_seconds.labels(source=source).observe(duration)
+        for result in results:
+            for source in result.get("sources", []):
+                self.hybrid_results_total.labels(source=source).inc()
+
+    def record_db_pool_acquire(self, pool: str, wait: float) -> None:
+        """Record how long an acquire waited for a connection.
+
+        Args:
+            pool: Pool label (host/database)
+            wait: Wait time in seconds
+        """
+        self.db_pool_acquire_wait_seconds.labels(pool=pool).observe(wait)
+
+    def set_db_pool_utilization(self, pool: str, in_use: int, size: int, max_size: int) -> None:
+        """Update pool utilization gauges.
+
+        Args:
+            pool: Pool label (host/database)
+            in_use: Connections currently checked out
+            size: Connections currently open
+            max_size: Configured maximum
+        """
+        self.db_pool_connections.labels(pool=pool, state="in_use").set(in_use)
+        self.db_pool_connections.labels(pool=pool, state="size").set(size)
+        self.db_pool_connections.labels(pool=pool, state="max").set(max_size)
+
+    def record_policy_cache(self, result: str) -> None:
+        """Record a policy decision cache event.
+
+        Args:
+            result: hit, miss, refresh (background refresh-ahead) or flush (bundle revision changed)
+        """
+        self.policy_cache_total.labels(result=result).inc()
+
+    def record_policy_batch(self, size: int, duration: float) -> None:
+        """Record one batched policy evaluation (once per batch, not per product).
+
+        Args:
+            size: Data products in the batch
+            duration: Batch duration in seconds
+        """
+        self.policy_batch_size.observe(size)
+        self.policy_evaluation_duration_seconds.observe(duration)
+
+    def record_policy_engine(self, engine: str, count: int = 1) -> None:
+        """Record which engine decided policy evaluations.
+
+        Args:
+            engine: embedded (compiled in-process) or opa
+            count: Number of decisions
+        """
+        self.policy_evaluations_total.labels(engine=engine).inc(count)
+
+    def record_semantic_route(self, engine: str) -> None:
+        """Record which engine served a semantic layer query.
+
+        Args:
+            engine: embedded, cube, or embedded_fallback (embedded failed, Cube served)
+        """
+        self.semantic_queries_total.labels(engine=engine).inc()
+
+    def set_http_pool_utilization(
+        self, client: str, in_flight: int, open_: int, idle: int, max_size: int
+    ) -> None:
+        """Update outbound HTTP pool gauges.
+
+        Args:
+            client: Client label (e.g. cube_api)
+            in_flight: Requests currently being sent or awaiting a response
+            open_: Connections currently open
+            idle: Open connections available for reuse
+            max_size: Configured maximum connections
+        """
+        self.http_pool_connections.labels(client=client, state="in_flight").set(in_flight)
+        self.http_pool_connections.labels(client=client, state="open").set(open_)
+        self.http_pool_connections.labels(client=client, state="idle").set(idle)
+        self.http_pool_connections.labels(client=client, state="max").set(max_size)
+
+    def record_retry(self, store: str, outcome: str, tokens: float | None = None) -> None:
+        """Record a retry decision.
+
+        Args:
+            store: Store name
+            outcome: retried, budget_exhausted (retry budget spent) or deadline
+                (backoff would end past the request deadline)
+            tokens: Tokens left in the store's retry budget, if it has one
+        """
+        self.retries_total.labels(store=store, outcome=outcome).inc()
+        if tokens is not None:
+            self.retry_budget_tokens.labels(store=store).set(tokens)
+
+    def set_store_concurrency(self, store: str, limit: int, in_flight: int, queued: int) -> None:
+        """Update adaptive concurrency gauges.
+
+        Args:
+            store: Store name
+            limit: Current concurrency limit
+            in_flight: Calls holding a slot
+            queued: Calls waiting for a slot
+        """
+        self.store_concurrency.labels(store=store, state="limit").set(limit)
+        self.store_concurrency.labels(store=store, state="in_flight").set(in_flight)
+        self.store_concurrency.labels(store=store, state="queued").set(queued)
+
+    def record_store_shed(self, store: str) -> None:
+        """Record a store call shed at the concurrency limit.
+
+        Args:
+            store: Store name
+        """
+        self.store_shed_total.labels(store=store).inc()
+
+    def set_circuit_state(self, store: str, state: str) -> None:
+        """Update the circuit breaker state gauge.
+
+        Args:
+            store: Store name
+            state: closed, half_open or open
+        """
+        self.circuit_breaker_state.labels(store=store).set(_CIRCUIT_STATES[state])
+
     def record_validation_failure(self, rule: str) -> None:
         """Record validation failure.
 
@@ -10,8 +10,10 @@ from typing import Callable
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 
+from ecp.config import settings
 from ecp.observability.logging import bind_request_context, get_logger, unbind_request_context
 from ecp.observability.metrics import metrics
+from ecp.resilience.deadline import deadline_scope
 
 logger = get_logger(__name__)
 
@@ -24,6 +26,7 @@ class ObservabilityMiddleware(BaseHTTPMiddleware):
     - Binds request context for structured logging
     - Logs request start/end
     - Collects latency metrics
+    - Sets the request deadline (settings.request_deadline_seconds)
     - Handles errors
     """
 
@@ -50,7 +53,8 @@ class ObservabilityMiddleware(BaseHTTPMiddleware):
         # Process request
         start_time = time.time()
         try:
-            response = await call_next(request)
+            with deadline_scope(settings.request_deadline_seconds):
+                response = await call_next(request)
             duration = time.time() - start_time
 
             # Add request ID to response headers
@@ -0,0 +1,151 @@
+"""Workload sketch: which semantic-layer query shapes run, how often, how slowly.
+
+A query shape is what a Cube pre-aggregation has to cover: the cube, its
+measures, its dimensions, the members it filters on (values are ignored) and
+the time dimension and granularity. The orchestrator records every executed
+query; the recorder keeps per-shape counts and a log-scale latency histogram.
+
+Memory is bounded by settings.workload_max_shapes. When full, a new shape
+replaces the least frequent one and inherits its count as an error bound
+(Space-Saving), so the heavy hitters - the shapes worth pre-aggregating -
+are always retained.
+
+Usage:
+    from ecp.observability.workload import WorkloadRecorder
+
+    workload = WorkloadRecorder()
+    workload.record(cube_query, duration_seconds)
+    for stats in workload.shapes():
+        print(stats.shape, stats.count, stats.mean_seconds, stats.quantile(0.95))
+"""
+
+import math
+from dataclasses import dataclass, field
+from typing import Any
+
+from ecp.config import settings
+
+# Histogram bucket i holds latencies in [2^(i-1), 2^i) ms; the last bucket is open-ended
+_BUCKETS = 20
+
+
+@dataclass(frozen=True)
+class QueryShape:
+    cube: str
+    measures: tuple[str, ...]
+    dimensions: tuple[str, ...]
+    filters: tuple[str, ...] = ()
+    time_dimension: str | None = None
+    granularity: str | None = None
+
+    @classmethod
+    def from_query(cls, query: dict[str, Any]) -> "QueryShape":
+        """Shape of a Cube /load query ({measures, dimensions, filters, timeDimensions})."""
+        measures = tuple(sorted(query.get("measures") or []))
+        time_dimensions = query.get("timeDimensions") or []
+        time_dimension = time_dimensions[0] if time_dimensions else {}
+        return cls(
+            cube=(measures[0] if measures else "").partition(".")[0],
+            measures=measures,
+            dimensions=tuple(sorted(query.get("dimensions") or [])),
+            filters=tuple(
+                sorted({f["member"] for f in query.get("filters") or [] if "member" in f})
+            ),
+            time_dimension=time_dimension.get("dimension"),
+            granularity=time_dimension.get("granularity"),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "cube": self.cube,
+            "measures": list(self.measures),
+            "dimensions": list(self.dimensions),
+            "filters": list(self.filters),
+            "time_dimension": self.time_dimension,
+            "granularity": self.granularity,
+        }
+
+
+@dataclass
+class ShapeStats:
+    """Counts and latency histogram for one query shape.
+
+    count is the Space-Saving estimate (may overcount by at most error);
+    latency figures cover only the samples observed since the shape entered
+    the sketch.
+    """
+
+    shape: QueryShape
+    count: int = 0
+    error: int = 0
+    observed: int = 0
+    total_seconds: float = 0.0
+    buckets: list[int] = field(default_factory=lambda: [0] * _BUCKETS)
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.observed += 1
+        self.total_seconds += seconds
+        ms = max(seconds * 1000.0, 0.0)
+        self.buckets[min(_BUCKETS - 1, math.frexp(ms)[1] if ms >= 1 else 0)] += 1
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.total_seconds / self.observed if self.observed else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the histogram bucket holding quantile q, in seconds."""
+        if not self.observed:
+            return 0.0
+        rank = q * self.observed
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank:
+                return (2**i) / 1000.0
+        return (2 ** (_BUCKETS - 1)) / 1000.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            **self.shape.to_dict(),
+            "count": self.count,
+            "count_error": self.error,
+            "mean_seconds": round(self.mean_seconds, 4),
+            "p95_seconds": self.quantile(0.95),
+        }
+
+
+class WorkloadRecorder:
+    """Bounded in-memory sketch of semantic-layer query shapes and latency."""
+
+    def __init__(self, max_shapes: int | None = None) -> None:
+        self._max_shapes = max_shapes or settings.workload_max_shapes
+        self._shapes: dict[QueryShape, ShapeStats] = {}
+        self.total = 0
+
+    def record(self, query: dict[str, Any], seconds: float) -> None:
+        """Count one executed query and its latency."""
+        shape = QueryShape.from_query(query)
+        if not shape.measures:
+            return
+        self.total += 1
+        stats = self._shapes.get(shape)
+        if stats is None:
+            stats = ShapeStats(shape)
+            if len(self._shapes) >= self._max_shapes:
+                evicted = min(self._shapes.values(), key=lambda s: s.count)
+                del self._shapes[evicted.shape]
+                stats.count = stats.error = evicted.count
+            self._shapes[shape] = stats
+        stats.add(seconds)
+
+    def shapes(self) -> list[ShapeStats]:
+        """Tracked shapes, most frequent first."""
+        return sorted(self._shapes.values(), key=lambda s: s.count, reverse=True)
+
+    def __len__(self) -> int:
+        return len(self._shapes)
+
+    def reset(self) -> None:
+        self._shapes.clear()
+        self.total = 0
@@ -7,6 +7,8 @@ This is the production-ready version with:
 - Store query timing
 """
 
+import asyncio
+import json
 import time
 import uuid
 from typing import Any
@@ -18,18 +20,26 @@ from ecp.adapters.base import (
     SemanticLayerClient,
     VectorStore,
 )
+from ecp.adapters.loader import AssetLoader
+from ecp.adapters.semantic import build_query
 from ecp.domain.models import (
     DAGNode,
     ExecutionPlan,
+    ResolutionDAG,
     ResolveRequest,
     ResolveResponse,
-    ResolutionDAG,
     UserContext,
 )
+from ecp.index.scope import ScopeIndex, known_issue_warning
 from ecp.observability import get_logger, metrics
+from ecp.observability.workload import WorkloadRecorder
+from ecp.resilience.exceptions import StoreOverloadedError
 
 logger = get_logger(__name__)
 
+# Warehouse tables behind each Cube cube (see cube/schema), for scoping known issues
+_CUBE_TABLES = {"Revenue": ["finance.fact_revenue_daily"]}
+
 
 class ResolutionOrchestrator:
     """Orchestrates resolution from natural language concept to execution plan and execution to results."""
@@ -41,20 +51,31 @@ class ResolutionOrchestrator:
         registry: AssetRegistry,
         semantic: SemanticLayerClient,
         policy: PolicyEngine,
+        scope_index: ScopeIndex | None = None,
+        workload: WorkloadRecorder | None = None,
     ) -> None:
         self._graph = graph
         self._vector = vector
         self._registry = registry
         self._semantic = semantic
         self._policy = policy
+        self._scope_index = scope_index
+        self._workload = workload
         self._resolution_cache: dict[str, dict[str, Any]] = {}
         logger.info("orchestrator_initialized")
 
+    @property
+    def workload(self) -> WorkloadRecorder | None:
+        """Recorder of executed Cube query shapes (None if not recording)."""
+        return self._workload
+
     async def resolve(self, request: ResolveRequest) -> ResolveResponse:
         """Resolve a business concept to canonical definition and execution plan."""
         query_id = str(uuid.uuid4())
         user_ctx = (request.user_context or UserContext()).model_dump(exclude_none=True)
         dag = ResolutionDAG(query_id=query_id, user_context=user_ctx, original_query=request.concept, nodes=[])
+        # Registry lookups made while resolving are batched into get_assets calls
+        assets = AssetLoader(self._registry)
 
         logger.info(
             "resolution_started",
@@ -82,10 +103,12 @@ class ResolutionOrchestrator:
         # 2. Resolve CONCEPTS: metric (vector + graph), region (graph), time (registry)
         resolved: dict[str, Any] = {}
 
-        # METRIC: semantic search then graph
+        # METRIC: hybrid (lexical + semantic) search then graph
         try:
             start_time = time.time()
-            vector_hits = await self._vector.search(request.concept, type_filter="glossary_term", top_k=3)
+            vector_hits = await self._vector.search_hybrid(
+                request.concept, type_filter="glossary_term", top_k=3
+            )
             vector_duration = time.time() - start_time
             metrics.record_store_query("vector", vector_duration)
             logger.debug(
@@ -94,6 +117,8 @@ class ResolutionOrchestrator:
                 hits=len(vector_hits),
                 duration_seconds=vector_duration,
             )
+        except StoreOverloadedError:
+            raise
         except Exception as e:
             logger.error("vector_search_failed", query_id=query_id, error=str(e), exc_info=True)
             metrics.record_store_query("vector", 0.0, error=type(e).__name__)
@@ -105,6 +130,7 @@ class ResolutionOrchestrator:
             resolved["metric"] = {"id": first.get("metadata", {}).get("term", "net_revenue"), "source": "vector"}
             metric_id = resolved["metric"].get("id") or "net_revenue"
 
+        graph_metric: dict[str, Any] | None = None
         try:
             start_time = time.time()
             graph_metric = await self._graph.get_metric_by_id(metric_id)
@@ -121,6 +147,9 @@ class ResolutionOrchestrator:
             if graph_metric:
                 resolved["metric"] = resolved.get("metric") or {}
                 resolved["metric"]["semantic_layer_ref"] = graph_metric.get("semantic_layer_ref", "Revenue.netRevenue")
+        except StoreOverloadedError:
+            # Shed at the concurrency limit: answer 503 rather than a guessed metric
+            raise
         except Exception as e:
             logger.error("graph_metric_lookup_failed", query_id=query_id, error=str(e), exc_info=True)
             metrics.record_store_query("graph", 0.0, error=type(e).__name__)
@@ -147,6 +176,8 @@ class ResolutionOrchestrator:
                 "region_code": region_code,
                 "countries": ["JP", "KR", "SG", "HK", "TW", "AU", "NZ", "IN", "CN"],
             }
+        except StoreOverloadedError:
+            raise
         except Exception as e:
             logger.error("graph_region_resolution_failed", query_id=query_id, error=str(e), exc_info=True)
             metrics.record_store_query("graph", 0.0, error=type(e).__name__)
@@ -167,7 +198,7 @@ class ResolutionOrchestrator:
         # TIME: calendar from registry
         try:
             start_time = time.time()
-            cal = await self._registry.get_asset("ar_cal_001")
+            cal = await assets.load("ar_cal_001")
             registry_duration = time.time() - start_time
             metrics.record_store_query("registry", registry_duration)
 
@@ -200,6 +231,11 @@ class ResolutionOrchestrator:
         elif resolved.get("region", {}).get("region_code"):
             filters["Revenue.region"] = [resolved["region"]["region_code"]]
 
+        # Each query carries the data product it reads, for authorization
+        data_product = {
+            "name": semantic_ref.rsplit(".", 1)[0],
+            "certification_tier": (graph_metric or {}).get("certification_tier", 1),
+        }
         execution_plan = ExecutionPlan(
             plan_type="metric_query",
             queries=[
@@ -208,6 +244,7 @@ class ResolutionOrchestrator:
                     "measure": measure,
                     "dimensions": ["Revenue.region", "Revenue.fiscalPeriod"],
                     "filters": filters,
+                    "data_product": data_product,
                 }
             ],
         )
@@ -227,32 +264,23 @@ class ResolutionOrchestrator:
             num_queries=len(execution_plan.queries or []),
         )
 
-        # 4. Authorize
-        data_product = {"certification_tier": 1}
-
-        try:
-            start_time = time.time()
-            policy_result = await self._policy.evaluate(
-                {"role": user_ctx.get("role") or "analyst"},
-                "query",
-                data_product,
+        known_issues = self._known_issues(resolved, measure)
+        if self._scope_index is not None:
+            dag.nodes.append(
+                DAGNode(
+                    id="check_known_issues",
+                    type="validate",
+                    status="complete",
+                    depends_on=["build_plan"],
+                    output={"matched": [w["asset_id"] for w in known_issues]},
+                )
             )
-            policy_duration = time.time() - start_time
-            allowed = policy_result.get("allow", False)
 
-            metrics.record_policy_decision("allow" if allowed else "deny", policy_duration)
-            logger.info(
-                "policy_evaluated",
-                query_id=query_id,
-                decision="allow" if allowed else "deny",
-                role=user_ctx.get("role") or "analyst",
-                duration_seconds=policy_duration,
-            )
-        except Exception as e:
-            logger.error("policy_evaluation_failed", query_id=query_id, error=str(e), exc_info=True)
-            allowed = False
-            policy_result = {"allow": False, "error": str(e)}
-            metrics.record_policy_decision("error", 0.0)
+        # 4. Authorize every data product the plan reads, batched when there are several
+        policy_user = {"role": user_ctx.get("role") or "analyst"}
+        if user_ctx.get("allowed_regions") is not None:
+            policy_user["allowed_regions"] = user_ctx["allowed_regions"]
+        allowed, policy_result = await self._authorize(query_id, policy_user, execution_plan)
 
         auth_node = DAGNode(
             id="authorize",
@@ -274,11 +302,50 @@ class ResolutionOrchestrator:
                 warnings=[{"type": "access_denied", "message": "Policy evaluation denied access"}],
             )
 
+        # 5. Row-level filters: pushed into each query so the warehouse scans only permitted rows
+        row_filters = await self._row_filters(query_id, policy_user, execution_plan)
+        permitted = True
+        for q in execution_plan.queries:
+            merged = apply_row_filters(
+                q.get("filters", {}), q.get("measure", ""), row_filters[q.get("id", "default")]
+            )
+            if merged is None:
+                permitted = False
+                break
+            q["filters"] = merged
+        dag.nodes.append(
+            DAGNode(
+                id="row_filters",
+                type="authorize",
+                status="complete",
+                depends_on=["authorize"],
+                output={"row_filters": row_filters, "permitted": permitted},
+            )
+        )
+        if not permitted:
+            logger.warning(
+                "resolution_no_permitted_rows", query_id=query_id, role=user_ctx.get("role")
+            )
+            return ResolveResponse(
+                resolution_id=query_id,
+                status="access_denied",
+                resolved_concepts=resolved,
+                confidence_score=0.0,
+                provenance={"dag": dag.model_dump(), "reason": "No rows permitted"},
+                warnings=[
+                    {
+                        "type": "access_denied",
+                        "message": "Row-level policy permits no rows for this query",
+                    }
+                ],
+            )
+
         # Cache resolution for execute
         self._resolution_cache[query_id] = {
             "execution_plan": execution_plan,
             "resolved_concepts": resolved,
             "user_context": user_ctx,
+            "row_filters": row_filters,
         }
 
         logger.info(
@@ -295,9 +362,93 @@ class ResolutionOrchestrator:
             resolved_concepts=resolved,
             confidence_score=0.92,
             provenance={"dag": dag.model_dump()},
-            warnings=[],
+            warnings=known_issues,
         )
 
+    async def _authorize(
+        self, query_id: str, policy_user: dict[str, Any], plan: ExecutionPlan
+    ) -> tuple[bool, dict[str, Any]]:
+        """Evaluate the query action on each distinct data product in the plan.
+
+        A single product is one evaluate call; several are one evaluate_many
+        call. Access is allowed only if every product is.
+
+        Returns:
+            (allowed, policy_result)
+        """
+        data_products = list(_distinct_data_products(plan).values())
+        try:
+            start_time = time.time()
+            if len(data_products) == 1:
+                policy_result = await self._policy.evaluate(policy_user, "query", data_products[0])
+                decisions = [policy_result]
+            else:
+                decisions = await self._policy.evaluate_many(policy_user, "query", data_products)
+                policy_result = {"decisions": decisions}
+            policy_duration = time.time() - start_time
+            allowed = all(d.get("allow", False) for d in decisions)
+
+            metrics.record_policy_decision("allow" if allowed else "deny", policy_duration)
+            logger.info(
+                "policy_evaluated",
+                query_id=query_id,
+                decision="allow" if allowed else "deny",
+                role=policy_user["role"],
+                data_products=len(data_products),
+                duration_seconds=policy_duration,
+            )
+        except Exception as e:
+            logger.error("policy_evaluation_failed", query_id=query_id, error=str(e), exc_info=True)
+            allowed = False
+            policy_result = {"allow": False, "error": str(e)}
+            metrics.record_policy_decision("error", 0.0)
+        return allowed, policy_result
+
+    async def _row_filters(
+        self, query_id: str, policy_user: dict[str, Any], plan: ExecutionPlan
+    ) -> dict[str, dict[str, list[Any]] | None]:
+        """Row filters for each plan query, from the data product it reads.
+
+        Each distinct product is evaluated once; a product whose evaluation
+        fails permits no rows.
+
+        Returns:
+            {plan query id: row filters} (see PolicyEngine.row_filters)
+        """
+        products = _distinct_data_products(plan)
+        evaluated = await asyncio.gather(
+            *(self._policy.row_filters(policy_user, "query", p) for p in products.values()),
+            return_exceptions=True,
+        )
+        by_product: dict[str, dict[str, list[Any]] | None] = {}
+        for key, filters in zip(products, evaluated, strict=True):
+            if isinstance(filters, BaseException):
+                logger.error(
+                    "row_filter_evaluation_failed",
+                    query_id=query_id,
+                    data_product=products[key],
+                    error=str(filters),
+                )
+                filters = None
+            by_product[key] = filters
+        return {
+            q.get("id", "default"): by_product[_data_product_key(_query_data_product(q))]
+            for q in plan.queries
+        }
+
+    def _known_issues(self, resolved: dict[str, Any], measure: str) -> list[dict[str, Any]]:
+        """Tribal knowledge whose scope covers the resolved region, period and tables."""
+        if self._scope_index is None:
+            return []
+        region = resolved.get("region") or {}
+        region_values = [region["region_code"]] if region.get("region_code") else []
+        region_values.extend(region.get("countries") or [])
+        dimensions = {"region": region_values}
+        if (resolved.get("time") or {}).get("fiscal_period"):
+            dimensions["fiscal_period"] = [resolved["time"]["fiscal_period"]]
+        tables = _CUBE_TABLES.get(measure.split(".", 1)[0]) if "." in measure else None
+        return [known_issue_warning(a) for a in self._scope_index.match(dimensions, tables)]
+
     async def execute(self, resolution_id: str, parameters: dict[str, Any] | None = None) -> dict[str, Any]:
         """Execute a previously resolved query; return results and provenance."""
         logger.info("execution_started", resolution_id=resolution_id, additional_parameters=bool(parameters))
@@ -315,16 +466,32 @@ class ResolutionOrchestrator:
         plan = cached["execution_plan"]
         resolved = cached["resolved_concepts"]
         params = parameters or {}
+        row_filters = cached["row_filters"]
 
         # Run semantic layer query
         queries = plan.queries or []
         results: dict[str, Any] = {}
+        pending: list[str] = []
+        warnings: list[dict[str, Any]] = []
 
         for q in queries:
             query_id = q.get("id", "default")
             measure = q.get("measure", "Revenue.netRevenue")
             dimensions = q.get("dimensions", ["Revenue.region", "Revenue.fiscalPeriod"])
-            filters = {**q.get("filters", {}), **params}
+            # Parameters must not widen the rows the policy permits
+            filters = apply_row_filters(
+                {**q.get("filters", {}), **params}, measure, row_filters.get(query_id)
+            )
+            if filters is None:
+                results[query_id] = {"data": [], "error": "No rows permitted by row-level policy"}
+                warnings.append(
+                    {
+                        "type": "access_denied",
+                        "query_id": query_id,
+                        "message": "Parameters fall outside permitted rows",
+                    }
+                )
+                continue
 
             try:
                 start_time = time.time()
@@ -342,7 +509,17 @@ class ResolutionOrchestrator:
                 )
 
                 results[query_id] = data
-
+                degraded = isinstance(data, dict) and data.get("degraded")
+                if self._workload is not None and not degraded:
+                    # Fallback answers say nothing about warehouse latency; pending ones
+                    # are recorded with the time waited, a lower bound
+                    self._workload.record(build_query(measure, dimensions, filters), duration)
+                if isinstance(data, dict) and data.get("status") == "pending":
+                    # Still running in the warehouse; the caller polls the handle
+                    pending.append(data["query_id"])
+
+            except StoreOverloadedError:
+                raise
             except Exception as e:
                 logger.error(
                     "semantic_query_failed",
@@ -358,14 +535,74 @@ class ResolutionOrchestrator:
             "execution_complete",
             resolution_id=resolution_id,
             queries_executed=len(results),
+            queries_pending=len(pending),
         )
 
-        return {
+        response: dict[str, Any] = {
             "results": results,
             "provenance": {"resolution_id": resolution_id, "resolved_concepts": resolved},
             "confidence_score": 0.92,
-            "warnings": [],
+            "warnings": warnings,
         }
+        if pending:
+            response["pending_queries"] = pending
+        return response
+
+    async def poll_query(self, query_id: str) -> dict[str, Any] | None:
+        """Poll a semantic-layer query that execute returned as pending.
+
+        Returns:
+            Query results, the pending handle again, or None if the handle is unknown
+        """
+        start_time = time.time()
+        data = await self._semantic.poll_query(query_id)
+        metrics.record_store_query("semantic", time.time() - start_time)
+        return data
+
+
+def _data_product_key(data_product: dict[str, Any]) -> str:
+    return json.dumps(data_product, sort_keys=True, default=str)
+
+
+def _query_data_product(query: dict[str, Any]) -> dict[str, Any]:
+    return query.get("data_product") or {"certification_tier": 1}
+
+
+def _distinct_data_products(plan: ExecutionPlan) -> dict[str, dict[str, Any]]:
+    """{key: data product} for the products the plan's queries read, in plan order."""
+    products = [_query_data_product(q) for q in plan.queries] or [{"certification_tier": 1}]
+    return {_data_product_key(p): p for p in products}
+
+
+def apply_row_filters(
+    filters: dict[str, Any], measure: str, row_filters: dict[str, list[Any]] | None
+) -> dict[str, Any] | None:
+    """Narrow query filters to the rows a policy permits.
+
+    Row filter columns are dimensions of the measure's cube ("region" ->
+    "Revenue.region"). An existing filter on the member is intersected with
+    the permitted values; otherwise the permitted values become the filter.
+
+    Returns:
+        The merged filters, or None if no row can be permitted
+    """
+    if row_filters is None:
+        return None
+    merged = dict(filters)
+    cube = measure.split(".", 1)[0] if "." in measure else ""
+    for column, allowed in row_filters.items():
+        member = f"{cube}.{column}" if cube else column
+        current = merged.get(member)
+        if current is None:
+            values = list(allowed)
+        else:
+            permitted = {str(v) for v in allowed}
+            requested = current if isinstance(current, list) else [current]
+            values = [v for v in requested if str(v) in permitted]
+        if not values:
+            return None
+        merged[member] = values
+    return merged
 
 
 def _parse_intent(concept: str) -> dict[str, Any]:
@@ -1,14 +1,18 @@
 """Resilience module - retry logic, circuit breakers, graceful degradation."""
 
+from ecp.resilience import deadline
 from ecp.resilience.circuit_breaker import (
     CircuitBreakerManager,
+    CircuitState,
     is_circuit_open,
     wait_for_circuit_recovery,
     with_circuit_breaker,
 )
+from ecp.resilience.concurrency import with_concurrency_limit
 from ecp.resilience.degradation import DegradationMode
 from ecp.resilience.exceptions import (
     AuthorizationError,
+    CircuitBreakerError,
     ECPError,
     ResolutionError,
     StoreError,
@@ -24,9 +28,13 @@ __all__ = [
     "AuthorizationError",
     "retry_on_transient_error",
     "with_retry",
+    "with_concurrency_limit",
     "CircuitBreakerManager",
+    "CircuitBreakerError",
+    "CircuitState",
     "with_circuit_breaker",
     "is_circuit_open",
     "wait_for_circuit_recovery",
     "DegradationMode",
+    "deadline",
 ]
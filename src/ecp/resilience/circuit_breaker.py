@@ -9,31 +9,205 @@ States:
 - HALF_OPEN: Testing if service has recovered
 
 Key Features:
-- Automatic state transitions based on failure rates
-- Configurable failure thresholds
-- Recovery timeout
-- Metrics and logging integration
+- Trips on failure rate and slow-call rate over a sliding time window
+  (one-second buckets), not on a run of consecutive failures, so the trip
+  point does not depend on request rate
+- A bounded number of half-open probes; the breaker closes once they all
+  succeed and reopens on the first failure
+- Per-store configuration from settings (CIRCUIT_* defaults, overridden per
+  store by CIRCUIT_BREAKER_STORES)
+- Metrics (ecp_circuit_breaker_state) and logging integration
+
+Only transient errors (see is_retryable) count as failures; client errors
+and calls shed locally are not counted either way.
 
 Usage:
-    from ecp.resilience import CircuitBreakerManager
+    from ecp.resilience import with_circuit_breaker
 
-    breaker = CircuitBreakerManager.get_breaker("cube_api")
-
-    async with breaker:
+    async with with_circuit_breaker("cube_api"):
         result = await call_external_service()
 """
 
 import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
-from typing import Any, AsyncIterator
-
-from pybreaker import CircuitBreaker, CircuitBreakerError, CircuitBreakerState
+from dataclasses import dataclass, fields, replace
+from enum import StrEnum
+from typing import Any
 
+from ecp.config import settings
 from ecp.observability import get_logger, metrics
+from ecp.resilience.exceptions import CircuitBreakerError
+from ecp.resilience.retry import is_retryable
 
 logger = get_logger(__name__)
 
 
+class CircuitState(StrEnum):
+    CLOSED = "closed"
+    HALF_OPEN = "half_open"
+    OPEN = "open"
+
+
+@dataclass(frozen=True)
+class BreakerConfig:
+    """Trip and recovery settings for one breaker."""
+
+    window_seconds: float
+    min_calls: int
+    failure_rate_threshold: float
+    slow_call_seconds: float
+    slow_call_rate_threshold: float
+    open_seconds: float
+    half_open_probes: int
+
+    @classmethod
+    def for_store(cls, name: str, **overrides: Any) -> "BreakerConfig":
+        """Settings defaults, then CIRCUIT_BREAKER_STORES[name], then explicit overrides."""
+        config = cls(
+            window_seconds=settings.circuit_window_seconds,
+            min_calls=settings.circuit_min_calls,
+            failure_rate_threshold=settings.circuit_failure_rate_threshold,
+            slow_call_seconds=settings.circuit_slow_call_seconds,
+            slow_call_rate_threshold=settings.circuit_slow_call_rate_threshold,
+            open_seconds=settings.circuit_open_seconds,
+            half_open_probes=settings.circuit_half_open_probes,
+        )
+        known = {f.name for f in fields(cls)}
+        merged = {**settings.circuit_breaker_stores.get(name, {}), **overrides}
+        unknown = set(merged) - known
+        if unknown:
+            raise ValueError(f"unknown circuit breaker settings for {name}: {sorted(unknown)}")
+        return replace(config, **merged)
+
+
+class CircuitBreaker:
+    """Async circuit breaker for one store."""
+
+    def __init__(self, name: str, config: BreakerConfig) -> None:
+        self.name = name
+        self.config = config
+        self._state = CircuitState.CLOSED
+        # [second, calls, failures, slow] per one-second bucket, oldest first
+        self._buckets: deque[list[int]] = deque()
+        self._calls = 0
+        self._failures = 0
+        self._slow = 0
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        metrics.set_circuit_state(name, self._state.value)
+
+    @property
+    def state(self) -> CircuitState:
+        if self._state == CircuitState.OPEN and self._open_remaining() <= 0:
+            return CircuitState.HALF_OPEN
+        return self._state
+
+    def _open_remaining(self) -> float:
+        return self._opened_at + self.config.open_seconds - time.monotonic()
+
+    def before_call(self) -> bool:
+        """Admit a call or raise.
+
+        Returns:
+            True if the call is a half-open probe
+
+        Raises:
+            CircuitBreakerError: If the breaker is open or out of half-open probes
+        """
+        if self._state == CircuitState.CLOSED:
+            return False
+        if self._state == CircuitState.OPEN:
+            remaining = self._open_remaining()
+            if remaining > 0:
+                raise CircuitBreakerError(self.name, remaining)
+            self._transition(CircuitState.HALF_OPEN)
+        if self._probes_in_flight + self._probe_successes >= self.config.half_open_probes:
+            raise CircuitBreakerError(self.name, self.config.open_seconds)
+        self._probes_in_flight += 1
+        return True
+
+    def on_result(self, probe: bool, duration: float, failed: bool) -> None:
+        """Record a completed call."""
+        slow = duration >= self.config.slow_call_seconds
+        if probe:
+            self._probes_in_flight -= 1
+            if self._state != CircuitState.HALF_OPEN:
+                return
+            if failed or slow:
+                self._transition(CircuitState.OPEN)
+                return
+            self._probe_successes += 1
+            if self._probe_successes >= self.config.half_open_probes:
+                self._transition(CircuitState.CLOSED)
+            return
+        if self._state != CircuitState.CLOSED:
+            # Admitted before the trip; says nothing about the recovery
+            return
+        self._record(failed, slow)
+        if self._calls >= self.config.min_calls and (
+            self._failures >= self.config.failure_rate_threshold * self._calls
+            or self._slow >= self.config.slow_call_rate_threshold * self._calls
+        ):
+            self._transition(CircuitState.OPEN)
+
+    def on_ignored(self, probe: bool) -> None:
+        """Release a call whose outcome does not count (client error, cancellation)."""
+        if probe:
+            self._probes_in_flight -= 1
+
+    def _record(self, failed: bool, slow: bool) -> None:
+        now = int(time.monotonic())
+        horizon = now - self.config.window_seconds
+        while self._buckets and self._buckets[0][0] <= horizon:
+            _, calls, failures, slow_calls = self._buckets.popleft()
+            self._calls -= calls
+            self._failures -= failures
+            self._slow -= slow_calls
+        if not self._buckets or self._buckets[-1][0] != now:
+            self._buckets.append([now, 0, 0, 0])
+        bucket = self._buckets[-1]
+        bucket[1] += 1
+        self._calls += 1
+        if failed:
+            bucket[2] += 1
+            self._failures += 1
+        if slow:
+            bucket[3] += 1
+            self._slow += 1
+
+    def _transition(self, state: CircuitState) -> None:
+        old = self._state
+        if state == CircuitState.OPEN:
+            self._opened_at = time.monotonic()
+        if state != CircuitState.CLOSED:
+            self._probe_successes = 0
+        self._buckets.clear()
+        failure_rate = self._failures / self._calls if self._calls else 0.0
+        self._calls = self._failures = self._slow = 0
+        self._state = state
+        logger.warning(
+            "circuit_breaker_state_changed",
+            breaker_name=self.name,
+            old_state=old.value,
+            new_state=state.value,
+            failure_rate=round(failure_rate, 3),
+        )
+        metrics.set_circuit_state(self.name, state.value)
+        metrics.record_error(error_type=f"circuit_breaker_{state.value}", component=self.name)
+
+    def reset(self) -> None:
+        """Close the breaker and forget the window."""
+        if self._state != CircuitState.CLOSED:
+            self._transition(CircuitState.CLOSED)
+        self._buckets.clear()
+        self._calls = self._failures = self._slow = 0
+        self._probes_in_flight = self._probe_successes = 0
+
+
 class CircuitBreakerManager:
     """Manages circuit breakers for external services.
 
@@ -43,49 +217,20 @@ class CircuitBreakerManager:
     _breakers: dict[str, CircuitBreaker] = {}
 
     @classmethod
-    def get_breaker(
-        cls,
-        name: str,
-        failure_threshold: int = 5,
-        recovery_timeout: int = 60,
-        expected_exception: type[Exception] = Exception,
-    ) -> CircuitBreaker:
+    def get_breaker(cls, name: str, **overrides: Any) -> CircuitBreaker:
         """Get or create a circuit breaker for a service.
 
         Args:
-            name: Unique name for the service (e.g., "cube_api", "opa_policy")
-            failure_threshold: Number of failures before opening circuit
-            recovery_timeout: Seconds to wait before attempting recovery
-            expected_exception: Exception type that triggers the breaker
+            name: Unique name for the service (e.g., "cube_api", "opa")
+            **overrides: BreakerConfig fields; applied only when the breaker is created
 
         Returns:
             CircuitBreaker instance
         """
         if name not in cls._breakers:
-            logger.info(
-                "circuit_breaker_created",
-                name=name,
-                failure_threshold=failure_threshold,
-                recovery_timeout=recovery_timeout,
-            )
-
-            breaker = CircuitBreaker(
-                fail_max=failure_threshold,
-                reset_timeout=recovery_timeout,
-                exclude=[
-                    # Don't trip breaker on these exceptions
-                    ValueError,
-                    TypeError,
-                    KeyError,
-                ],
-                listeners=[
-                    CircuitBreakerListener(name),
-                ],
-                name=name,
-            )
-
-            cls._breakers[name] = breaker
-
+            config = BreakerConfig.for_store(name, **overrides)
+            logger.info("circuit_breaker_created", name=name, **vars(config))
+            cls._breakers[name] = CircuitBreaker(name, config)
         return cls._breakers[name]
 
     @classmethod
@@ -96,57 +241,13 @@ class CircuitBreakerManager:
         logger.info("all_circuit_breakers_reset")
 
 
-class CircuitBreakerListener:
-    """Listener for circuit breaker state changes.
-
-    Records metrics and logs when breaker state changes.
-    """
-
-    def __init__(self, name: str) -> None:
-        self.name = name
-
-    def state_change(self, breaker: CircuitBreaker, old_state: CircuitBreakerState, new_state: CircuitBreakerState) -> None:
-        """Called when circuit breaker state changes."""
-        logger.warning(
-            "circuit_breaker_state_changed",
-            breaker_name=self.name,
-            old_state=old_state.name,
-            new_state=new_state.name,
-            failure_count=breaker.fail_counter,
-        )
-
-        # Record metric
-        metrics.record_error(
-            error_type=f"circuit_breaker_{new_state.name.lower()}",
-            component=self.name,
-        )
-
-    def before_call(self, breaker: CircuitBreaker, func: Any, *args: Any, **kwargs: Any) -> None:
-        """Called before attempting to call the protected function."""
-        pass
-
-    def success(self, breaker: CircuitBreaker) -> None:
-        """Called when call succeeds."""
-        pass
-
-    def failure(self, breaker: CircuitBreaker, exception: Exception) -> None:
-        """Called when call fails."""
-        logger.debug(
-            "circuit_breaker_failure",
-            breaker_name=self.name,
-            failure_count=breaker.fail_counter,
-            failure_threshold=breaker.fail_max,
-            error=str(exception),
-        )
-
-
 @asynccontextmanager
-async def with_circuit_breaker(name: str, **breaker_kwargs: Any) -> AsyncIterator[None]:
+async def with_circuit_breaker(name: str, **overrides: Any) -> AsyncIterator[None]:
     """Context manager for circuit breaker protection.
 
     Args:
         name: Service name for the circuit breaker
-        **breaker_kwargs: Additional arguments for get_breaker()
+        **overrides: BreakerConfig fields for get_breaker()
 
     Raises:
         CircuitBreakerError: If circuit is open
@@ -156,42 +257,37 @@ async def with_circuit_breaker(name: str, **breaker_kwargs: Any) -> AsyncIterato
         async with with_circuit_breaker("cube_api"):
             result = await cube_client.query(...)
     """
-    breaker = CircuitBreakerManager.get_breaker(name, **breaker_kwargs)
-
+    breaker = CircuitBreakerManager.get_breaker(name, **overrides)
     try:
-        # Check if circuit is open
-        if breaker.current_state == CircuitBreakerState.STATE_OPEN:
-            logger.warning(
-                "circuit_breaker_open_request_blocked",
-                breaker_name=name,
-                message="Circuit breaker is OPEN, request blocked",
-            )
-            raise CircuitBreakerError(breaker)
-
-        # Allow call through
-        yield
-
-        # Mark success
-        breaker.call_succeeded()
-
+        probe = breaker.before_call()
     except CircuitBreakerError:
-        # Circuit is open, don't count as failure
+        logger.warning(
+            "circuit_breaker_open_request_blocked",
+            breaker_name=name,
+            message="Circuit breaker is OPEN, request blocked",
+        )
         raise
 
+    start = time.monotonic()
+    try:
+        yield
     except Exception as e:
-        # Call failed, record failure
-        breaker.call_failed()
-
+        if not is_retryable(e):
+            breaker.on_ignored(probe)
+            raise
+        breaker.on_result(probe, time.monotonic() - start, failed=True)
         logger.error(
             "circuit_breaker_call_failed",
             breaker_name=name,
             error=str(e),
             error_type=type(e).__name__,
-            failure_count=breaker.fail_counter,
-            state=breaker.current_state.name,
+            state=breaker.state.value,
         )
-
         raise
+    except BaseException:
+        breaker.on_ignored(probe)
+        raise
+    breaker.on_result(probe, time.monotonic() - start, failed=False)
 
 
 def is_circuit_open(name: str) -> bool:
@@ -206,8 +302,7 @@ def is_circuit_open(name: str) -> bool:
     if name not in CircuitBreakerManager._breakers:
         return False
 
-    breaker = CircuitBreakerManager._breakers[name]
-    return breaker.current_state == CircuitBreakerState.STATE_OPEN
+    return CircuitBreakerManager._breakers[name].state == CircuitState.OPEN
 
 
 async def wait_for_circuit_recovery(name: str, max_wait: float = 120.0) -> bool:
@@ -0,0 +1,213 @@
+"""Adaptive concurrency limits per backing store.
+
+Each store gets an AIMD limit on concurrent calls, driven by observed latency:
+
+- A call that finishes under the store's latency target adds 1/limit to the
+  limit, about +1 per window of calls, but only while the limit is actually
+  in use (at least half of it in flight).
+- A call that is slower than the target, times out or fails with a transient
+  error multiplies the limit by CONCURRENCY_BACKOFF_RATIO. Only calls started
+  after the previous decrease count, so one burst of slow calls cuts once.
+
+Calls over the limit wait in a FIFO queue for up to
+CONCURRENCY_QUEUE_TIMEOUT_SECONDS (bounded by the request deadline). A full
+queue or an expired wait sheds the call with StoreOverloadedError, which the
+API returns as 503 with Retry-After. The store then runs near its throughput
+knee instead of queueing work inside itself.
+
+Usage:
+    from ecp.resilience import with_concurrency_limit, with_retry
+
+    @with_retry(store_name="neo4j")
+    @with_concurrency_limit("neo4j", latency_target=settings.neo4j_latency_target_seconds)
+    async def query_graph(query: str):
+        return await graph_db.run(query)
+"""
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import Callable
+from functools import wraps
+from typing import Any, TypeVar
+
+from ecp.config import settings
+from ecp.observability import get_logger, metrics
+from ecp.resilience import deadline
+from ecp.resilience.exceptions import StoreOverloadedError
+from ecp.resilience.retry import is_retryable
+
+logger = get_logger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit with a short FIFO queue for one store."""
+
+    def __init__(
+        self,
+        store: str,
+        latency_target: float,
+        initial_limit: int | None = None,
+        min_limit: int | None = None,
+        max_limit: int | None = None,
+        backoff_ratio: float | None = None,
+        max_queue: int | None = None,
+        queue_timeout: float | None = None,
+    ) -> None:
+        self.store = store
+        self.latency_target = latency_target
+        self.min_limit = settings.concurrency_min_limit if min_limit is None else min_limit
+        self.max_limit = settings.concurrency_max_limit if max_limit is None else max_limit
+        self.backoff_ratio = (
+            settings.concurrency_backoff_ratio if backoff_ratio is None else backoff_ratio
+        )
+        self.max_queue = settings.concurrency_max_queue if max_queue is None else max_queue
+        self.queue_timeout = (
+            settings.concurrency_queue_timeout_seconds if queue_timeout is None else queue_timeout
+        )
+        initial = settings.concurrency_initial_limit if initial_limit is None else initial_limit
+        self._limit = float(min(self.max_limit, max(self.min_limit, initial)))
+        self._in_flight = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._last_decrease = 0.0
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> None:
+        """Take a slot, waiting briefly in the queue if the store is at its limit.
+
+        Raises:
+            StoreOverloadedError: If the queue is full or the wait runs out
+        """
+        if self._in_flight < self.limit and not self._waiters:
+            self._in_flight += 1
+            self._publish()
+            return
+        timeout = self.queue_timeout
+        left = deadline.remaining()
+        if left is not None:
+            timeout = min(timeout, left)
+        if len(self._waiters) >= self.max_queue or timeout <= 0:
+            self._shed()
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._publish()
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except BaseException as e:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over as we gave up; pass it on
+                self.release(time.monotonic(), None)
+            else:
+                self._discard(waiter)
+            if isinstance(e, TimeoutError):
+                self._shed()
+            raise
+
+    def release(self, started: float, latency: float | None, dropped: bool = False) -> None:
+        """Return a slot and adjust the limit from the call's outcome.
+
+        Args:
+            started: time.monotonic() when the call started
+            latency: Call duration in seconds; None if the call says nothing about load
+            dropped: The call timed out or failed with a transient error
+        """
+        in_flight = self._in_flight
+        self._in_flight -= 1
+        if dropped or (latency is not None and latency > self.latency_target):
+            if started >= self._last_decrease:
+                self._limit = max(float(self.min_limit), self._limit * self.backoff_ratio)
+                self._last_decrease = time.monotonic()
+        elif latency is not None and in_flight * 2 >= self._limit:
+            self._limit = min(float(self.max_limit), self._limit + 1.0 / self._limit)
+        self._wake()
+        self._publish()
+
+    def _wake(self) -> None:
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._in_flight += 1
+                waiter.set_result(None)
+
+    def _discard(self, waiter: asyncio.Future[None]) -> None:
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+        self._publish()
+
+    def _shed(self) -> None:
+        metrics.record_store_shed(self.store)
+        logger.warning(
+            "store_call_shed",
+            store=self.store,
+            limit=self.limit,
+            in_flight=self._in_flight,
+            queued=len(self._waiters),
+        )
+        raise StoreOverloadedError(self.store, self.limit, settings.concurrency_retry_after_seconds)
+
+    def _publish(self) -> None:
+        metrics.set_store_concurrency(self.store, self.limit, self._in_flight, len(self._waiters))
+
+
+_limiters: dict[str, AdaptiveLimiter] = {}
+
+
+def concurrency_limiter(store: str, latency_target: float) -> AdaptiveLimiter:
+    """The shared limiter for a store (created on first use)."""
+    limiter = _limiters.get(store)
+    if limiter is None:
+        limiter = _limiters[store] = AdaptiveLimiter(store, latency_target)
+    return limiter
+
+
+def with_concurrency_limit(store: str, latency_target: float) -> Callable[[F], F]:
+    """Decorator running an async store call under the store's adaptive limit.
+
+    Place it below with_retry so each attempt takes its own slot; a shed
+    call is not retried.
+
+    Args:
+        store: Store name (one limiter per store)
+        latency_target: Calls slower than this (seconds) shrink the limit
+    """
+
+    def decorator(func: F) -> F:
+        @wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not settings.concurrency_limit_enabled:
+                return await func(*args, **kwargs)
+            limiter = concurrency_limiter(store, latency_target)
+            await limiter.acquire()
+            started = time.monotonic()
+            try:
+                result = await func(*args, **kwargs)
+            except Exception as e:
+                transient = is_retryable(e)
+                limiter.release(
+                    started, time.monotonic() - started if transient else None, transient
+                )
+                raise
+            except BaseException:
+                limiter.release(started, None)
+                raise
+            limiter.release(started, time.monotonic() - started)
+            return result
+
+        return wrapper  # type: ignore
+
+    return decorator
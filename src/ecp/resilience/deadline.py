@@ -0,0 +1,60 @@
+"""Request deadlines carried in a context variable.
+
+A deadline is set once at the edge (ObservabilityMiddleware, from
+settings.request_deadline_seconds) and read wherever work may wait: polling
+loops, retries, fallbacks. Nested scopes can only shorten the deadline,
+never extend it.
+
+Usage:
+    from ecp.resilience.deadline import deadline_scope, remaining
+
+    with deadline_scope(5.0):
+        ...
+        if (left := remaining()) is not None and left < interval:
+            return pending_handle
+"""
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_deadline: ContextVar[float | None] = ContextVar("ecp_request_deadline", default=None)
+
+
+@contextmanager
+def deadline_scope(seconds: float | None) -> Iterator[float | None]:
+    """Bound the enclosed work to `seconds` from now.
+
+    Args:
+        seconds: Time budget; None or <= 0 leaves the current deadline as is
+
+    Yields:
+        The effective absolute deadline (time.monotonic() clock), or None
+    """
+    current = _deadline.get()
+    if seconds is None or seconds <= 0:
+        yield current
+        return
+    deadline = time.monotonic() + seconds
+    if current is not None:
+        deadline = min(deadline, current)
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> float | None:
+    """Seconds left before the current deadline (0 if passed), or None if unbounded."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+
+def expired() -> bool:
+    """True if a deadline is set and has passed."""
+    left = remaining()
+    return left is not None and left <= 0
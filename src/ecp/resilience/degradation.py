@@ -5,9 +5,9 @@ ensuring the platform can continue operating in a degraded mode rather
 than completely failing.
 
 Degradation Strategies:
-- Vector store down → keyword-based search fallback
+- Vector store down → BM25 keyword index fallback
 - Policy engine down → fail-secure (deny by default)
-- Semantic layer down → return cached/approximate results
+- Semantic layer down → last-known-good results (see last_known_good.py), else empty
 - Graph store down → use limited registry data
 
 Key Features:
@@ -17,10 +17,16 @@ Key Features:
 - Configurable fail-secure vs fail-open policies
 """
 
-from typing import Any
+import time
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
 
+from ecp.config import settings
 from ecp.observability import get_logger, metrics
 
+if TYPE_CHECKING:
+    from ecp.index.keyword import KeywordIndex
+
 logger = get_logger(__name__)
 
 
@@ -92,23 +98,33 @@ class DegradationMode:
         cls._degraded_services.clear()
 
 
-def keyword_search_fallback(query: str, top_k: int = 3) -> list[dict[str, Any]]:
+def keyword_search_fallback(
+    query: str,
+    top_k: int = 3,
+    type_filter: str | None = None,
+    index: "KeywordIndex | None" = None,
+    metadata_filter: dict[str, Any] | None = None,
+) -> list[dict[str, Any]]:
     """Fallback keyword search when vector store is unavailable.
 
-    This is a simple keyword-based search that can work without embeddings.
-    In production, this could query a simpler index or cache.
+    Serves results from the in-memory BM25 index built from the registry,
+    so degraded mode still returns ranked glossary and tribal-knowledge hits.
 
     Args:
         query: Search query
         top_k: Number of results to return
+        type_filter: Optional asset type filter (e.g. "glossary_term")
+        index: Keyword index to search; without one, results are empty
+        metadata_filter: Optional metadata containment filter (e.g. {"domain": "finance"})
 
     Returns:
-        List of search results (may be empty or lower quality)
+        List of search results (empty if no index is available)
     """
     logger.warning(
         "keyword_search_fallback_used",
         query=query,
         top_k=top_k,
+        indexed_documents=len(index) if index is not None else 0,
         message="Vector store unavailable, using keyword fallback",
     )
 
@@ -117,9 +133,11 @@ def keyword_search_fallback(query: str, top_k: int = 3) -> list[dict[str, Any]]:
         component="vector_store",
     )
 
-    # In production, this would query a simpler backing store
-    # For now, return empty results with degraded indicator
-    return []
+    if index is None:
+        return []
+    return index.search(
+        query, type_filter=type_filter, top_k=top_k, metadata_filter=metadata_filter
+    )
 
 
 def cached_policy_fallback(
@@ -170,23 +188,29 @@ def approximate_results_fallback(
     measure: str,
     dimensions: list[str],
     filters: dict[str, Any],
+    last_known_good: tuple[dict[str, Any], float] | None = None,
 ) -> dict[str, Any]:
     """Fallback for semantic layer when Cube API is unavailable.
 
-    Returns approximate or cached results when the semantic layer is down.
+    Serves the last successful result for the same query when one is
+    stored, marked with when it was computed; otherwise returns no data.
 
     Args:
         measure: Measure being queried
         dimensions: Dimensions for the query
         filters: Query filters
+        last_known_good: (result, stored_at epoch seconds) from LastKnownGoodStore
 
     Returns:
-        Approximate results with degraded indicator
+        Cached or empty results with degraded indicator. Cached results carry
+        as_of (ISO 8601), age_seconds and stale (older than
+        settings.lkg_stale_after_seconds).
     """
     logger.warning(
         "semantic_layer_fallback_used",
         measure=measure,
         dimensions=dimensions,
+        last_known_good=last_known_good is not None,
         message="Semantic layer unavailable, using fallback",
     )
 
@@ -195,10 +219,20 @@ def approximate_results_fallback(
         component="semantic_layer",
     )
 
-    # In production, could return:
-    # - Cached results from last successful query
-    # - Approximate values from data warehouse
-    # - Historical data
+    if last_known_good is not None:
+        result, stored_at = last_known_good
+        age = max(0.0, time.time() - stored_at)
+        as_of = datetime.fromtimestamp(stored_at, tz=UTC).isoformat()
+        return {
+            **result,
+            "degraded": True,
+            "reason": "semantic_layer_unavailable",
+            "message": f"Semantic layer is temporarily unavailable. Showing results as of {as_of}.",
+            "as_of": as_of,
+            "age_seconds": round(age, 1),
+            "stale": age > settings.lkg_stale_after_seconds,
+        }
+
     return {
         "data": [],
         "degraded": True,
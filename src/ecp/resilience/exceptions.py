@@ -8,6 +8,8 @@ Exception Hierarchy:
     ├── StoreError (500) - Store operation failures
     │   ├── StoreConnectionError (503) - Cannot connect to store
     │   ├── StoreTimeoutError (504) - Store operation timed out
+    │   ├── StoreOverloadedError (503) - Store at its concurrency limit, call shed
+    │   ├── CircuitBreakerError (503) - Store's circuit breaker is open
     │   └── StoreQueryError (500) - Query execution failed
     ├── ResolutionError (400) - Resolution failures
     │   ├── ConceptNotFoundError (404) - Concept not found
@@ -98,6 +100,34 @@ class StoreTimeoutError(StoreError):
         )
 
 
+class StoreOverloadedError(StoreError):
+    """Store is at its adaptive concurrency limit; the call was shed."""
+
+    def __init__(self, store_name: str, limit: int, retry_after_seconds: float) -> None:
+        super().__init__(
+            message=f"{store_name} is at its concurrency limit ({limit}); retry later",
+            store_name=store_name,
+            error_code="store_overloaded",
+            details={"limit": limit, "retry_after_seconds": retry_after_seconds},
+            http_status=503,
+        )
+        self.retry_after_seconds = retry_after_seconds
+
+
+class CircuitBreakerError(StoreError):
+    """The store's circuit breaker is open (or out of half-open probes); call not made."""
+
+    def __init__(self, store_name: str, retry_after_seconds: float) -> None:
+        super().__init__(
+            message=f"{store_name} circuit breaker is open",
+            store_name=store_name,
+            error_code="circuit_breaker_open",
+            details={"retry_after_seconds": retry_after_seconds},
+            http_status=503,
+        )
+        self.retry_after_seconds = retry_after_seconds
+
+
 class StoreQueryError(StoreError):
     """Query execution failed."""
 
@@ -0,0 +1,172 @@
+"""Disk-backed last-known-good results for the semantic layer.
+
+Every successful Cube query is written here (off the request path) keyed by
+its canonical form; when Cube is unavailable, approximate_results_fallback
+serves the stored result with an as_of timestamp instead of an empty one.
+
+Storage is a single SQLite file (stdlib, WAL mode), so entries survive
+restarts and several workers on one host can share it. The file is bounded
+by total result size; the least recently written entries are evicted first.
+
+Usage:
+    from ecp.resilience.last_known_good import LastKnownGoodStore
+
+    store = LastKnownGoodStore(".cache/ecp_lkg.sqlite3")
+    store.put_nowait(query, result)          # after a successful query
+    hit = await store.get(query)             # (result, stored_at) or None
+"""
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from ecp.observability import get_logger
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    query TEXT NOT NULL,
+    result TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    stored_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_results_stored_at ON results (stored_at);
+"""
+
+
+def canonical_query(query: dict[str, Any]) -> str:
+    """Order-insensitive JSON form of a Cube query.
+
+    Measures, dimensions, filters and filter values are sorted, so the same
+    question asked with a different member order maps to the same entry.
+    """
+    filters = sorted(
+        (
+            {**f, "values": sorted(map(str, f.get("values") or []))}
+            for f in query.get("filters") or []
+        ),
+        key=lambda f: (f.get("member", ""), f.get("operator", "")),
+    )
+    canonical = {
+        **query,
+        "measures": sorted(query.get("measures") or []),
+        "dimensions": sorted(query.get("dimensions") or []),
+        "filters": filters,
+    }
+    return json.dumps(canonical, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def _encode(value: Any) -> Any:
+    # Columnar results (ecp.domain.columnar) are stored in their compact dict form
+    to_dict = getattr(value, "to_dict", None)
+    return to_dict() if callable(to_dict) else str(value)
+
+
+def query_key(query: dict[str, Any]) -> str:
+    """Stable key for a Cube query (sha256 of its canonical form)."""
+    return hashlib.sha256(canonical_query(query).encode()).hexdigest()
+
+
+class LastKnownGoodStore:
+    """Size-bounded SQLite store of the latest successful result per query.
+
+    SQLite calls run in a worker thread (asyncio.to_thread) behind a lock;
+    writes are fire-and-forget via put_nowait so a slow disk never delays a
+    response.
+    """
+
+    def __init__(self, path: str | Path, max_bytes: int = 64 * 1024 * 1024) -> None:
+        self._path = Path(path)
+        self._max_bytes = max_bytes
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        self._writes: set[asyncio.Task[None]] = set()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self._path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _put(self, query: dict[str, Any], result: dict[str, Any], stored_at: float) -> None:
+        payload = json.dumps(result, separators=(",", ":"), default=_encode)
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO results (key, query, result, size, stored_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (query_key(query), canonical_query(query), payload, len(payload), stored_at),
+            )
+            self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self._max_bytes:
+            return
+        evicted = 0
+        for key, size in conn.execute(
+            "SELECT key, size FROM results ORDER BY stored_at"
+        ).fetchall():
+            if total <= self._max_bytes:
+                break
+            conn.execute("DELETE FROM results WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+        logger.debug("lkg_evicted", entries=evicted, bytes=total)
+
+    def _get(self, query: dict[str, Any]) -> tuple[dict[str, Any], float] | None:
+        with self._lock:
+            row = (
+                self._connect()
+                .execute("SELECT result, stored_at FROM results WHERE key = ?", (query_key(query),))
+                .fetchone()
+            )
+        return (json.loads(row[0]), row[1]) if row else None
+
+    async def put(self, query: dict[str, Any], result: dict[str, Any]) -> None:
+        """Store the latest result for a query, evicting the oldest entries over the size cap."""
+        await asyncio.to_thread(self._put, query, result, time.time())
+
+    def put_nowait(self, query: dict[str, Any], result: dict[str, Any]) -> None:
+        """Schedule put() in the background; failures are logged, never raised."""
+        task = asyncio.get_running_loop().create_task(self._put_logged(query, result))
+        self._writes.add(task)
+        task.add_done_callback(self._writes.discard)
+
+    async def _put_logged(self, query: dict[str, Any], result: dict[str, Any]) -> None:
+        try:
+            await self.put(query, result)
+        except Exception as e:
+            logger.warning("lkg_write_failed", error=str(e), error_type=type(e).__name__)
+
+    async def get(self, query: dict[str, Any]) -> tuple[dict[str, Any], float] | None:
+        """Return (result, stored_at epoch seconds) for a query, or None.
+
+        Read errors are logged and treated as a miss; this runs on the
+        failure path and must not raise.
+        """
+        try:
+            return await asyncio.to_thread(self._get, query)
+        except Exception as e:
+            logger.warning("lkg_read_failed", error=str(e), error_type=type(e).__name__)
+            return None
+
+    async def close(self) -> None:
+        """Wait for pending writes, then close the database."""
+        if self._writes:
+            await asyncio.gather(*self._writes, return_exceptions=True)
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -4,8 +4,10 @@ This module provides retry decorators and utilities for handling transient
 failures in store operations and external API calls.
 
 Key Features:
-- Exponential backoff with jitter
-- Configurable max retries and timeouts
+- Exponential backoff with jitter, starting at tens of milliseconds
+- A per-store retry budget: retries are limited to a fraction of successful
+  calls, so an outage does not multiply load on the failing store
+- Deadline awareness: no retry is scheduled past the request deadline
 - Automatic classification of retryable vs non-retryable errors
 - Metrics and logging integration
 
@@ -19,18 +21,13 @@ Usage:
 """
 
 import asyncio
+import random
 from functools import wraps
 from typing import Any, Callable, TypeVar
 
-from tenacity import (
-    RetryError,
-    retry,
-    retry_if_exception,
-    stop_after_attempt,
-    wait_exponential_jitter,
-)
-
+from ecp.config import settings
 from ecp.observability import get_logger, metrics
+from ecp.resilience import deadline
 
 logger = get_logger(__name__)
 
@@ -96,11 +93,17 @@ def is_retryable(exception: BaseException) -> bool:
     try:
         from ecp.resilience.exceptions import (
             AuthorizationError,
+            CircuitBreakerError,
             StoreConnectionError,
+            StoreOverloadedError,
             StoreTimeoutError,
             ValidationError,
         )
 
+        # Shed locally (concurrency limit, open breaker): retrying would add to the overload
+        if isinstance(exception, (StoreOverloadedError, CircuitBreakerError)):
+            return False
+
         # Store connection and timeout errors are retryable
         if isinstance(exception, (StoreConnectionError, StoreTimeoutError)):
             return True
@@ -141,7 +144,7 @@ def is_retryable(exception: BaseException) -> bool:
 
 
 def retry_on_transient_error(exception: BaseException) -> bool:
-    """Tenacity predicate for retrying on transient errors.
+    """Predicate for retrying on transient errors.
 
     Args:
         exception: The exception that occurred
@@ -167,19 +170,70 @@ def retry_on_transient_error(exception: BaseException) -> bool:
     return should_retry
 
 
+class RetryBudget:
+    """Token bucket that limits retries to a fraction of successful calls.
+
+    Each success deposits `ratio` tokens and each retry withdraws one, up to
+    `max_tokens`. The bucket starts full, so an idle process can still retry
+    a blip; during an outage (no successes) it drains after `max_tokens`
+    retries and further failures are returned without retrying.
+    """
+
+    def __init__(self, ratio: float | None = None, max_tokens: float | None = None) -> None:
+        self.ratio = settings.retry_budget_ratio if ratio is None else ratio
+        self.max_tokens = settings.retry_budget_max_tokens if max_tokens is None else max_tokens
+        self._tokens = self.max_tokens
+
+    @property
+    def tokens(self) -> float:
+        return self._tokens
+
+    def deposit(self) -> None:
+        """Credit a successful call."""
+        self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        """Take one token for a retry; False if the budget is spent."""
+        if self._tokens < 1.0:
+            return False
+        self._tokens -= 1.0
+        return True
+
+
+_budgets: dict[str, RetryBudget] = {}
+
+
+def retry_budget(store: str) -> RetryBudget:
+    """The shared retry budget for a store (created on first use)."""
+    budget = _budgets.get(store)
+    if budget is None:
+        budget = _budgets[store] = RetryBudget()
+    return budget
+
+
+def backoff_delay(attempt: int, min_wait: float, max_wait: float) -> float:
+    """Delay before retry number `attempt` (1-based): exponential, equal jitter."""
+    ceiling = min(max_wait, min_wait * 2 ** (attempt - 1))
+    return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+
 def with_retry(
     max_attempts: int = 3,
-    min_wait: float = 1.0,
-    max_wait: float = 10.0,
+    min_wait: float = 0.05,
+    max_wait: float = 1.0,
     store_name: str | None = None,
 ) -> Callable[[F], F]:
     """Decorator to add retry logic to async functions.
 
+    A retry happens only if the error is retryable, attempts remain, the
+    store's retry budget has a token, and the backoff ends before the
+    request deadline. Otherwise the error is raised immediately.
+
     Args:
-        max_attempts: Maximum number of retry attempts (default: 3)
-        min_wait: Minimum wait time between retries in seconds (default: 1.0)
-        max_wait: Maximum wait time between retries in seconds (default: 10.0)
-        store_name: Optional store name for metrics tracking
+        max_attempts: Maximum number of attempts, including the first (default: 3)
+        min_wait: Backoff ceiling before the first retry in seconds (default: 0.05)
+        max_wait: Maximum backoff ceiling in seconds (default: 1.0)
+        store_name: Store name for the retry budget and metrics; None means no budget
 
     Returns:
         Decorated function with retry logic
@@ -191,108 +245,81 @@ def with_retry(
     """
 
     def decorator(func: F) -> F:
-        # Create retry decorator
-        retry_decorator = retry(
-            retry=retry_if_exception(retry_on_transient_error),
-            stop=stop_after_attempt(max_attempts),
-            wait=wait_exponential_jitter(
-                initial=min_wait,
-                max=max_wait,
-                jitter=min_wait * 0.5,  # Add jitter to avoid thundering herd
-            ),
-            reraise=True,
-        )
+        if not asyncio.iscoroutinefunction(func):
+
+            @wraps(func)
+            def sync_wrapper(*args: Any, **kwargs: Any) -> Any:
+                # For sync functions, just call directly (no retry for sync)
+                # In production, all I/O should be async
+                logger.warning(
+                    "sync_function_no_retry",
+                    function=func.__name__,
+                    message="Retry logic only supports async functions",
+                )
+                return func(*args, **kwargs)
+
+            return sync_wrapper  # type: ignore
 
         @wraps(func)
         async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
-            attempt = 0
-            last_exception = None
-
-            # Apply tenacity retry
-            try:
-                @retry_decorator
-                async def _execute() -> Any:
-                    nonlocal attempt, last_exception
-                    attempt += 1
-
-                    try:
-                        logger.debug(
-                            "retry_attempt",
+            budget = retry_budget(store_name) if store_name else None
+            attempt = 1
+            while True:
+                try:
+                    result = await func(*args, **kwargs)
+                except Exception as e:
+                    if attempt >= max_attempts or not is_retryable(e):
+                        logger.error(
+                            "retry_exhausted" if attempt >= max_attempts else "non_retryable_error",
                             function=func.__name__,
                             attempt=attempt,
                             max_attempts=max_attempts,
+                            error=str(e),
+                            error_type=type(e).__name__,
                             store=store_name,
                         )
-
-                        result = await func(*args, **kwargs)
-                        return result
-
-                    except Exception as e:
-                        last_exception = e
-
-                        if attempt < max_attempts and is_retryable(e):
-                            logger.warning(
-                                "retry_attempt_failed",
-                                function=func.__name__,
-                                attempt=attempt,
-                                max_attempts=max_attempts,
-                                error=str(e),
-                                error_type=type(e).__name__,
-                                will_retry=True,
-                                store=store_name,
-                            )
-
-                            # Record retry metric
-                            if store_name:
-                                metrics.record_store_query(
-                                    store=store_name,
-                                    duration=0.0,
-                                    error=f"retry_{type(e).__name__}",
-                                )
-                        else:
-                            logger.error(
-                                "retry_exhausted" if attempt >= max_attempts else "non_retryable_error",
-                                function=func.__name__,
-                                attempt=attempt,
-                                max_attempts=max_attempts,
-                                error=str(e),
-                                error_type=type(e).__name__,
-                                store=store_name,
-                            )
-
                         raise
+                    delay = backoff_delay(attempt, min_wait, max_wait)
+                    left = deadline.remaining()
+                    if left is not None and left <= delay:
+                        outcome = "deadline"
+                    elif budget is not None and not budget.withdraw():
+                        outcome = "budget_exhausted"
+                    else:
+                        outcome = "retried"
+                    if store_name:
+                        metrics.record_retry(
+                            store_name, outcome, budget.tokens if budget else None
+                        )
+                    if outcome != "retried":
+                        logger.warning(
+                            "retry_skipped",
+                            function=func.__name__,
+                            attempt=attempt,
+                            reason=outcome,
+                            error=str(e),
+                            error_type=type(e).__name__,
+                            store=store_name,
+                        )
+                        raise
+                    logger.warning(
+                        "retry_attempt_failed",
+                        function=func.__name__,
+                        attempt=attempt,
+                        max_attempts=max_attempts,
+                        error=str(e),
+                        error_type=type(e).__name__,
+                        will_retry=True,
+                        delay=delay,
+                        store=store_name,
+                    )
+                    await asyncio.sleep(delay)
+                    attempt += 1
+                else:
+                    if budget is not None:
+                        budget.deposit()
+                    return result
 
-                return await _execute()
-
-            except RetryError as e:
-                # Tenacity exhausted retries, raise original exception
-                logger.error(
-                    "all_retries_failed",
-                    function=func.__name__,
-                    attempts=attempt,
-                    last_error=str(last_exception),
-                    store=store_name,
-                )
-
-                if last_exception:
-                    raise last_exception from e
-                raise
-
-        @wraps(func)
-        def sync_wrapper(*args: Any, **kwargs: Any) -> Any:
-            # For sync functions, just call directly (no retry for sync)
-            # In production, all I/O should be async
-            logger.warning(
-                "sync_function_no_retry",
-                function=func.__name__,
-                message="Retry logic only supports async functions",
-            )
-            return func(*args, **kwargs)
-
-        # Return appropriate wrapper based on function type
-        if asyncio.iscoroutinefunction(func):
-            return async_wrapper  # type: ignore
-        else:
-            return sync_wrapper  # type: ignore
+        return async_wrapper  # type: ignore
 
     return decorator
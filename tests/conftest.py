@@ -19,6 +19,13 @@ from ecp.adapters.semantic import CubeClient
 from ecp.adapters.vector import PgVectorStore
 from ecp.domain.models import ResolveRequest, UserContext
 from ecp.orchestrator import ResolutionOrchestrator
+from ecp.resilience.circuit_breaker import CircuitBreakerManager
+
+
+@pytest.fixture(autouse=True)
+def circuit_breakers(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Fresh circuit breakers per test, so failures in one test cannot trip another."""
+    monkeypatch.setattr(CircuitBreakerManager, "_breakers", {})
 
 
 @pytest.fixture
@@ -41,6 +48,7 @@ def mock_vector() -> VectorStore:
     m.search.return_value = [
         {"id": "vec_g_001", "type": "glossary_term", "metadata": {"term": "net_revenue"}, "score": 0.9},
     ]
+    m.search_hybrid.return_value = [{**hit, "score": 0.03} for hit in m.search.return_value]
     m.health.return_value = True
     return m
 
@@ -52,6 +60,7 @@ def mock_registry() -> AssetRegistry:
         "id": "ar_cal_001",
         "content": {"calendar_type": "fiscal", "quarters": {"Q3": [10, 11, 12]}},
     }
+    m.get_assets.return_value = {"ar_cal_001": m.get_asset.return_value}
     m.get_assets_by_type.return_value = []
     m.search_glossary.return_value = [{"id": "ar_g_003", "content": {"canonical_name": "net_revenue"}}]
     m.health.return_value = True
@@ -70,6 +79,7 @@ def mock_semantic() -> SemanticLayerClient:
 def mock_policy() -> PolicyEngine:
     m = AsyncMock(spec=PolicyEngine)
     m.evaluate.return_value = {"allow": True}
+    m.row_filters.return_value = {}
     m.health.return_value = True
     return m
 
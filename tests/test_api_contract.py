@@ -20,10 +20,12 @@ def mock_stores():
 
     vector = AsyncMock(spec=VectorStore)
     vector.search.return_value = [{"id": "vec_g_001", "type": "glossary_term", "metadata": {"term": "net_revenue"}}]
+    vector.search_hybrid.return_value = vector.search.return_value
     vector.health.return_value = True
 
     registry = AsyncMock(spec=AssetRegistry)
     registry.get_asset.return_value = {"id": "ar_cal_001", "content": {"calendar_type": "fiscal"}}
+    registry.get_assets.return_value = {"ar_cal_001": registry.get_asset.return_value}
     registry.search_glossary.return_value = [{"id": "ar_g_001", "content": {"canonical_name": "revenue"}, "metadata": {}}]
     registry.health.return_value = True
 
@@ -33,6 +35,7 @@ def mock_stores():
 
     policy = AsyncMock(spec=PolicyEngine)
     policy.evaluate.return_value = {"allow": True}
+    policy.row_filters.return_value = {}
     policy.health.return_value = True
 
     return {"graph": graph, "vector": vector, "registry": registry, "semantic": semantic, "policy": policy}
@@ -87,6 +90,92 @@ def test_execute_contract(client: TestClient) -> None:
     assert "confidence_score" in data
 
 
+def test_execute_status_reflects_warning_type(
+    client: TestClient, mock_stores: dict[str, AsyncMock]
+) -> None:
+    from ecp.observability import metrics
+
+    def executed(status: str) -> float:
+        return metrics.execute_requests_total.labels(status=status)._value.get()
+
+    mock_stores["policy"].row_filters.return_value = {"region": ["JP"]}
+    resolution_id = client.post("/api/v1/resolve", json={"concept": "APAC revenue"}).json()[
+        "resolution_id"
+    ]
+    before = executed("access_denied"), executed("not_found")
+    r = client.post(
+        "/api/v1/execute",
+        json={"resolution_id": resolution_id, "parameters": {"Revenue.region": "US"}},
+    )
+    assert r.json()["warnings"][0]["type"] == "access_denied"
+    client.post("/api/v1/execute", json={"resolution_id": "unknown"})
+    assert (executed("access_denied"), executed("not_found")) == (before[0] + 1, before[1] + 1)
+
+
+def test_execute_content_negotiation(client: TestClient) -> None:
+    resolution = client.post("/api/v1/resolve", json={"concept": "APAC revenue"}).json()
+    resolution_id = resolution["resolution_id"]
+    body = {"resolution_id": resolution_id}
+
+    rows = client.post("/api/v1/execute", json=body).json()
+    assert rows["results"]["actual_revenue"]["data"] == [{"Revenue.netRevenue": 142300000}]
+
+    r = client.post(
+        "/api/v1/execute",
+        json=body,
+        headers={"Accept": "application/json;q=0.5, application/vnd.ecp.columnar+json"},
+    )
+    assert r.headers["content-type"].startswith("application/vnd.ecp.columnar+json")
+    assert r.json()["results"]["actual_revenue"]["data"] == {
+        "columns": ["Revenue.netRevenue"],
+        "values": [[142300000]],
+        "num_rows": 1,
+    }
+
+    r = client.post("/api/v1/execute", json=body, headers={"Accept": "text/csv"})
+    assert r.status_code == 406
+
+
+def test_execute_arrow_stream(client: TestClient) -> None:
+    pa = pytest.importorskip("pyarrow")
+    resolution = client.post("/api/v1/resolve", json={"concept": "APAC revenue"}).json()
+    resolution_id = resolution["resolution_id"]
+    r = client.post(
+        "/api/v1/execute",
+        json={"resolution_id": resolution_id},
+        headers={"Accept": "application/vnd.apache.arrow.stream"},
+    )
+    assert r.status_code == 200
+    table = pa.ipc.open_stream(r.content).read_all()
+    assert table.column("Revenue.netRevenue").to_pylist() == [142300000]
+    assert b"actual_revenue" in table.schema.metadata[b"ecp"]
+
+
+def test_pre_aggregation_report_contract(client: TestClient) -> None:
+    from ecp.observability.workload import WorkloadRecorder
+
+    workload = WorkloadRecorder()
+    client.app.state.orchestrator._workload = workload
+    for _ in range(3):
+        resolution = client.post("/api/v1/resolve", json={"concept": "APAC revenue"}).json()
+        client.post("/api/v1/execute", json={"resolution_id": resolution["resolution_id"]})
+    # Mocked Cube answers instantly; give the shape a realistic latency
+    workload.shapes()[0].total_seconds = 6.0
+    r = client.get("/api/v1/workload/pre-aggregations")
+    assert r.status_code == 200
+    data = r.json()
+    assert data["queries_recorded"] == 3
+    assert data["shapes_tracked"] == 1
+    assert data["rollups"][0]["cube"] == "Revenue"
+    assert data["rollups"][0]["queries_served"] == 3
+    assert "preAggregations" in data["cube_js"]["Revenue"]
+
+    r = client.get("/api/v1/workload/pre-aggregations", params={"format": "js"})
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain")
+    assert "measures: [CUBE.netRevenue]" in r.text
+
+
 def test_glossary_contract(client: TestClient) -> None:
     r = client.get("/api/v1/glossary", params={"query": "revenue"})
     assert r.status_code == 200
@@ -96,6 +185,38 @@ def test_glossary_contract(client: TestClient) -> None:
     assert isinstance(data["terms"], list)
 
 
+def test_assets_pagination_contract(client: TestClient, mock_stores) -> None:
+    assets = [
+        {"id": f"ar_g_{i:03d}", "type": "glossary_term", "content": {}, "metadata": {}}
+        for i in range(5)
+    ]
+
+    async def get_assets_page(asset_type, after_id=None, limit=100):
+        return [a for a in assets if after_id is None or a["id"] > after_id][:limit]
+
+    mock_stores["registry"].get_assets_page.side_effect = get_assets_page
+
+    seen, cursor = [], None
+    while True:
+        params = {"type": "glossary_term", "limit": 2, **({"cursor": cursor} if cursor else {})}
+        r = client.get("/api/v1/assets", params=params)
+        assert r.status_code == 200
+        data = r.json()
+        assert data["count"] == len(data["assets"]) <= 2
+        seen += [a["id"] for a in data["assets"]]
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == [a["id"] for a in assets]
+
+    first = client.get("/api/v1/assets", params={"type": "glossary_term", "limit": 2}).json()
+    # A cursor is bound to the asset type it was issued for
+    params = {"type": "tribal_knowledge", "cursor": first["next_cursor"]}
+    assert client.get("/api/v1/assets", params=params).status_code == 400
+    params = {"type": "glossary_term", "cursor": "%%%"}
+    assert client.get("/api/v1/assets", params=params).status_code == 400
+
+
 def test_lineage_contract(client: TestClient) -> None:
     r = client.get("/api/v1/lineage", params={"target": "net_revenue"})
     assert r.status_code == 200
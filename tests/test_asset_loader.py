@@ -0,0 +1,51 @@
+"""Tests for the request-scoped asset loader."""
+
+import asyncio
+from typing import Any
+from unittest.mock import AsyncMock
+
+import pytest
+
+from ecp.adapters.base import AssetRegistry
+from ecp.adapters.loader import AssetLoader
+
+
+def _registry() -> AssetRegistry:
+    registry = AsyncMock(spec=AssetRegistry)
+
+    async def get_assets(asset_ids: list[str]) -> dict[str, dict[str, Any]]:
+        return {i: {"id": i, "type": "glossary_term"} for i in asset_ids if i != "ar_missing"}
+
+    registry.get_assets.side_effect = get_assets
+    return registry
+
+
+async def test_loads_in_same_tick_are_batched_and_deduped() -> None:
+    registry = _registry()
+    loader = AssetLoader(registry)
+
+    first, second, again, missing = await asyncio.gather(
+        loader.load("ar_g_001"),
+        loader.load("ar_g_002"),
+        loader.load("ar_g_001"),
+        loader.load("ar_missing"),
+    )
+
+    assert first == again == {"id": "ar_g_001", "type": "glossary_term"}
+    assert second["id"] == "ar_g_002"
+    assert missing is None
+    registry.get_assets.assert_awaited_once_with(["ar_g_001", "ar_g_002", "ar_missing"])
+
+    # Cached for the loader's lifetime
+    assert await loader.load_many(["ar_g_002", "ar_missing"]) == {"ar_g_002": second}
+    assert registry.get_assets.await_count == 1
+
+
+async def test_failed_batch_is_not_cached() -> None:
+    registry = _registry()
+    registry.get_assets.side_effect = [ConnectionError("down"), {"ar_g_001": {"id": "ar_g_001"}}]
+    loader = AssetLoader(registry)
+
+    with pytest.raises(ConnectionError):
+        await loader.load("ar_g_001")
+    assert await loader.load("ar_g_001") == {"id": "ar_g_001"}
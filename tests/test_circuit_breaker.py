@@ -0,0 +1,142 @@
+"""Tests for the sliding-window circuit breaker."""
+
+import asyncio
+from typing import Any
+
+import httpx
+import pytest
+from pydantic import ValidationError
+
+from ecp.adapters.policy import OPAEngine
+from ecp.config import Settings, settings
+from ecp.observability import metrics
+from ecp.resilience.circuit_breaker import (
+    BreakerConfig,
+    CircuitBreaker,
+    CircuitBreakerManager,
+    CircuitState,
+    with_circuit_breaker,
+)
+from ecp.resilience.exceptions import CircuitBreakerError, StoreConnectionError
+
+
+def _breaker(**overrides: Any) -> CircuitBreaker:
+    config = {
+        "window_seconds": 30.0,
+        "min_calls": 4,
+        "failure_rate_threshold": 0.5,
+        "slow_call_seconds": 1.0,
+        "slow_call_rate_threshold": 0.8,
+        "open_seconds": 0.05,
+        "half_open_probes": 2,
+    }
+    return CircuitBreaker("test_store", BreakerConfig(**{**config, **overrides}))
+
+
+def _trip(breaker: CircuitBreaker) -> None:
+    for _ in range(breaker.config.min_calls):
+        breaker.on_result(breaker.before_call(), 0.01, failed=True)
+
+
+def test_trips_on_failure_rate_not_consecutive_failures() -> None:
+    breaker = _breaker()
+    # Alternating failures: never two in a row, but a 50% failure rate
+    for failed in (True, False, True):
+        breaker.on_result(breaker.before_call(), 0.01, failed=failed)
+    assert breaker.state == CircuitState.CLOSED  # below min_calls
+    breaker.on_result(breaker.before_call(), 0.01, failed=False)
+    assert breaker.state == CircuitState.OPEN
+    with pytest.raises(CircuitBreakerError) as exc:
+        breaker.before_call()
+    assert exc.value.http_status == 503
+    assert metrics.circuit_breaker_state.labels(store="test_store")._value.get() == 2
+
+
+def test_trips_on_slow_call_rate() -> None:
+    breaker = _breaker()
+    for _ in range(4):
+        breaker.on_result(breaker.before_call(), 2.0, failed=False)
+    assert breaker.state == CircuitState.OPEN
+
+
+def test_low_failure_rate_stays_closed() -> None:
+    breaker = _breaker()
+    for i in range(100):
+        breaker.on_result(breaker.before_call(), 0.01, failed=i % 4 == 0)
+    assert breaker.state == CircuitState.CLOSED
+
+
+async def test_half_open_admits_bounded_probes_then_closes() -> None:
+    breaker = _breaker()
+    _trip(breaker)
+    await asyncio.sleep(0.06)
+    assert breaker.state == CircuitState.HALF_OPEN
+    probes = [breaker.before_call(), breaker.before_call()]
+    assert probes == [True, True]
+    with pytest.raises(CircuitBreakerError):
+        breaker.before_call()
+    for probe in probes:
+        breaker.on_result(probe, 0.01, failed=False)
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.before_call() is False
+
+
+async def test_failed_probe_reopens() -> None:
+    breaker = _breaker()
+    _trip(breaker)
+    await asyncio.sleep(0.06)
+    breaker.on_result(breaker.before_call(), 0.01, failed=True)
+    assert breaker.state == CircuitState.OPEN
+
+
+async def test_context_manager_ignores_client_errors() -> None:
+    name = "test_client_errors"
+    for _ in range(10):
+        with pytest.raises(ValueError):
+            async with with_circuit_breaker(name, min_calls=2):
+                raise ValueError("bad request")
+    assert CircuitBreakerManager.get_breaker(name).state == CircuitState.CLOSED
+
+    for _ in range(2):
+        with pytest.raises(StoreConnectionError):
+            async with with_circuit_breaker(name):
+                raise StoreConnectionError(name, "connection refused")
+    assert CircuitBreakerManager.get_breaker(name).state == CircuitState.OPEN
+    with pytest.raises(CircuitBreakerError):
+        async with with_circuit_breaker(name):
+            pass
+
+
+def test_per_store_settings(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "circuit_breaker_stores", {"cube_api": {"open_seconds": 30}})
+    assert BreakerConfig.for_store("cube_api").open_seconds == 30
+    assert BreakerConfig.for_store("opa").open_seconds == settings.circuit_open_seconds
+    with pytest.raises(ValueError):
+        BreakerConfig.for_store("opa", recovery_timeout=60)
+
+
+def test_unknown_per_store_setting_fails_at_startup(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("CIRCUIT_BREAKER_STORES", '{"opa": {"open_seconds": 5}}')
+    assert Settings().circuit_breaker_stores == {"opa": {"open_seconds": 5}}
+    monkeypatch.setenv("CIRCUIT_BREAKER_STORES", '{"opa": {"recovery_timeout": 60}}')
+    with pytest.raises(ValidationError, match="recovery_timeout"):
+        Settings()
+
+
+async def test_opa_fails_secure_without_calling_opa_while_open(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(CircuitBreakerManager, "_breakers", {})
+    monkeypatch.setattr(settings, "circuit_breaker_stores", {"opa": {"min_calls": 2}})
+    calls = [0]
+
+    def down(request: httpx.Request) -> httpx.Response:
+        calls[0] += 1
+        raise httpx.ConnectError("connection refused")
+
+    engine = OPAEngine(base_url="http://opa/v1", transport=httpx.MockTransport(down))
+    for _ in range(4):
+        decision = await engine.evaluate({"role": "analyst"}, "query", {"certification_tier": 1})
+        assert decision["degraded"] and not decision["allowed"]
+    assert CircuitBreakerManager.get_breaker("opa").state == CircuitState.OPEN
+    assert calls[0] == 2 * 3  # two calls with three attempts each, then short-circuited
@@ -0,0 +1,26 @@
+"""Tests for the columnar result representation."""
+
+from ecp.domain.columnar import ColumnarResult
+
+
+def test_rows_round_trip_with_ragged_keys() -> None:
+    rows = [{"region": "JP", "revenue": 1}, {"revenue": 2, "region": "KR", "note": "x"}]
+    result = ColumnarResult.from_rows(rows)
+    assert result.columns == ["region", "revenue", "note"]
+    assert result.values == [["JP", "KR"], [1, 2], [None, "x"]]
+    assert len(result) == 2
+    assert result.to_rows() == [
+        {"region": "JP", "revenue": 1, "note": None},
+        {"region": "KR", "revenue": 2, "note": "x"},
+    ]
+
+
+def test_tuples_and_coerce() -> None:
+    empty = ColumnarResult.from_tuples(["a", "b"], [])
+    assert empty.to_dict() == {"columns": ["a", "b"], "values": [[], []], "num_rows": 0}
+
+    result = ColumnarResult.from_tuples(["a", "b"], [(1, "x"), (2, "y")])
+    assert result.values == [[1, 2], ["x", "y"]]
+    assert ColumnarResult.coerce(result.to_dict()) == result
+    assert ColumnarResult.coerce(result) is result
+    assert ColumnarResult.coerce([]).to_rows() == []
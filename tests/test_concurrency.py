@@ -0,0 +1,204 @@
+"""Tests for adaptive per-store concurrency limits."""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from api.main import app
+from ecp.adapters.base import (
+    AssetRegistry,
+    GraphStore,
+    PolicyEngine,
+    SemanticLayerClient,
+    VectorStore,
+)
+from ecp.adapters.semantic import CubeClient
+from ecp.adapters.vector import PgVectorStore
+from ecp.domain.models import ResolveRequest
+from ecp.index.embedding import HashingEmbedder
+from ecp.observability import metrics
+from ecp.orchestrator import ResolutionOrchestrator
+from ecp.resilience import DegradationMode
+from ecp.resilience.concurrency import AdaptiveLimiter, with_concurrency_limit
+from ecp.resilience.deadline import deadline_scope
+from ecp.resilience.exceptions import StoreConnectionError, StoreOverloadedError
+from ecp.resilience.retry import with_retry
+
+
+def _limiter(**kwargs: float) -> AdaptiveLimiter:
+    options = {
+        "initial_limit": 10,
+        "min_limit": 1,
+        "max_limit": 100,
+        "max_queue": 2,
+        "queue_timeout": 0.05,
+    }
+    return AdaptiveLimiter("test_store", latency_target=0.1, **{**options, **kwargs})
+
+
+async def test_fast_calls_grow_the_limit_only_when_it_is_used() -> None:
+    limiter = _limiter()
+    await limiter.acquire()
+    limiter.release(time.monotonic(), 0.01)
+    assert limiter._limit == 10.0  # one call in flight out of ten: app-limited
+
+    for _ in range(10):
+        await limiter.acquire()
+    for _ in range(10):
+        limiter.release(time.monotonic(), 0.01)
+    assert limiter.limit == 10 and limiter._limit > 10.4
+
+
+async def test_slow_calls_and_errors_shrink_the_limit_once_per_burst() -> None:
+    limiter = _limiter()
+    started = time.monotonic()
+    for _ in range(3):
+        await limiter.acquire()
+    limiter.release(started, 0.5)
+    assert limiter._limit == 9.0
+    # Calls started before the decrease do not cut again
+    limiter.release(started, 0.5)
+    limiter.release(started, None, dropped=True)
+    assert limiter._limit == 9.0
+    await limiter.acquire()
+    limiter.release(time.monotonic(), None, dropped=True)
+    assert limiter._limit == pytest.approx(8.1)
+
+
+async def test_calls_over_the_limit_queue_then_shed() -> None:
+    limiter = _limiter(initial_limit=1)
+    await limiter.acquire()
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    assert limiter.queued == 1
+    limiter.release(time.monotonic(), None)
+    await waiter
+    assert limiter.in_flight == 1 and limiter.queued == 0
+
+    shed = metrics.store_shed_total.labels(store="test_store")._value.get()
+    with pytest.raises(StoreOverloadedError) as exc:
+        await limiter.acquire()
+    assert exc.value.http_status == 503
+    assert limiter.queued == 0
+    assert metrics.store_shed_total.labels(store="test_store")._value.get() == shed + 1
+    assert metrics.store_concurrency.labels(store="test_store", state="limit")._value.get() == 1
+
+
+async def test_full_queue_and_spent_deadline_shed_at_once() -> None:
+    limiter = _limiter(initial_limit=1, max_queue=0, queue_timeout=10.0)
+    await limiter.acquire()
+    with pytest.raises(StoreOverloadedError):
+        await limiter.acquire()
+
+    limiter = _limiter(initial_limit=1, queue_timeout=10.0)
+    await limiter.acquire()
+    start = time.monotonic()
+    with deadline_scope(0.01), pytest.raises(StoreOverloadedError):
+        await limiter.acquire()
+    assert time.monotonic() - start < 1.0
+
+
+async def test_shed_calls_are_not_retried() -> None:
+    calls = [0]
+    gate = asyncio.Event()
+
+    @with_retry(store_name="test_shed")
+    @with_concurrency_limit("test_shed", latency_target=1.0)
+    async def call() -> None:
+        calls[0] += 1
+        await gate.wait()
+
+    with patch(
+        "ecp.resilience.concurrency._limiters",
+        {"test_shed": _limiter(initial_limit=1, max_queue=0)},
+    ):
+        first = asyncio.create_task(call())
+        await asyncio.sleep(0)
+        with pytest.raises(StoreOverloadedError):
+            await call()
+        gate.set()
+        await first
+    assert calls[0] == 1
+
+
+async def test_transient_errors_count_as_drops() -> None:
+    limiter = _limiter()
+
+    @with_concurrency_limit("test_drop", latency_target=1.0)
+    async def call() -> None:
+        raise StoreConnectionError("test_drop", "connection refused")
+
+    with patch("ecp.resilience.concurrency._limiters", {"test_drop": limiter}):
+        with pytest.raises(StoreConnectionError):
+            await call()
+    assert limiter._limit == 9.0 and limiter.in_flight == 0
+
+
+def test_api_returns_503_with_retry_after(
+    mock_graph: GraphStore,
+    mock_vector: VectorStore,
+    mock_registry: AssetRegistry,
+    mock_semantic: SemanticLayerClient,
+    mock_policy: PolicyEngine,
+) -> None:
+    mock_graph.get_metric_by_id.side_effect = StoreOverloadedError("neo4j", 4, 1.0)
+    orch = ResolutionOrchestrator(
+        graph=mock_graph,
+        vector=mock_vector,
+        registry=mock_registry,
+        semantic=mock_semantic,
+        policy=mock_policy,
+    )
+    with patch("api.main._create_orchestrator", return_value=orch), TestClient(app) as client:
+        r = client.post("/api/v1/resolve", json={"concept": "APAC revenue last quarter"})
+    assert r.status_code == 503
+    assert r.headers["Retry-After"] == "1"
+    assert r.json()["errors"]["store"] == "neo4j"
+
+
+async def test_cube_shed_is_not_served_from_fallback() -> None:
+    DegradationMode.reset()
+    gate = asyncio.Event()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await gate.wait()
+        return httpx.Response(200, json={"data": []})
+
+    cube = CubeClient("http://cube/cubejs-api/v1", transport=httpx.MockTransport(handler))
+    with patch(
+        "ecp.resilience.concurrency._limiters",
+        {"cube_api": _limiter(initial_limit=1, max_queue=0)},
+    ):
+        first = asyncio.create_task(cube.execute_query("Revenue.netRevenue", [], {}))
+        await asyncio.sleep(0.01)
+        with pytest.raises(StoreOverloadedError):
+            await cube.execute_query("Revenue.netRevenue", [], {})
+        gate.set()
+        await first
+    assert not DegradationMode.is_degraded("cube_api")
+
+
+async def test_vector_shed_is_not_served_from_keyword_index() -> None:
+    DegradationMode.reset()
+    store = PgVectorStore("postgresql://unused", embedder=HashingEmbedder(dimensions=8))
+    store._get_pool = AsyncMock(side_effect=StoreOverloadedError("pgvector", 4, 1.0))  # type: ignore[method-assign]
+
+    with pytest.raises(StoreOverloadedError):
+        await store.search("net revenue", top_k=3)
+    assert not DegradationMode.is_degraded("pgvector")
+
+
+async def test_execute_propagates_a_semantic_shed(
+    orchestrator: ResolutionOrchestrator,
+    mock_semantic: AsyncMock,
+    resolve_request: ResolveRequest,
+) -> None:
+    resolved = await orchestrator.resolve(resolve_request)
+    mock_semantic.execute_query.side_effect = StoreOverloadedError("cube_api", 4, 1.0)
+
+    with pytest.raises(StoreOverloadedError):
+        await orchestrator.execute(resolved.resolution_id, {})
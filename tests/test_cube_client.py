@@ -0,0 +1,141 @@
+"""Tests for the pooled Cube HTTP client and "Continue wait" polling."""
+
+import httpx
+import pytest
+
+from ecp.adapters.semantic import CubeClient
+from ecp.config import settings
+from ecp.observability import metrics
+from ecp.resilience import DegradationMode, deadline
+from ecp.resilience.deadline import deadline_scope
+
+
+async def test_queries_share_one_pooled_client() -> None:
+    seen: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        if request.url.path.endswith("/readyz"):
+            return httpx.Response(200)
+        return httpx.Response(200, json={"data": [{"Revenue.netRevenue": 1}]})
+
+    cube = CubeClient(
+        "http://cube/cubejs-api/v1", token="t0k", transport=httpx.MockTransport(handler)
+    )
+    await cube.start()
+    client = cube._client
+    assert client is not None
+    assert client.timeout == httpx.Timeout(
+        connect=settings.cube_connect_timeout_seconds,
+        read=settings.cube_read_timeout_seconds,
+        write=settings.cube_read_timeout_seconds,
+        pool=settings.cube_pool_timeout_seconds,
+    )
+
+    for _ in range(3):
+        result = await cube._execute_query_with_retry({"measures": ["Revenue.netRevenue"]})
+        assert result["data"] == [{"Revenue.netRevenue": 1}]
+    assert await cube.health() is True
+
+    assert cube._client is client
+    assert [r.url.path for r in seen] == ["/cubejs-api/v1/load"] * 3 + ["/cubejs-api/readyz"]
+    assert all(r.headers["Authorization"] == "t0k" for r in seen)
+    assert seen[-1].extensions["timeout"]["read"] == 5.0
+    in_flight = metrics.http_pool_connections.labels(client="cube_api", state="in_flight")
+    assert in_flight._value.get() == 0
+
+    await cube.close()
+    assert client.is_closed
+    assert cube._client is None
+
+
+@pytest.fixture
+def fast_polling(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "cube_poll_initial_interval_seconds", 0.001)
+    monkeypatch.setattr(settings, "cube_poll_max_interval_seconds", 0.005)
+
+
+def _slow_cube(ready_after: int) -> tuple[CubeClient, list[int]]:
+    polls = [0]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        polls[0] += 1
+        if polls[0] <= ready_after:
+            return httpx.Response(200, json={"error": "Continue wait"})
+        return httpx.Response(200, json={"data": [{"Revenue.netRevenue": 7}]})
+
+    return CubeClient("http://cube/cubejs-api/v1", transport=httpx.MockTransport(handler)), polls
+
+
+async def test_continue_wait_is_polled_until_ready(fast_polling: None) -> None:
+    cube, polls = _slow_cube(ready_after=3)
+    result = await cube.execute_query("Revenue.netRevenue", [], {})
+    assert result["data"].to_rows() == [{"Revenue.netRevenue": 7}]
+    assert polls[0] == 4
+    await cube.close()
+
+
+async def test_deadline_returns_pollable_handle(fast_polling: None) -> None:
+    cube, polls = _slow_cube(ready_after=10**6)
+    with deadline_scope(0.02):
+        handle = await cube.execute_query("Revenue.netRevenue", [], {})
+    assert handle["status"] == "pending"
+    assert polls[0] >= 1
+
+    with deadline_scope(0.01):
+        assert (await cube.poll_query(handle["query_id"]))["status"] == "pending"
+
+    polls[0] = 10**6  # warehouse finished
+    result = await cube.poll_query(handle["query_id"])
+    assert result["data"].to_rows() == [{"Revenue.netRevenue": 7}]
+    # Handle is released once results are returned
+    assert await cube.poll_query(handle["query_id"]) is None
+    await cube.close()
+
+
+async def test_expired_handle_is_not_polled(
+    fast_polling: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cube, polls = _slow_cube(ready_after=10**6)
+    with deadline_scope(0.02):
+        handle = await cube.execute_query("Revenue.netRevenue", [], {})
+    monkeypatch.setattr(settings, "cube_pending_query_ttl_seconds", 0.0)
+    sent = polls[0]
+
+    assert await cube.poll_query(handle["query_id"]) is None
+    assert polls[0] == sent
+    assert handle["query_id"] not in cube._pending
+    await cube.close()
+
+
+async def test_poll_falls_back_when_cube_fails(fast_polling: None) -> None:
+    DegradationMode.reset()
+    state = {"down": False}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if state["down"]:
+            return httpx.Response(400, json={"error": "bad query"})
+        return httpx.Response(200, json={"error": "Continue wait"})
+
+    cube = CubeClient("http://cube/cubejs-api/v1", transport=httpx.MockTransport(handler))
+    with deadline_scope(0.02):
+        handle = await cube.execute_query("Revenue.netRevenue", ["Revenue.region"], {})
+    state["down"] = True
+
+    result = await cube.poll_query(handle["query_id"])
+
+    assert result["degraded"] is True
+    assert DegradationMode.is_degraded("cube_api")
+    assert await cube.poll_query(handle["query_id"]) is None
+    DegradationMode.reset()
+    await cube.close()
+
+
+def test_nested_deadline_only_shortens() -> None:
+    assert deadline.remaining() is None
+    with deadline_scope(0.5):
+        with deadline_scope(60):
+            assert deadline.remaining() <= 0.5
+        with deadline_scope(None):
+            assert deadline.remaining() <= 0.5
+    assert deadline.remaining() is None
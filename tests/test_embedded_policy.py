@@ -0,0 +1,177 @@
+"""Tests for the in-process data_access policy evaluator."""
+
+import itertools
+import json
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+
+from ecp.adapters.base import PolicyEngine
+from ecp.adapters.embedded_policy import (
+    CompiledPolicy,
+    EmbeddedPolicyEngine,
+    PolicyCompileError,
+    compile_rego,
+)
+from ecp.config import settings
+
+REGO_PATH = Path(__file__).resolve().parent.parent / "policies" / "data_access.rego"
+REGO = REGO_PATH.read_text()
+
+# Inputs for the conformance check against OPA
+ROLES: list[Any] = ["executive", "finance_analyst", "analyst", "explorer", "intern", ""]
+TIERS: list[Any] = [0, 1, 2, 2.5, 3, 4, 5, None]
+ACTIONS = ["query", "export"]
+
+
+def _input(role: Any, action: str, tier: Any) -> tuple[dict[str, Any], str, dict[str, Any]]:
+    user = {} if role is None else {"role": role}
+    product = {} if tier is None else {"certification_tier": tier}
+    return user, action, product
+
+
+@pytest.fixture
+def opa_fallback() -> AsyncMock:
+    fallback = AsyncMock(spec=PolicyEngine)
+    fallback.evaluate.return_value = {"allow": True, "source": "opa"}
+    fallback.health.return_value = True
+    return fallback
+
+
+def test_compiles_data_access_policy() -> None:
+    policy = compile_rego(REGO)
+    assert policy.package == "ecp.data_access"
+    assert policy.action == "query" and policy.require_role
+    assert policy.table_name == "user_max_tier"
+    assert policy.table["analyst"] == 3
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        (
+            '  input.user.role != ""\n',
+            '  input.user.role != ""\n  input.user.department == "finance"\n',
+        ),
+        ("user_max_tier := {", "deny {\n  true\n}\n\nuser_max_tier := {"),
+        ("default allow = false", "default allow = true"),
+        ('"explorer": 4,', '"explorer": data.tiers.explorer,'),
+    ],
+)
+def test_rejects_rules_outside_the_compiled_subset(change: tuple[str, str]) -> None:
+    assert change[0] in REGO
+    with pytest.raises(PolicyCompileError):
+        compile_rego(REGO.replace(*change))
+
+
+def test_evaluates_table_lookup() -> None:
+    policy = compile_rego(REGO)
+    assert policy.allow(
+        {"user": {"role": "analyst"}, "action": "query", "data_product": {"certification_tier": 3}}
+    )
+    assert not policy.allow(
+        {"user": {"role": "analyst"}, "action": "query", "data_product": {"certification_tier": 4}}
+    )
+    assert not policy.allow(
+        {"user": {"role": "analyst"}, "action": "export", "data_product": {"certification_tier": 1}}
+    )
+    assert not policy.allow(
+        {"user": {"role": ""}, "action": "query", "data_product": {"certification_tier": 1}}
+    )
+    assert not policy.allow(
+        {"user": {}, "action": "query", "data_product": {"certification_tier": 1}}
+    )
+    # Rego's cross-type ordering is left to OPA
+    assert (
+        policy.allow(
+            {
+                "user": {"role": "analyst"},
+                "action": "query",
+                "data_product": {"certification_tier": "1"},
+            }
+        )
+        is None
+    )
+
+
+async def test_decides_in_process_and_defers_to_opa(
+    opa_fallback: AsyncMock, tmp_path: Path
+) -> None:
+    path = tmp_path / "data_access.rego"
+    path.write_text(REGO)
+    engine = EmbeddedPolicyEngine(fallback=opa_fallback, source=str(path))
+    await engine.refresh()
+
+    decision = await engine.evaluate({"role": "executive"}, "query", {"certification_tier": 1})
+    assert decision == {"allow": True, "user_max_tier": compile_rego(REGO).table}
+    opa_fallback.evaluate.assert_not_called()
+
+    decision = await engine.evaluate({"role": "executive"}, "query", {"certification_tier": "1"})
+    assert decision["source"] == "opa"
+    opa_fallback.evaluate.assert_awaited_once()
+
+
+async def test_uncompilable_policy_goes_to_opa(opa_fallback: AsyncMock, tmp_path: Path) -> None:
+    path = tmp_path / "data_access.rego"
+    path.write_text(REGO.replace('  input.user.role != ""\n', "  time.now_ns() > 0\n"))
+    engine = EmbeddedPolicyEngine(fallback=opa_fallback, source=str(path))
+    await engine.refresh()
+    assert engine.policy is None
+    decision = await engine.evaluate({"role": "analyst"}, "query", {"certification_tier": 1})
+    assert decision["source"] == "opa"
+
+
+async def test_compiled_json_source(tmp_path: Path) -> None:
+    path = tmp_path / "data_access.json"
+    path.write_text(json.dumps(compile_rego(REGO).to_dict()))
+    engine = EmbeddedPolicyEngine(source=str(path))
+    await engine.refresh()
+    assert engine.policy == CompiledPolicy.from_dict(compile_rego(REGO).to_dict())
+    decision = await engine.evaluate({"role": "explorer"}, "query", {"certification_tier": 4})
+    assert decision["allow"]
+
+
+async def test_loads_policy_from_opa(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "opa_url", "http://opa:8181/v1")
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/v1/policies"
+        other = {"id": "other.rego", "raw": "package other\n\nx := 1\n"}
+        return httpx.Response(
+            200, json={"result": [other, {"id": "data_access.rego", "raw": REGO}]}
+        )
+
+    engine = EmbeddedPolicyEngine(source="opa", transport=httpx.MockTransport(handler))
+    await engine.refresh()
+    assert engine.policy is not None and engine.policy.package == "ecp.data_access"
+
+
+def _opa_available() -> bool:
+    try:
+        return (
+            httpx.get(settings.opa_url.replace("/v1", "") + "/health", timeout=0.5).status_code
+            == 200
+        )
+    except httpx.HTTPError:
+        return False
+
+
+@pytest.mark.skipif(not _opa_available(), reason="OPA not reachable at OPA_URL")
+async def test_conformance_with_opa() -> None:
+    """Every decision the embedded evaluator makes matches OPA's."""
+    path = settings.opa_policy_path.replace(".", "/")
+    engine = EmbeddedPolicyEngine(source="opa")
+    await engine.refresh()
+    assert engine.policy is not None, "policy served by OPA did not compile"
+    async with httpx.AsyncClient(timeout=5.0) as client:
+        for role, action, tier in itertools.product([*ROLES, None], ACTIONS, TIERS):
+            user, action, product = _input(role, action, tier)
+            r = await client.post(
+                f"{settings.opa_url.rstrip('/')}/data/{path}",
+                json={"input": {"user": user, "action": action, "data_product": product}},
+            )
+            expected = r.json().get("result", {})
+            assert await engine.evaluate(user, action, product) == expected, (user, action, product)
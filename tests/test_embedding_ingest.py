@@ -0,0 +1,254 @@
+"""Tests for the embedder, bulk ingestion and incremental sync (fake connections)."""
+
+import json
+import math
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import Any
+from unittest.mock import AsyncMock
+
+import pytest
+
+from ecp.index.embedding import HashingEmbedder
+from ecp.ingest import EmbeddingIngestor, EmbeddingSync, sync
+from ecp.ingest import embeddings as ingest
+
+
+def _cosine(a: list[float], b: list[float]) -> float:
+    return sum(x * y for x, y in zip(a, b, strict=True))
+
+
+def test_hashing_embedder_is_normalized_and_lexically_similar() -> None:
+    embedder = HashingEmbedder(dimensions=384)
+    net, net_again, calendar = embedder.embed(
+        ["Net revenue minus refunds", "net revenue after refunds", "Fiscal calendar in April"]
+    )
+    assert len(net) == 384
+    assert math.isclose(math.sqrt(sum(v * v for v in net)), 1.0)
+    assert _cosine(net, net_again) > _cosine(net, calendar)
+    assert embedder.embed(["Net revenue minus refunds"])[0] == net
+
+
+class FakeRegistryConn:
+    def __init__(self, assets: list[dict[str, Any]]) -> None:
+        self._rows = sorted(assets, key=lambda a: (a["type"], a["id"]))
+
+    async def fetch(self, query: str, types: list[str], last_type: str, last_id: str, limit: int):
+        rows = [
+            {**a, "content": json.dumps(a["content"]), "metadata": json.dumps(a["metadata"])}
+            for a in self._rows
+            if a["type"] in types and (a["type"], a["id"]) > (last_type, last_id)
+        ]
+        return rows[:limit]
+
+    async def close(self) -> None:
+        pass
+
+
+class FakeVectorsConn:
+    def __init__(self, fail_on_copy: int | None = None) -> None:
+        self.embeddings: dict[str, tuple[Any, ...]] = {}
+        self.checkpoint: tuple[str, int] | None = None
+        self.copies = 0
+        self._fail_on_copy = fail_on_copy
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield
+
+    async def execute(self, query: str, *args: Any) -> None:
+        if "INSERT INTO ingest_checkpoints" in query:
+            self.checkpoint = (args[1], args[2])
+        elif "DELETE FROM ingest_checkpoints" in query:
+            self.checkpoint = None
+
+    async def fetchrow(self, query: str, *args: Any):
+        if self.checkpoint is None:
+            return None
+        return {"cursor": self.checkpoint[0], "rows_done": self.checkpoint[1]}
+
+    async def copy_records_to_table(self, table: str, records: list, columns: list[str]) -> None:
+        self.copies += 1
+        if self.copies == self._fail_on_copy:
+            raise ConnectionResetError("connection lost")
+        for record in records:
+            self.embeddings[record[0]] = record
+
+    async def close(self) -> None:
+        pass
+
+
+def _assets(n: int) -> list[dict[str, Any]]:
+    out = []
+    for i in range(n):
+        out.append({
+            "id": f"ar_g_{i:03d}",
+            "type": "glossary_term",
+            "version": 1,
+            "content": {"canonical_name": f"term_{i}", "definition": f"Definition number {i}"},
+            "metadata": {"domain": "finance"},
+        })
+    out.append({
+        "id": "ar_cal_001",
+        "type": "calendar_config",
+        "version": 1,
+        "content": {"calendar_type": "fiscal"},
+        "metadata": {},
+    })
+    return out
+
+
+def _ingestor() -> EmbeddingIngestor:
+    return EmbeddingIngestor(
+        registry_url="postgresql://registry",
+        vectors_url="postgresql://vectors",
+        page_size=4,
+        batch_size=2,
+        workers=2,
+        use_processes=False,
+    )
+
+
+async def test_ingest_pages_embeds_and_copies(monkeypatch: pytest.MonkeyPatch) -> None:
+    vectors = FakeVectorsConn()
+    monkeypatch.setattr(
+        ingest.asyncpg, "connect", AsyncMock(side_effect=[FakeRegistryConn(_assets(10)), vectors])
+    )
+
+    stats = await _ingestor().run()
+
+    assert stats["rows"] == 10
+    assert stats["pages"] == 3
+    assert stats["rows_per_second"] > 0
+    assert sorted(vectors.embeddings) == [f"vec_g_{i:03d}" for i in range(10)]
+    record = vectors.embeddings["vec_g_003"]
+    assert len(record[3]) == 384
+    metadata = json.loads(record[4])
+    assert metadata["asset_registry_id"] == "ar_g_003"
+    assert metadata["term"] == "term_3"
+    assert metadata["source_version"] == 1
+    assert len(metadata["content_hash"]) == 64
+    assert vectors.checkpoint is None
+
+
+async def test_completed_ingest_runs_again_from_the_start(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    vectors = FakeVectorsConn()
+    registry = FakeRegistryConn(_assets(10))
+    for _ in range(2):
+        monkeypatch.setattr(ingest.asyncpg, "connect", AsyncMock(side_effect=[registry, vectors]))
+        stats = await _ingestor().run()
+        assert stats["rows"] == 10
+        assert stats["resumed_from"] is None
+    assert vectors.copies == 6
+
+
+async def test_ingest_resumes_from_checkpoint(monkeypatch: pytest.MonkeyPatch) -> None:
+    vectors = FakeVectorsConn(fail_on_copy=2)
+    registry = FakeRegistryConn(_assets(10))
+    monkeypatch.setattr(ingest.asyncpg, "connect", AsyncMock(side_effect=[registry, vectors]))
+
+    with pytest.raises(ConnectionResetError):
+        await _ingestor().run()
+    assert len(vectors.embeddings) == 4
+    assert vectors.checkpoint[1] == 4
+
+    monkeypatch.setattr(ingest.asyncpg, "connect", AsyncMock(side_effect=[registry, vectors]))
+    stats = await _ingestor().run()
+
+    assert stats["resumed_from"] == {"type": "glossary_term", "id": "ar_g_003"}
+    assert stats["rows"] == 6
+    assert len(vectors.embeddings) == 10
+    assert vectors.checkpoint is None
+
+
+class FakeSyncRegistryConn:
+    def __init__(self) -> None:
+        self.assets: dict[str, dict[str, Any]] = {}
+        self.deletions: list[tuple[datetime, str]] = []
+
+    def put(self, asset_id: str, definition: str, updated_at: datetime, version: int = 1) -> None:
+        self.assets[asset_id] = {
+            "id": asset_id,
+            "type": "glossary_term",
+            "version": version,
+            "content": json.dumps({"canonical_name": asset_id, "definition": definition}),
+            "metadata": json.dumps({"domain": "finance"}),
+            "updated_at": updated_at,
+        }
+
+    def delete(self, asset_id: str, deleted_at: datetime) -> None:
+        del self.assets[asset_id]
+        self.deletions.append((deleted_at, asset_id))
+
+    async def fetch(self, query: str, *args: Any):
+        if "FROM asset_deletions" in query:
+            after, limit = (args[0], args[1]), args[2]
+            rows = sorted(d for d in self.deletions if d > after)[:limit]
+            return [{"deleted_at": ts, "asset_id": i} for ts, i in rows]
+        if "WHERE id = ANY" in query:
+            return [{"id": i} for i in args[0] if i in self.assets]
+        after, limit = (args[0], args[1]), args[2]
+        rows = sorted(self.assets.values(), key=lambda a: (a["updated_at"], a["id"]))
+        return [a for a in rows if (a["updated_at"], a["id"]) > after][:limit]
+
+    async def close(self) -> None:
+        pass
+
+
+class FakeSyncVectorsConn(FakeVectorsConn):
+    async def fetch(self, query: str, ids: list[str]):
+        return [
+            {"id": i, "content_hash": json.loads(self.embeddings[i][4])["content_hash"]}
+            for i in ids
+            if i in self.embeddings
+        ]
+
+    async def execute(self, query: str, *args: Any) -> str | None:
+        if query.startswith("DELETE FROM embeddings"):
+            removed = [i for i in args[0] if self.embeddings.pop(i, None)]
+            return f"DELETE {len(removed)}"
+        await super().execute(query, *args)
+        return None
+
+
+async def test_sync_reembeds_only_changed_and_deletes_removed(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    t0 = datetime(2025, 1, 1)
+    registry, vectors = FakeSyncRegistryConn(), FakeSyncVectorsConn()
+    for n, asset_id in enumerate(["ar_g_001", "ar_g_002", "ar_g_003"]):
+        registry.put(asset_id, f"definition {n}", t0 + timedelta(minutes=n))
+
+    async def run() -> dict[str, Any]:
+        monkeypatch.setattr(sync.asyncpg, "connect", AsyncMock(side_effect=[registry, vectors]))
+        return await EmbeddingSync(
+            registry_url="postgresql://registry",
+            vectors_url="postgresql://vectors",
+            page_size=2,
+            use_processes=False,
+        ).run()
+
+    first = await run()
+    assert first["reembedded"] == 3
+    assert sorted(vectors.embeddings) == ["vec_g_001", "vec_g_002", "vec_g_003"]
+    assert vectors.copies == 2
+
+    # Nothing changed: only the overlap window is rescanned, nothing re-embedded
+    second = await run()
+    assert second["reembedded"] == 0
+    assert vectors.copies == 2
+
+    t1 = t0 + timedelta(hours=1)
+    registry.put("ar_g_001", "edited definition", t1, version=2)
+    registry.put("ar_g_002", "definition 1", t1, version=2)  # touched, content unchanged
+    registry.delete("ar_g_003", t1)
+
+    third = await run()
+    assert third["reembedded"] == 1
+    assert third["unchanged"] == 1
+    assert third["deleted"] == 1
+    assert sorted(vectors.embeddings) == ["vec_g_001", "vec_g_002"]
+    metadata = json.loads(vectors.embeddings["vec_g_001"][4])
+    assert metadata["source_version"] == 2
@@ -0,0 +1,240 @@
+"""Tests for hybrid lexical + vector retrieval and multi-type vector search."""
+
+import asyncio
+import threading
+from contextlib import asynccontextmanager
+from typing import Any
+from unittest.mock import AsyncMock
+
+from ecp.adapters.vector import PgVectorStore
+from ecp.domain.models import ResolveRequest
+from ecp.index import KeywordIndex
+from ecp.index.embedding import HashingEmbedder
+from ecp.index.fusion import reciprocal_rank_fusion
+from ecp.orchestrator import ResolutionOrchestrator
+from ecp.resilience import DegradationMode
+from ecp.resilience.exceptions import StoreConnectionError
+
+
+def _asset(asset_id: str, name: str, definition: str, synonyms: list[str]) -> dict:
+    return {
+        "id": asset_id,
+        "type": "glossary_term",
+        "content": {"canonical_name": name, "definition": definition, "synonyms": synonyms},
+        "metadata": {"domain": "finance"},
+    }
+
+
+def _index() -> KeywordIndex:
+    index = KeywordIndex()
+    index.upsert(_asset("ar_g_001", "revenue", "Income from business operations", ["sales"]))
+    index.upsert(
+        _asset("ar_g_003", "net_revenue", "Recognized revenue minus refunds", ["net sales"])
+    )
+    return index
+
+
+def test_rrf_rewards_agreement_between_sources() -> None:
+    fused = reciprocal_rank_fusion(
+        {
+            "lexical": [{"id": "a"}, {"id": "b"}],
+            "vector": [{"id": "c"}, {"id": "b"}],
+        },
+        k=60,
+        top_k=3,
+    )
+    assert [r["id"] for r in fused] == ["b", "a", "c"]
+    assert fused[0]["sources"] == ["lexical", "vector"]
+    assert fused[0]["score"] == 2 / 62
+
+
+async def test_search_hybrid_fuses_lexical_and_vector() -> None:
+    store = PgVectorStore("postgresql://unused", keyword_index=_index())
+    store._search_with_retry = AsyncMock(  # type: ignore[method-assign]
+        return_value=[
+            {"id": "vec_g_099", "type": "glossary_term", "metadata": {"term": "sales_revenue"}},
+            {"id": "vec_g_003", "type": "glossary_term", "metadata": {"term": "net_revenue"}},
+        ]
+    )
+
+    hits = await store.search_hybrid("net sales", type_filter="glossary_term", top_k=2)
+
+    assert hits[0]["id"] == "vec_g_003"
+    assert sorted(hits[0]["sources"]) == ["lexical", "vector"]
+    assert len(hits) == 2
+
+
+async def test_search_hybrid_overlaps_lexical_with_vector_query() -> None:
+    events: list[str] = []
+    index = _index()
+    store = PgVectorStore("postgresql://unused", keyword_index=index)
+
+    async def vector_search(*args: Any) -> list[dict[str, Any]]:
+        events.append("vector_sent")
+        await asyncio.sleep(0.01)
+        events.append("vector_done")
+        return []
+
+    def lexical_search(*args: Any, **kwargs: Any) -> list[dict[str, Any]]:
+        events.append("lexical")
+        return []
+
+    store._search_with_retry = vector_search  # type: ignore[method-assign]
+    index.search = lexical_search  # type: ignore[method-assign]
+
+    await store.search_hybrid("net sales", top_k=2)
+
+    assert events == ["vector_sent", "lexical", "vector_done"]
+
+
+async def test_search_hybrid_survives_vector_outage() -> None:
+    DegradationMode.reset()
+    store = PgVectorStore("postgresql://unused", keyword_index=_index())
+    store._search_with_retry = AsyncMock(  # type: ignore[method-assign]
+        side_effect=StoreConnectionError("pgvector", "down"),
+    )
+
+    hits = await store.search_hybrid("net sales", top_k=1)
+
+    assert [h["id"] for h in hits] == ["vec_g_003"]
+    assert hits[0]["sources"] == ["lexical"]
+    assert DegradationMode.is_degraded("pgvector")
+    DegradationMode.reset()
+
+
+async def test_orchestrator_resolves_metric_with_hybrid_search(
+    orchestrator: ResolutionOrchestrator,
+    mock_vector: AsyncMock,
+    resolve_request: ResolveRequest,
+) -> None:
+    response = await orchestrator.resolve(resolve_request)
+    mock_vector.search_hybrid.assert_awaited_once()
+    mock_vector.search.assert_not_awaited()
+    assert response.resolved_concepts["metric"]["id"] == "net_revenue"
+
+
+async def test_query_embedding_runs_off_the_event_loop() -> None:
+    threads: list[int] = []
+
+    class RecordingEmbedder(HashingEmbedder):
+        def embed(self, texts: list[str]) -> list[list[float]]:
+            threads.append(threading.get_ident())
+            return super().embed(texts)
+
+    store = PgVectorStore("postgresql://unused", embedder=RecordingEmbedder(dimensions=8))
+
+    vector = await store._embed_query("net revenue")
+
+    assert len(vector) == 8
+    assert threads and threads[0] != threading.get_ident()
+
+
+async def test_retried_vector_search_embeds_the_query_once() -> None:
+    calls: list[list[str]] = []
+
+    class CountingEmbedder(HashingEmbedder):
+        def embed(self, texts: list[str]) -> list[list[float]]:
+            calls.append(texts)
+            return super().embed(texts)
+
+    conn = AsyncMock()
+    conn.fetch.return_value = []
+
+    @asynccontextmanager
+    async def acquire(timeout: float | None = None):
+        yield conn
+
+    pool = AsyncMock()
+    pool.acquire = acquire
+    store = PgVectorStore("postgresql://unused", embedder=CountingEmbedder(dimensions=8))
+    store._get_pool = AsyncMock(  # type: ignore[method-assign]
+        side_effect=[StoreConnectionError("pgvector", "blip"), pool],
+    )
+
+    await store.search("net revenue", top_k=3)
+
+    assert store._get_pool.await_count == 2
+    assert calls == [["net revenue"]]
+
+
+async def test_search_hybrid_survives_embedding_failure() -> None:
+    DegradationMode.reset()
+
+    class BrokenEmbedder(HashingEmbedder):
+        def embed(self, texts: list[str]) -> list[list[float]]:
+            raise RuntimeError("model unavailable")
+
+    store = PgVectorStore(
+        "postgresql://unused", keyword_index=_index(), embedder=BrokenEmbedder(dimensions=8)
+    )
+    store._search_with_retry = AsyncMock()  # type: ignore[method-assign]
+
+    hits = await store.search_hybrid("net sales", top_k=1)
+
+    assert [h["id"] for h in hits] == ["vec_g_003"]
+    store._search_with_retry.assert_not_awaited()
+    assert DegradationMode.is_degraded("pgvector")
+    DegradationMode.reset()
+
+
+async def test_search_multi_single_round_trip() -> None:
+    conn = AsyncMock()
+    conn.fetch.return_value = [
+        {
+            "type": "glossary_term",
+            "id": "vec_g_003",
+            "content_text": "",
+            "metadata": {},
+            "score": 0.9,
+        },
+        {
+            "type": "tribal_knowledge",
+            "id": "vec_tk_001",
+            "content_text": "",
+            "metadata": {},
+            "score": 0.4,
+        },
+    ]
+
+    @asynccontextmanager
+    async def acquire(timeout: float | None = None):
+        yield conn
+
+    pool = AsyncMock()
+    pool.acquire = acquire
+    store = PgVectorStore("postgresql://unused", embedder=HashingEmbedder(dimensions=8))
+    store._get_pool = AsyncMock(return_value=pool)  # type: ignore[method-assign]
+
+    hits = await store.search_multi(
+        "net revenue",
+        ["glossary_term", "tribal_knowledge", "calendar_config"],
+        top_k=3,
+        filters={"glossary_term": {"domain": "finance"}},
+    )
+
+    assert conn.fetch.await_count == 1
+    _, _, types, type_filters, top_k, _ = conn.fetch.call_args.args
+    assert types == ["glossary_term", "tribal_knowledge", "calendar_config"]
+    assert type_filters == ['{"domain":"finance"}', "{}", "{}"]
+    assert top_k == 3
+    assert [h["id"] for h in hits["glossary_term"]] == ["vec_g_003"]
+    assert [h["id"] for h in hits["tribal_knowledge"]] == ["vec_tk_001"]
+    assert hits["calendar_config"] == []
+
+
+async def test_search_multi_falls_back_with_metadata_filter() -> None:
+    DegradationMode.reset()
+    index = _index()
+    index.upsert(
+        {**_asset("ar_g_004", "net_bookings", "Net bookings", []), "metadata": {"domain": "sales"}}
+    )
+    store = PgVectorStore("postgresql://unused", keyword_index=index)
+    store._get_pool = AsyncMock(side_effect=StoreConnectionError("pgvector", "down"))  # type: ignore[method-assign]
+
+    hits = await store.search_multi(
+        "net", ["glossary_term"], top_k=5, filters={"glossary_term": {"domain": "sales"}}
+    )
+
+    assert [h["metadata"]["term"] for h in hits["glossary_term"]] == ["net_bookings"]
+    assert DegradationMode.is_degraded("pgvector")
+    DegradationMode.reset()
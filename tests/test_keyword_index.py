@@ -0,0 +1,138 @@
+"""Tests for the BM25 keyword index and the vector search fallback it backs."""
+
+from functools import partial
+from typing import Any
+from unittest.mock import AsyncMock
+
+import pytest
+
+from ecp.adapters.base import AssetRegistry
+from ecp.adapters.vector import PgVectorStore
+from ecp.index import KeywordIndex
+from ecp.observability import metrics
+from ecp.resilience import DegradationMode
+from ecp.resilience.degradation import keyword_search_fallback
+from ecp.resilience.exceptions import StoreConnectionError
+
+GLOSSARY: list[dict[str, Any]] = [
+    {
+        "id": "ar_g_001",
+        "type": "glossary_term",
+        "content": {
+            "canonical_name": "revenue",
+            "display_name": "Revenue",
+            "definition": "Income generated from normal business operations",
+            "synonyms": ["income", "sales"],
+        },
+        "metadata": {"domain": "finance"},
+    },
+    {
+        "id": "ar_g_002",
+        "type": "glossary_term",
+        "content": {
+            "canonical_name": "APAC",
+            "display_name": "Asia-Pacific",
+            "definition": "Asia-Pacific region for finance reporting",
+            "synonyms": ["Asia-Pacific", "APAC region"],
+        },
+        "metadata": {"domain": "reference"},
+    },
+    {
+        "id": "ar_g_003",
+        "type": "glossary_term",
+        "content": {
+            "canonical_name": "net_revenue",
+            "display_name": "Net Revenue",
+            "definition": "Recognized revenue per ASC 606 minus refunds",
+            "synonyms": ["revenue net", "net sales"],
+        },
+        "metadata": {"domain": "finance"},
+    },
+]
+
+TRIBAL: list[dict[str, Any]] = [
+    {
+        "id": "ar_tk_001",
+        "type": "tribal_knowledge",
+        "content": {
+            "scope": {"tables": ["finance.fact_revenue_daily"], "dimensions": {"region": "APAC"}},
+            "description": "Q4 2019 APAC data is incomplete",
+            "reason": "Oracle to Snowflake migration caused data loss",
+        },
+        "metadata": {"severity": "high"},
+    },
+]
+
+
+def _registry(glossary: list[dict[str, Any]], tribal: list[dict[str, Any]]) -> AssetRegistry:
+    registry = AsyncMock(spec=AssetRegistry)
+
+    assets = {"glossary_term": glossary, "tribal_knowledge": tribal}
+
+    async def get_assets_page(
+        asset_type: str, after_id: str | None = None, limit: int = 100
+    ) -> list[dict[str, Any]]:
+        page = sorted(assets.get(asset_type, []), key=lambda a: a["id"])
+        return [a for a in page if after_id is None or a["id"] > after_id][:limit]
+
+    registry.get_assets_page.side_effect = get_assets_page
+    # Exercise the ABC's streaming default on top of keyset pages
+    registry.stream_assets_by_type = partial(AssetRegistry.stream_assets_by_type, registry)
+    return registry
+
+
+@pytest.fixture
+async def index() -> KeywordIndex:
+    idx = KeywordIndex()
+    await idx.refresh(_registry(GLOSSARY, TRIBAL))
+    return idx
+
+
+async def test_exact_synonym_ranks_first(index: KeywordIndex) -> None:
+    hits = index.search("net sales", type_filter="glossary_term", top_k=3)
+    assert hits[0]["id"] == "vec_g_003"
+    assert hits[0]["metadata"]["term"] == "net_revenue"
+    assert hits[0]["metadata"]["asset_registry_id"] == "ar_g_003"
+    assert hits[0]["score"] > hits[-1]["score"]
+
+
+async def test_type_filter_and_tribal_knowledge(index: KeywordIndex) -> None:
+    hits = index.search("snowflake migration", top_k=5)
+    assert [h["id"] for h in hits] == ["vec_tk_001"]
+    assert index.search("snowflake migration", type_filter="glossary_term") == []
+
+
+async def test_refresh_tracks_registry_changes(index: KeywordIndex) -> None:
+    edited = {**GLOSSARY[0], "content": {**GLOSSARY[0]["content"], "synonyms": ["turnover"]}}
+    changed = await index.refresh(_registry([edited, GLOSSARY[1]], TRIBAL))
+
+    assert changed == 2  # one edit, one removal
+    assert len(index) == 3
+    assert index.search("turnover")[0]["id"] == "vec_g_001"
+    assert index.search("refunds") == []
+
+    assert await index.refresh(_registry([edited, GLOSSARY[1]], TRIBAL)) == 0
+
+
+def test_fallback_without_index_is_empty() -> None:
+    assert keyword_search_fallback("revenue", top_k=3) == []
+
+
+async def test_vector_store_falls_back_to_keyword_index(index: KeywordIndex) -> None:
+    DegradationMode.reset()
+    store = PgVectorStore("postgresql://unused", keyword_index=index)
+    store._get_pool = AsyncMock(side_effect=StoreConnectionError("pgvector", "down"))  # type: ignore[method-assign]
+
+    errors = metrics.errors_total.labels(error_type="StoreConnectionError", component="pgvector")
+    fallbacks = metrics.errors_total.labels(
+        error_type="fallback_keyword_search", component="vector_store"
+    )
+    before = errors._value.get(), fallbacks._value.get()
+
+    hits = await store.search("net sales", type_filter="glossary_term", top_k=1)
+
+    assert [h["metadata"]["term"] for h in hits] == ["net_revenue"]
+    assert DegradationMode.is_degraded("pgvector")
+    # The fallback records the error; search() does not count it again
+    assert (errors._value.get(), fallbacks._value.get()) == (before[0], before[1] + 1)
+    DegradationMode.reset()
@@ -0,0 +1,81 @@
+"""Tests for the last-known-good result store and the Cube fallback it backs."""
+
+import time
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+
+from ecp.adapters.semantic import CubeClient
+from ecp.resilience.exceptions import StoreConnectionError
+from ecp.resilience.last_known_good import LastKnownGoodStore, query_key
+
+QUERY = {
+    "measures": ["Revenue.netRevenue"],
+    "dimensions": ["Revenue.region", "Revenue.fiscalPeriod"],
+    "timeDimensions": [],
+    "filters": [{"member": "Revenue.region", "operator": "equals", "values": ["JP", "KR"]}],
+}
+
+
+async def test_entries_survive_restart_and_ignore_member_order(tmp_path: Path) -> None:
+    store = LastKnownGoodStore(tmp_path / "lkg.sqlite3")
+    await store.put(QUERY, {"data": [{"Revenue.netRevenue": 42}]})
+    await store.close()
+
+    reordered = {
+        **QUERY,
+        "dimensions": ["Revenue.fiscalPeriod", "Revenue.region"],
+        "filters": [{"member": "Revenue.region", "operator": "equals", "values": ["KR", "JP"]}],
+    }
+    assert query_key(reordered) == query_key(QUERY)
+
+    reopened = LastKnownGoodStore(tmp_path / "lkg.sqlite3")
+    hit = await reopened.get(reordered)
+    assert hit is not None
+    assert hit[0] == {"data": [{"Revenue.netRevenue": 42}]}
+    assert time.time() - hit[1] < 60
+    await reopened.close()
+
+
+async def test_oldest_entries_evicted_over_size_cap(tmp_path: Path) -> None:
+    store = LastKnownGoodStore(tmp_path / "lkg.sqlite3", max_bytes=250)
+    queries = [{**QUERY, "measures": [f"Revenue.m{i}"]} for i in range(4)]
+    for i, q in enumerate(queries):
+        await store.put(q, {"data": [{"v": "x" * 80, "i": i}]})
+
+    assert await store.get(queries[0]) is None
+    assert await store.get(queries[1]) is None
+    assert (await store.get(queries[3]))[0]["data"][0]["i"] == 3
+    await store.close()
+
+
+async def test_cube_outage_serves_last_known_good(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    store = LastKnownGoodStore(tmp_path / "lkg.sqlite3")
+    cube = CubeClient(
+        "http://cube/cubejs-api/v1",
+        transport=httpx.MockTransport(lambda r: httpx.Response(500)),
+        result_store=store,
+    )
+    live = {"data": [{"Revenue.netRevenue": 142300000}]}
+    monkeypatch.setattr(cube, "_wait_for_result", AsyncMock(return_value=live))
+    filters = {"Revenue.region": ["JP", "KR"]}
+    fresh = await cube.execute_query("Revenue.netRevenue", ["Revenue.region"], filters)
+    assert fresh["data"].to_rows() == live["data"]
+    await cube.close()  # flushes the background write
+
+    cube._wait_for_result.side_effect = StoreConnectionError("cube_api", "refused")
+    served = await cube.execute_query("Revenue.netRevenue", ["Revenue.region"], filters)
+    assert served["data"].to_rows() == live["data"]
+    assert served["degraded"] is True
+    assert served["stale"] is False
+    assert served["as_of"]
+
+    # Nothing stored for this query: empty degraded result
+    empty = await cube.execute_query("Revenue.grossRevenue", ["Revenue.region"], filters)
+    assert empty["data"] == []
+    assert "as_of" not in empty
+    await cube.close()
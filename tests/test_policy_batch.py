@@ -0,0 +1,169 @@
+"""Tests for batched policy evaluation (evaluate_many)."""
+
+import json
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock
+
+import httpx
+
+from ecp.adapters.base import PolicyEngine
+from ecp.adapters.embedded_policy import EmbeddedPolicyEngine
+from ecp.adapters.policy import DecisionCache, OPAEngine
+from ecp.domain.models import ExecutionPlan, ResolveRequest
+from ecp.observability import metrics
+from ecp.orchestrator import ResolutionOrchestrator
+
+REGO_PATH = Path(__file__).resolve().parent.parent / "policies" / "data_access.rego"
+MAX_TIER = {"analyst": 3}
+USER = {"role": "analyst"}
+
+
+def _decide(doc: dict[str, Any]) -> dict[str, Any]:
+    tier = doc["data_product"]["certification_tier"]
+    return {"allow": MAX_TIER.get(doc["user"]["role"], 0) >= tier}
+
+
+def _opa(requests: list[httpx.Request], batch_helper: bool = True) -> httpx.MockTransport:
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        body = json.loads(request.content)["input"]
+        if request.url.path.endswith("/data/ecp/data_access_batch/decisions"):
+            if not batch_helper:
+                return httpx.Response(200, json={})
+            result = {str(i): _decide(doc) for i, doc in enumerate(body["batch"])}
+            return httpx.Response(200, json={"result": result})
+        return httpx.Response(200, json={"result": _decide(body)})
+
+    return httpx.MockTransport(handler)
+
+
+async def test_one_call_per_batch_with_dedupe() -> None:
+    requests: list[httpx.Request] = []
+    engine = OPAEngine(
+        base_url="http://opa/v1", decision_cache=DecisionCache(ttl=60), transport=_opa(requests)
+    )
+    products = [{"certification_tier": t} for t in (1, 4, 1, 3, 4)]
+    decisions = await engine.evaluate_many(USER, "query", products)
+    assert [d["allow"] for d in decisions] == [True, False, True, True, False]
+    assert len(requests) == 1
+    assert len(json.loads(requests[0].content)["input"]["batch"]) == 3
+
+    # Decisions made in the batch are cached for single evaluations and later batches
+    assert (await engine.evaluate(USER, "query", {"certification_tier": 4}))["allow"] is False
+    await engine.evaluate_many(USER, "query", products[:2])
+    assert len(requests) == 1
+
+
+async def test_missing_batch_helper_falls_back_to_single_calls() -> None:
+    requests: list[httpx.Request] = []
+    engine = OPAEngine(
+        base_url="http://opa/v1",
+        decision_cache=DecisionCache(ttl=60),
+        transport=_opa(requests, batch_helper=False),
+    )
+    decisions = await engine.evaluate_many(
+        USER, "query", [{"certification_tier": 2}, {"certification_tier": 5}]
+    )
+    assert [d["allow"] for d in decisions] == [True, False]
+    assert len(requests) == 3  # the batch attempt, then one per input
+
+
+async def test_batch_fails_secure_when_opa_is_down() -> None:
+    def down(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("connection refused")
+
+    engine = OPAEngine(base_url="http://opa/v1", transport=httpx.MockTransport(down))
+    decisions = await engine.evaluate_many(USER, "query", [{"certification_tier": 1}] * 2)
+    assert all(d["degraded"] and not d["allowed"] for d in decisions)
+
+
+async def test_embedded_sends_only_undecided_inputs_to_opa() -> None:
+    fallback = AsyncMock(spec=PolicyEngine)
+    fallback.evaluate_many.return_value = [{"allow": False, "source": "opa"}]
+    engine = EmbeddedPolicyEngine(fallback=fallback, source=str(REGO_PATH))
+    await engine.refresh()
+    decisions = await engine.evaluate_many(
+        USER,
+        "query",
+        [{"certification_tier": 3}, {"certification_tier": "3"}, {"certification_tier": 4}],
+    )
+    assert [d["allow"] for d in decisions] == [True, False, False]
+    assert decisions[1]["source"] == "opa"
+    fallback.evaluate_many.assert_awaited_once_with(USER, "query", [{"certification_tier": "3"}])
+
+
+async def test_embedded_without_fallback_records_the_batch() -> None:
+    def batch_sum() -> float:
+        return metrics.policy_batch_size._sum.get()
+
+    engine = EmbeddedPolicyEngine(source=str(REGO_PATH))
+    await engine.refresh()
+    before = batch_sum()
+    decisions = await engine.evaluate_many(
+        USER, "query", [{"certification_tier": 3}, {"certification_tier": "3"}]
+    )
+    assert decisions[0]["allow"] is True and decisions[1]["degraded"]
+    assert batch_sum() == before + 2
+
+
+async def test_default_evaluate_many_dedupes() -> None:
+    calls: list[dict[str, Any]] = []
+
+    class Engine(PolicyEngine):
+        async def evaluate(
+            self, user: dict[str, Any], action: str, data_product: dict[str, Any]
+        ) -> dict[str, Any]:
+            calls.append(data_product)
+            return {"allow": data_product["certification_tier"] < 3}
+
+        async def health(self) -> bool:
+            return True
+
+    decisions = await Engine().evaluate_many(
+        USER,
+        "query",
+        [{"certification_tier": 1}, {"certification_tier": 3}, {"certification_tier": 1}],
+    )
+    assert [d["allow"] for d in decisions] == [True, False, True]
+    assert len(calls) == 2
+
+
+async def test_resolve_authorizes_the_metric_data_product(
+    orchestrator: ResolutionOrchestrator,
+    mock_graph: AsyncMock,
+    mock_policy: AsyncMock,
+    resolve_request: ResolveRequest,
+) -> None:
+    mock_graph.get_metric_by_id.return_value = {
+        "id": "net_revenue",
+        "semantic_layer_ref": "cube.finance.Revenue.netRevenue",
+        "certification_tier": 2,
+    }
+    response = await orchestrator.resolve(resolve_request)
+    assert response.status == "complete"
+    product = {"name": "cube.finance.Revenue", "certification_tier": 2}
+    mock_policy.evaluate.assert_awaited_once_with({"role": "analyst"}, "query", product)
+    assert response.execution_plan.queries[0]["data_product"] == product
+
+
+async def test_plan_over_two_data_products_is_one_batched_call(
+    orchestrator: ResolutionOrchestrator, mock_policy: AsyncMock
+) -> None:
+    revenue = {"name": "cube.finance.Revenue", "certification_tier": 1}
+    budget = {"name": "cube.planning.Budget", "certification_tier": 2}
+    mock_policy.evaluate_many.return_value = [{"allow": True}, {"allow": False}]
+    plan = ExecutionPlan(
+        queries=[
+            {"id": "actual", "measure": "Revenue.netRevenue", "data_product": revenue},
+            {"id": "budget", "measure": "Budget.netRevenueBudget", "data_product": budget},
+            {"id": "actual_ytd", "measure": "Revenue.netRevenue", "data_product": revenue},
+        ]
+    )
+
+    allowed, result = await orchestrator._authorize("q1", USER, plan)
+
+    assert allowed is False
+    assert result == {"decisions": [{"allow": True}, {"allow": False}]}
+    mock_policy.evaluate_many.assert_awaited_once_with(USER, "query", [revenue, budget])
+    mock_policy.evaluate.assert_not_awaited()
@@ -0,0 +1,151 @@
+"""Tests for the OPA decision cache."""
+
+import asyncio
+import json
+from typing import Any
+
+import httpx
+
+from ecp.adapters.policy import DecisionCache, OPAEngine, bundle_revision, decision_key
+
+INPUT = {"user": {"role": "analyst"}, "action": "query", "data_product": {"certification_tier": 1}}
+
+
+def _opa(revision: list[str], calls: list[dict[str, Any]]) -> httpx.MockTransport:
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        calls.append(body["input"])
+        assert request.url.params["provenance"] == "true"
+        return httpx.Response(
+            200,
+            json={
+                "result": {"allow": body["input"]["user"]["role"] != "guest"},
+                "provenance": {"bundles": {"ecp": {"revision": revision[0]}}},
+            },
+        )
+
+    return httpx.MockTransport(handler)
+
+
+def test_decision_key_is_order_insensitive() -> None:
+    reordered = {
+        "data_product": {"certification_tier": 1},
+        "action": "query",
+        "user": {"role": "analyst"},
+    }
+    assert decision_key(INPUT) == decision_key(reordered)
+    assert decision_key(INPUT) != decision_key({**INPUT, "action": "export"})
+
+
+def test_bundle_revision() -> None:
+    assert bundle_revision(None) is None
+    assert bundle_revision({"revision": "r1"}) == "r1"
+    assert (
+        bundle_revision({"bundles": {"b": {"revision": "2"}, "a": {"revision": "1"}}}) == "a=1,b=2"
+    )
+
+
+async def test_opa_decisions_are_cached() -> None:
+    calls: list[dict[str, Any]] = []
+    engine = OPAEngine(
+        base_url="http://opa/v1",
+        decision_cache=DecisionCache(ttl=60),
+        transport=_opa(["r1"], calls),
+    )
+    for _ in range(5):
+        decision = await engine.evaluate({"role": "analyst"}, "query", {"certification_tier": 1})
+        assert decision["allow"]
+    decision = await engine.evaluate({"role": "guest"}, "query", {"certification_tier": 1})
+    assert not decision["allow"]
+    assert len(calls) == 2
+
+
+async def test_concurrent_misses_share_one_evaluation() -> None:
+    cache = DecisionCache(ttl=60)
+    calls = [0]
+
+    async def evaluate() -> tuple[dict[str, Any], str | None]:
+        calls[0] += 1
+        await asyncio.sleep(0.01)
+        return {"allow": True}, "r1"
+
+    results = await asyncio.gather(*(cache.get_or_evaluate(INPUT, evaluate) for _ in range(10)))
+    assert all(r["allow"] for r in results)
+    assert calls[0] == 1
+
+
+async def test_refresh_ahead_serves_cached_and_refreshes_in_background() -> None:
+    cache = DecisionCache(ttl=0.05, refresh_ahead=0.04)
+    decisions = iter([{"allow": True}, {"allow": False}])
+    calls = [0]
+
+    async def evaluate() -> tuple[dict[str, Any], str | None]:
+        calls[0] += 1
+        return next(decisions), None
+
+    assert (await cache.get_or_evaluate(INPUT, evaluate))["allow"]
+    await asyncio.sleep(0.02)  # inside the refresh-ahead window, not expired
+    assert (await cache.get_or_evaluate(INPUT, evaluate))["allow"]
+    await asyncio.sleep(0)
+    assert calls[0] == 2
+    assert not (await cache.get_or_evaluate(INPUT, evaluate))["allow"]
+    assert calls[0] == 2
+
+
+async def test_expired_entries_are_reevaluated() -> None:
+    cache = DecisionCache(ttl=0.01, refresh_ahead=0)
+    calls = [0]
+
+    async def evaluate() -> tuple[dict[str, Any], str | None]:
+        calls[0] += 1
+        return {"allow": True}, None
+
+    await cache.get_or_evaluate(INPUT, evaluate)
+    await asyncio.sleep(0.02)
+    await cache.get_or_evaluate(INPUT, evaluate)
+    assert calls[0] == 2
+
+
+async def test_new_bundle_revision_flushes() -> None:
+    calls: list[dict[str, Any]] = []
+    revision = ["r1"]
+    cache = DecisionCache(ttl=60)
+    engine = OPAEngine(
+        base_url="http://opa/v1", decision_cache=cache, transport=_opa(revision, calls)
+    )
+    await engine.evaluate({"role": "analyst"}, "query", {"certification_tier": 1})
+    await engine.evaluate({"role": "executive"}, "query", {"certification_tier": 1})
+    assert len(cache) == 2 and cache.revision == "ecp=r1"
+
+    # Any OPA response (here a miss for another input) reveals the new revision
+    revision[0] = "r2"
+    await engine.evaluate({"role": "guest"}, "query", {"certification_tier": 1})
+    assert len(cache) == 1 and cache.revision == "ecp=r2"
+    await engine.evaluate({"role": "analyst"}, "query", {"certification_tier": 1})
+    assert len(calls) == 4
+
+
+async def test_fallback_decisions_are_not_cached() -> None:
+    cache = DecisionCache(ttl=60)
+    calls = [0]
+
+    async def evaluate() -> tuple[dict[str, Any], str | None]:
+        calls[0] += 1
+        return {"allowed": False, "degraded": True}, None
+
+    await cache.get_or_evaluate(INPUT, evaluate)
+    await cache.get_or_evaluate(INPUT, evaluate)
+    assert calls[0] == 2 and len(cache) == 0
+
+
+async def test_lru_bound() -> None:
+    cache = DecisionCache(ttl=60, max_entries=2)
+
+    async def evaluate() -> tuple[dict[str, Any], str | None]:
+        return {"allow": True}, None
+
+    for tier in range(5):
+        await cache.get_or_evaluate(
+            {**INPUT, "data_product": {"certification_tier": tier}}, evaluate
+        )
+    assert len(cache) == 2
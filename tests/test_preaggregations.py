@@ -0,0 +1,167 @@
+"""Tests for the workload sketch and the pre-aggregation advisor."""
+
+from ecp.adapters.base import (
+    AssetRegistry,
+    GraphStore,
+    PolicyEngine,
+    SemanticLayerClient,
+    VectorStore,
+)
+from ecp.adapters.cube_schema import CubeSchema, parse_cube_js
+from ecp.adapters.preaggregations import Rollup, recommend_rollups, render_pre_aggregations, serves
+from ecp.domain.models import ResolveRequest
+from ecp.observability.workload import QueryShape, WorkloadRecorder
+from ecp.orchestrator import ResolutionOrchestrator
+
+SCHEMA = CubeSchema(
+    parse_cube_js(
+        """
+cube('Revenue', {
+  sql: `SELECT * FROM fact_revenue_daily`,
+  measures: {
+    netRevenue: { sql: 'amount', type: 'sum' },
+    customers: { sql: 'customer_id', type: 'countDistinct' },
+  },
+  dimensions: {
+    region: { sql: 'region_code', type: 'string' },
+    fiscalPeriod: { sql: 'fiscal_period', type: 'string' },
+    segment: { sql: 'segment', type: 'string' },
+  },
+});
+"""
+    )
+)
+
+
+def _query(measures, dimensions=(), filters=()):
+    return {
+        "measures": list(measures),
+        "dimensions": list(dimensions),
+        "filters": [{"member": m, "operator": "equals", "values": ["x"]} for m in filters],
+    }
+
+
+def test_shape_ignores_order_and_filter_values() -> None:
+    a = QueryShape.from_query(
+        _query(["Revenue.netRevenue"], ["Revenue.region", "Revenue.fiscalPeriod"])
+    )
+    b = QueryShape.from_query(
+        {
+            "measures": ["Revenue.netRevenue"],
+            "dimensions": ["Revenue.fiscalPeriod", "Revenue.region"],
+            "filters": [],
+        }
+    )
+    assert a == b
+    assert a.cube == "Revenue"
+    filtered = QueryShape.from_query(
+        {
+            "measures": ["Revenue.netRevenue"],
+            "filters": [{"member": "Revenue.region", "operator": "equals", "values": ["APAC"]}],
+        }
+    )
+    assert filtered.filters == ("Revenue.region",)
+
+
+def test_recorder_latency_stats() -> None:
+    workload = WorkloadRecorder()
+    for seconds in (0.1, 0.1, 0.1, 2.0):
+        workload.record(_query(["Revenue.netRevenue"], ["Revenue.region"]), seconds)
+    (stats,) = workload.shapes()
+    assert stats.count == 4 and workload.total == 4
+    assert abs(stats.mean_seconds - 0.575) < 1e-9
+    assert stats.quantile(0.5) == 0.128  # bucket [64, 128) ms
+    assert stats.quantile(1.0) == 2.048
+
+
+def test_recorder_is_bounded_and_keeps_heavy_hitters() -> None:
+    workload = WorkloadRecorder(max_shapes=3)
+    for _ in range(50):
+        workload.record(_query(["Revenue.netRevenue"], ["Revenue.region"]), 1.0)
+    for i in range(20):
+        workload.record(_query(["Revenue.netRevenue"], [f"Revenue.d{i}"]), 1.0)
+    assert len(workload) == 3
+    top = workload.shapes()[0]
+    assert top.shape.dimensions == ("Revenue.region",) and top.count == 50 and top.error == 0
+
+
+def test_union_rollup_serves_related_shapes() -> None:
+    workload = WorkloadRecorder()
+    for _ in range(10):
+        workload.record(_query(["Revenue.netRevenue"], ["Revenue.region"]), 1.0)
+        workload.record(
+            _query(["Revenue.netRevenue"], ["Revenue.fiscalPeriod"], filters=["Revenue.region"]),
+            2.0,
+        )
+    rollups = recommend_rollups(workload.shapes(), schema=SCHEMA, rollup_latency=0.0)
+    assert len(rollups) == 1
+    rollup = rollups[0]
+    assert rollup.dimensions == ("Revenue.fiscalPeriod", "Revenue.region")
+    assert rollup.queries == 20 and abs(rollup.saved_seconds - 30.0) < 1e-9
+    assert rollup.name == "netRevenueByFiscalPeriodRegion"
+
+
+def test_non_additive_measures_need_exact_rollups() -> None:
+    workload = WorkloadRecorder()
+    for _ in range(5):
+        workload.record(_query(["Revenue.customers"], ["Revenue.region"]), 1.0)
+        workload.record(_query(["Revenue.customers"], ["Revenue.segment"]), 1.0)
+    rollups = recommend_rollups(workload.shapes(), schema=SCHEMA, rollup_latency=0.0)
+    assert sorted(r.dimensions for r in rollups) == [("Revenue.region",), ("Revenue.segment",)]
+    assert not serves(
+        Rollup("Revenue", ("Revenue.customers",), ("Revenue.region", "Revenue.segment")),
+        QueryShape.from_query(_query(["Revenue.customers"], ["Revenue.region"])),
+        SCHEMA,
+    )
+
+
+def test_fast_shapes_are_not_recommended() -> None:
+    workload = WorkloadRecorder()
+    workload.record(_query(["Revenue.netRevenue"], ["Revenue.region"]), 0.01)
+    assert recommend_rollups(workload.shapes(), rollup_latency=0.05) == []
+
+
+def test_render_pre_aggregations() -> None:
+    workload = WorkloadRecorder()
+    workload.record(
+        {
+            "measures": ["Revenue.netRevenue"],
+            "dimensions": ["Revenue.region"],
+            "timeDimensions": [{"dimension": "Revenue.transactionDate", "granularity": "month"}],
+        },
+        3.0,
+    )
+    js = render_pre_aggregations(recommend_rollups(workload.shapes(), rollup_latency=0.0))
+    block = js["Revenue"]
+    assert "preAggregations: {" in block
+    assert "netRevenueByRegionMonth: {" in block
+    assert "measures: [CUBE.netRevenue]," in block
+    assert "dimensions: [CUBE.region]," in block
+    assert "timeDimension: CUBE.transactionDate," in block
+    assert "granularity: `month`," in block
+
+
+async def test_orchestrator_records_executed_queries(
+    mock_graph: GraphStore,
+    mock_vector: VectorStore,
+    mock_registry: AssetRegistry,
+    mock_semantic: SemanticLayerClient,
+    mock_policy: PolicyEngine,
+    resolve_request: ResolveRequest,
+) -> None:
+    workload = WorkloadRecorder()
+    orch = ResolutionOrchestrator(
+        graph=mock_graph,
+        vector=mock_vector,
+        registry=mock_registry,
+        semantic=mock_semantic,
+        policy=mock_policy,
+        workload=workload,
+    )
+    response = await orch.resolve(resolve_request)
+    await orch.execute(response.resolution_id)
+    assert workload.total == len(response.execution_plan.queries)
+
+    mock_semantic.execute_query.return_value = {"data": [], "degraded": True}
+    await orch.execute(response.resolution_id)
+    assert workload.total == len(response.execution_plan.queries)
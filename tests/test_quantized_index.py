@@ -0,0 +1,91 @@
+"""Tests for int8 vector quantization and halfvec search with rescoring."""
+
+from contextlib import asynccontextmanager
+from typing import Any
+from unittest.mock import AsyncMock
+
+import pytest
+
+from ecp.adapters.vector import PgVectorStore
+from ecp.config import settings
+from ecp.index import Int8VectorIndex
+from ecp.index.embedding import HashingEmbedder
+from ecp.index.quantized import quantize
+
+TEXTS = [
+    "Net revenue is recognized revenue minus refunds",
+    "Gross margin is revenue minus cost of goods sold",
+    "APAC covers the Asia-Pacific reporting region",
+    "Fiscal year starts in April for the finance team",
+    "Q4 2019 APAC data is incomplete after the migration",
+    "Churn is the share of customers lost in a period",
+]
+
+
+def test_quantize_round_trip_is_close() -> None:
+    vector = HashingEmbedder(dimensions=64).embed([TEXTS[0]])[0]
+    codes, scale = quantize(vector)
+    assert max(abs(c) for c in codes) == 127
+    assert max(abs(c * scale - v) for c, v in zip(codes, vector, strict=True)) <= scale / 2
+
+
+def test_int8_index_matches_exact_ranking_and_saves_memory() -> None:
+    embedder = HashingEmbedder(dimensions=128)
+    vectors = embedder.embed(TEXTS)
+    ids = [f"vec_{i}" for i in range(len(TEXTS))]
+    quantized = Int8VectorIndex(dimensions=128)
+    rescored = Int8VectorIndex(dimensions=128, keep_full_precision=True)
+    quantized.add(ids, vectors)
+    rescored.add(ids, vectors)
+
+    query = embedder.embed(["net revenue after refunds"])[0]
+    exact = sorted(
+        (
+            (sum(q * v for q, v in zip(query, vec, strict=True)), i)
+            for i, vec in zip(ids, vectors, strict=True)
+        ),
+        reverse=True,
+    )
+    top = rescored.search(query, top_k=3, rescore_factor=2)
+    assert [i for i, _ in top] == [i for _, i in exact[:3]]
+    assert top[0][1] == pytest.approx(exact[0][0], rel=1e-6)
+    assert quantized.search(query, top_k=1)[0][0] == exact[0][1]
+
+    assert quantized.memory_bytes() == len(TEXTS) * (128 + 4)
+    assert rescored.memory_bytes() == len(TEXTS) * (128 + 4 + 128 * 4)
+
+
+def test_int8_index_rejects_wrong_dimensions() -> None:
+    with pytest.raises(ValueError):
+        Int8VectorIndex(dimensions=8).add(["a"], [[0.0] * 4])
+
+
+async def test_halfvec_search_rescores_candidates(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "vector_quantization", "halfvec")
+    monkeypatch.setattr(settings, "vector_rescore_factor", 4)
+    conn = AsyncMock()
+    conn.fetch.return_value = [
+        {
+            "id": "vec_g_003",
+            "type": "glossary_term",
+            "content_text": "",
+            "metadata": {},
+            "score": 0.9,
+        }
+    ]
+
+    @asynccontextmanager
+    async def acquire(timeout: float | None = None):
+        yield conn
+
+    pool: Any = AsyncMock()
+    pool.acquire = acquire
+    store = PgVectorStore("postgresql://unused", embedder=HashingEmbedder(dimensions=8))
+    store._get_pool = AsyncMock(return_value=pool)  # type: ignore[method-assign]
+
+    hits = await store.search("net sales", type_filter="glossary_term", top_k=5)
+
+    assert [h["id"] for h in hits] == ["vec_g_003"]
+    sql, _, candidates, top_k, type_filter = conn.fetch.call_args.args
+    assert "embedding_half <=>" in sql and "WHERE type = $4" in sql
+    assert (candidates, top_k, type_filter) == (20, 5, "glossary_term")
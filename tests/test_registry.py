@@ -0,0 +1,113 @@
+"""Tests for the Postgres asset registry adapter."""
+
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock
+
+import asyncpg
+
+from ecp.adapters.registry import PostgresAssetRegistry
+
+
+def _postgres_registry(conn: AsyncMock) -> PostgresAssetRegistry:
+    @asynccontextmanager
+    async def acquire():
+        yield conn
+
+    pool = AsyncMock()
+    pool.acquire = acquire
+    registry = PostgresAssetRegistry("postgresql://unused")
+    registry._pool = pool
+    return registry
+
+
+async def test_postgres_get_assets_single_query() -> None:
+    conn = AsyncMock()
+    conn.fetch.return_value = [
+        {
+            "id": "ar_g_001",
+            "type": "glossary_term",
+            "content": {"canonical_name": "revenue"},
+            "metadata": None,
+        },
+    ]
+    registry = _postgres_registry(conn)
+
+    assets = await registry.get_assets(["ar_g_001", "ar_g_404", "ar_g_001"])
+
+    assert assets == {
+        "ar_g_001": {
+            "id": "ar_g_001",
+            "type": "glossary_term",
+            "content": {"canonical_name": "revenue"},
+            "metadata": {},
+        }
+    }
+    query, ids = conn.fetch.call_args.args
+    assert "= ANY($1::text[])" in query
+    assert ids == ["ar_g_001", "ar_g_404"]
+    assert await registry.get_assets([]) == {}
+    assert conn.fetch.await_count == 1
+
+
+async def test_search_glossary_ranks_with_full_text_index() -> None:
+    conn = AsyncMock()
+    conn.fetch.return_value = [
+        {
+            "id": "ar_g_003",
+            "type": "glossary_term",
+            "content": {"canonical_name": "net_revenue"},
+            "metadata": {},
+        },
+    ]
+    registry = _postgres_registry(conn)
+
+    terms = await registry.search_glossary("net sales", domain="finance", limit=5)
+
+    assert [t["id"] for t in terms] == ["ar_g_003"]
+    query, *args = conn.fetch.call_args.args
+    assert "search_tsv @@" in query and "ts_rank" in query
+    assert "metadata->>'domain' = $2" in query and "LIMIT $3" in query
+    assert args == ["net sales", "finance", 5]
+
+    await registry.search_glossary("net sales", limit=5)
+    query, *args = conn.fetch.call_args.args
+    assert "domain" not in query and "LIMIT $2" in query
+    assert args == ["net sales", 5]
+
+
+async def test_search_glossary_without_migration_uses_ilike() -> None:
+    conn = AsyncMock()
+    conn.fetch.side_effect = [
+        asyncpg.UndefinedColumnError("column search_tsv does not exist"),
+        [],
+        [],
+    ]
+    registry = _postgres_registry(conn)
+
+    assert await registry.search_glossary("revenue") == []
+    assert await registry.search_glossary("revenue") == []
+
+    queries = [c.args[0] for c in conn.fetch.call_args_list]
+    assert "search_tsv" in queries[0]
+    assert all("search_tsv" not in q and "ILIKE $1" in q for q in queries[1:])
+    assert conn.fetch.call_args.args[1:] == ("%revenue%", 10)
+
+
+async def test_stream_assets_by_type_pages_by_keyset() -> None:
+    rows = [
+        {"id": f"ar_g_{i:03d}", "type": "glossary_term", "content": {}, "metadata": None}
+        for i in range(5)
+    ]
+
+    async def fetch(query: str, asset_type: str, after_id: str, limit: int):
+        return [r for r in rows if r["id"] > after_id][:limit]
+
+    conn = AsyncMock()
+    conn.fetch.side_effect = fetch
+    registry = _postgres_registry(conn)
+
+    ids = [a["id"] async for a in registry.stream_assets_by_type("glossary_term", batch_size=2)]
+
+    assert ids == [r["id"] for r in rows]
+    assert [c.args[2] for c in conn.fetch.call_args_list] == ["", "ar_g_001", "ar_g_003"]
+    assert "id > $2" in conn.fetch.call_args.args[0]
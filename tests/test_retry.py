@@ -0,0 +1,90 @@
+"""Tests for the retry decorator and per-store retry budgets."""
+
+import pytest
+
+from ecp.observability import metrics
+from ecp.resilience.deadline import deadline_scope
+from ecp.resilience.exceptions import StoreConnectionError
+from ecp.resilience.retry import RetryBudget, backoff_delay, retry_budget, with_retry
+
+
+def _flaky(failures: int, store: str, **kwargs: float):
+    calls = [0]
+
+    @with_retry(store_name=store, **kwargs)
+    async def call() -> str:
+        calls[0] += 1
+        if calls[0] <= failures:
+            raise StoreConnectionError(store, "connection refused")
+        return "ok"
+
+    return call, calls
+
+
+def _retries(store: str, outcome: str) -> float:
+    return metrics.retries_total.labels(store=store, outcome=outcome)._value.get()
+
+
+async def test_retries_transient_errors_with_short_backoff() -> None:
+    call, calls = _flaky(2, "retry_ok", min_wait=0.001)
+    assert await call() == "ok"
+    assert calls[0] == 3
+    assert _retries("retry_ok", "retried") == 2
+
+
+async def test_gives_up_after_max_attempts() -> None:
+    call, calls = _flaky(5, "retry_attempts", min_wait=0.001)
+    with pytest.raises(StoreConnectionError):
+        await call()
+    assert calls[0] == 3
+
+
+async def test_non_retryable_errors_are_raised_at_once() -> None:
+    calls = [0]
+
+    @with_retry(store_name="retry_value")
+    async def call() -> None:
+        calls[0] += 1
+        raise ValueError("bad input")
+
+    with pytest.raises(ValueError):
+        await call()
+    assert calls[0] == 1
+
+
+async def test_budget_caps_retries_during_an_outage() -> None:
+    budget = retry_budget("retry_outage")
+    budget.max_tokens = 2.0
+    budget._tokens = 2.0
+    call, calls = _flaky(100, "retry_outage", min_wait=0.001)
+    for _ in range(3):
+        with pytest.raises(StoreConnectionError):
+            await call()
+    # Two retries from the bucket, then one attempt per call
+    assert calls[0] == 5
+    assert _retries("retry_outage", "budget_exhausted") == 2
+    assert metrics.retry_budget_tokens.labels(store="retry_outage")._value.get() == 0.0
+
+
+def test_successes_refill_the_budget() -> None:
+    budget = RetryBudget(ratio=0.5, max_tokens=1.0)
+    assert budget.withdraw() and not budget.withdraw()
+    budget.deposit()
+    assert not budget.withdraw()
+    budget.deposit()
+    budget.deposit()
+    assert budget.withdraw() and budget.tokens == 0.0
+
+
+async def test_no_retry_past_the_deadline() -> None:
+    call, calls = _flaky(1, "retry_deadline", min_wait=1.0)
+    with deadline_scope(0.1), pytest.raises(StoreConnectionError):
+        await call()
+    assert calls[0] == 1
+    assert _retries("retry_deadline", "deadline") == 1
+
+
+def test_backoff_is_exponential_and_capped() -> None:
+    for attempt, ceiling in ((1, 0.05), (2, 0.1), (3, 0.2), (10, 1.0)):
+        delay = backoff_delay(attempt, 0.05, 1.0)
+        assert ceiling / 2 <= delay <= ceiling
@@ -0,0 +1,183 @@
+"""Tests for row-level filter pushdown from policy partial evaluation."""
+
+import json
+from typing import Any
+
+import httpx
+import pytest
+
+from ecp.adapters.base import PolicyEngine, SemanticLayerClient
+from ecp.adapters.policy import (
+    DecisionCache,
+    OPAEngine,
+    ResidualNotSupportedError,
+    residual_filters,
+)
+from ecp.domain.models import ExecutionPlan, ResolveRequest, UserContext
+from ecp.orchestrator import ResolutionOrchestrator
+from ecp.orchestrator.orchestrator import apply_row_filters
+
+
+def _eq(column: str, value: Any, op: str = "eq") -> list[dict[str, Any]]:
+    return [
+        {
+            "index": 0,
+            "terms": [
+                {"type": "ref", "value": [{"type": "var", "value": op}]},
+                {
+                    "type": "ref",
+                    "value": [
+                        {"type": "var", "value": "input"},
+                        {"type": "string", "value": "row"},
+                        {"type": "string", "value": column},
+                    ],
+                },
+                {"type": "string", "value": value},
+            ],
+        }
+    ]
+
+
+def test_residual_filters() -> None:
+    assert residual_filters([_eq("region", "JP"), _eq("region", "KR", op="equal")]) == {
+        "region": ["JP", "KR"]
+    }
+    assert residual_filters([[]]) == {}
+    assert residual_filters([]) is None
+    assert residual_filters(None) is None
+
+
+@pytest.mark.parametrize(
+    "queries",
+    [
+        [_eq("region", "JP"), _eq("segment", "SMB")],
+        [_eq("region", "JP") + _eq("segment", "SMB")],
+        [[{**_eq("region", "JP")[0], "negated": True}]],
+        [_eq("region", "JP", op="neq")],
+    ],
+)
+def test_unsupported_residuals(queries: list[list[dict[str, Any]]]) -> None:
+    with pytest.raises(ResidualNotSupportedError):
+        residual_filters(queries)
+
+
+async def test_opa_compile_api() -> None:
+    requests: list[dict[str, Any]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/v1/compile"
+        body = json.loads(request.content)
+        requests.append(body)
+        regions = body["input"]["user"].get("allowed_regions")
+        queries = [[]] if regions is None else [_eq("region", r) for r in regions]
+        return httpx.Response(200, json={"result": {"queries": queries}})
+
+    engine = OPAEngine(
+        base_url="http://opa/v1",
+        decision_cache=DecisionCache(ttl=60),
+        transport=httpx.MockTransport(handler),
+    )
+    user = {"role": "analyst", "allowed_regions": ["JP"]}
+    assert await engine.row_filters(user, "query", {"certification_tier": 1}) == {"region": ["JP"]}
+    assert await engine.row_filters(user, "query", {"certification_tier": 1}) == {"region": ["JP"]}
+    assert await engine.row_filters({"role": "analyst"}, "query", {}) == {}
+    assert len(requests) == 2
+    assert requests[0]["unknowns"] == ["input.row"]
+    assert requests[0]["query"] == "data.ecp.row_filters.allow_row == true"
+
+
+async def test_opa_unsupported_residual_fails_secure() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        queries = [_eq("region", "JP"), _eq("segment", "SMB")]
+        return httpx.Response(200, json={"result": {"queries": queries}})
+
+    engine = OPAEngine(base_url="http://opa/v1", transport=httpx.MockTransport(handler))
+    assert await engine.row_filters({"role": "analyst"}, "query", {}) is None
+
+
+def test_apply_row_filters() -> None:
+    measure = "Revenue.netRevenue"
+    assert apply_row_filters({}, measure, {"region": ["JP", "KR"]}) == {
+        "Revenue.region": ["JP", "KR"]
+    }
+    assert apply_row_filters({"Revenue.region": "JP"}, measure, {"region": ["JP", "KR"]}) == {
+        "Revenue.region": ["JP"]
+    }
+    assert apply_row_filters({"Revenue.region": ["US"]}, measure, {"region": ["JP"]}) is None
+    assert apply_row_filters({"Revenue.segment": "SMB"}, measure, {}) == {"Revenue.segment": "SMB"}
+    assert apply_row_filters({}, measure, None) is None
+
+
+def _request(resolve_request: ResolveRequest, regions: list[str]) -> ResolveRequest:
+    context = (resolve_request.user_context or UserContext()).model_copy(
+        update={"allowed_regions": regions}
+    )
+    return resolve_request.model_copy(update={"user_context": context})
+
+
+async def test_resolve_pushes_row_filters_into_plan(
+    orchestrator: ResolutionOrchestrator,
+    mock_policy: PolicyEngine,
+    mock_semantic: SemanticLayerClient,
+    resolve_request: ResolveRequest,
+) -> None:
+    mock_policy.row_filters.return_value = {"region": ["JP"]}
+    response = await orchestrator.resolve(_request(resolve_request, ["JP"]))
+    assert response.status == "complete"
+    user = mock_policy.row_filters.await_args.args[0]
+    assert user["allowed_regions"] == ["JP"]
+    for q in response.execution_plan.queries:
+        cube = q["measure"].split(".")[0]
+        assert q["filters"][f"{cube}.region"] == ["JP"]
+
+    # Parameters cannot widen the permitted rows
+    result = await orchestrator.execute(response.resolution_id, parameters={"Revenue.region": "US"})
+    assert result["warnings"] and result["warnings"][0]["type"] == "access_denied"
+    for call in mock_semantic.execute_query.await_args_list:
+        assert call.args[2].get("Revenue.region") != "US"
+
+
+async def test_resolve_denies_when_no_rows_permitted(
+    orchestrator: ResolutionOrchestrator,
+    mock_policy: PolicyEngine,
+    resolve_request: ResolveRequest,
+) -> None:
+    mock_policy.row_filters.return_value = None
+    response = await orchestrator.resolve(_request(resolve_request, []))
+    assert response.status == "access_denied"
+    assert response.resolution_id not in orchestrator._resolution_cache
+
+
+async def test_row_filters_follow_each_query_data_product(
+    orchestrator: ResolutionOrchestrator, mock_policy: PolicyEngine
+) -> None:
+    revenue = {"name": "cube.finance.Revenue", "certification_tier": 1}
+    budget = {"name": "cube.planning.Budget", "certification_tier": 2}
+    hr = {"name": "cube.people.Headcount", "certification_tier": 3}
+
+    async def row_filters(
+        user: dict[str, Any], action: str, data_product: dict[str, Any]
+    ) -> dict[str, list[Any]] | None:
+        if data_product == hr:
+            raise RuntimeError("compile failed")
+        return {"region": ["JP"]} if data_product == revenue else {}
+
+    mock_policy.row_filters.side_effect = row_filters
+    plan = ExecutionPlan(
+        queries=[
+            {"id": "actual", "measure": "Revenue.netRevenue", "data_product": revenue},
+            {"id": "budget", "measure": "Budget.netRevenueBudget", "data_product": budget},
+            {"id": "actual_ytd", "measure": "Revenue.netRevenue", "data_product": revenue},
+            {"id": "headcount", "measure": "Headcount.count", "data_product": hr},
+        ]
+    )
+
+    filters = await orchestrator._row_filters("q1", {"role": "analyst"}, plan)
+
+    assert filters == {
+        "actual": {"region": ["JP"]},
+        "budget": {},
+        "actual_ytd": {"region": ["JP"]},
+        "headcount": None,
+    }
+    assert mock_policy.row_filters.await_count == 3
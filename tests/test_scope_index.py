@@ -0,0 +1,142 @@
+"""Tests for the tribal-knowledge scope index and resolution warnings."""
+
+from functools import partial
+from typing import Any
+from unittest.mock import AsyncMock
+
+from ecp.adapters.base import AssetRegistry
+from ecp.domain.models import ResolveRequest
+from ecp.index import ScopeIndex
+from ecp.orchestrator import ResolutionOrchestrator
+
+TRIBAL: list[dict[str, Any]] = [
+    {
+        "id": "ar_tk_001",
+        "type": "tribal_knowledge",
+        "content": {
+            "type": "known_issue",
+            "scope": {
+                "tables": ["finance.fact_revenue_daily"],
+                "dimensions": {"region": "APAC", "fiscal_period": "2019-Q4"},
+            },
+            "description": "Q4 2019 APAC data is incomplete",
+            "impact": "Revenue understated by approximately 15%",
+            "workaround": "Use fact_revenue_daily_restated",
+        },
+        "metadata": {"severity": "high", "active": True},
+    },
+    {
+        "id": "ar_tk_002",
+        "type": "tribal_knowledge",
+        "content": {
+            "scope": {"tables": ["sales.fact_bookings"], "dimensions": {"region": ["JP", "KR"]}},
+            "description": "Bookings double-count JP/KR reseller orders",
+        },
+        "metadata": {"severity": "medium"},
+    },
+    {
+        "id": "ar_tk_003",
+        "type": "tribal_knowledge",
+        "content": {
+            "scope": {"dimensions": {"region": "APAC"}},
+            "description": "Retired note",
+        },
+        "metadata": {"active": False},
+    },
+]
+
+
+def _registry(tribal: list[dict[str, Any]]) -> AssetRegistry:
+    registry = AsyncMock(spec=AssetRegistry)
+
+    async def get_assets_page(
+        asset_type: str, after_id: str | None = None, limit: int = 100
+    ) -> list[dict[str, Any]]:
+        page = sorted(tribal, key=lambda a: a["id"]) if asset_type == "tribal_knowledge" else []
+        return [a for a in page if after_id is None or a["id"] > after_id][:limit]
+
+    registry.get_assets_page.side_effect = get_assets_page
+    registry.stream_assets_by_type = partial(AssetRegistry.stream_assets_by_type, registry)
+    return registry
+
+
+async def test_match_requires_every_scoped_dimension() -> None:
+    index = ScopeIndex()
+    assert await index.refresh(_registry(TRIBAL)) == 2  # inactive issue skipped
+
+    # Fiscal periods match across "Q4-2019" / "2019-Q4" spellings
+    hits = index.match({"region": ["APAC", "JP"], "fiscal_period": ["Q4-2019"]})
+    assert [a["id"] for a in hits] == ["ar_tk_001", "ar_tk_002"]
+
+    # Other period: only the region-only issue still applies
+    hits = index.match({"region": ["APAC", "JP"], "fiscal_period": ["Q3-2024"]})
+    assert [a["id"] for a in hits] == ["ar_tk_002"]
+
+    # Table scoping ignores schema prefixes and drops issues on other tables
+    hits = index.match(
+        {"region": ["APAC", "JP"], "fiscal_period": ["2019-Q4"]}, tables=["fact_revenue_daily"]
+    )
+    assert [a["id"] for a in hits] == ["ar_tk_001"]
+
+
+async def test_refresh_drops_removed_and_deactivated_issues() -> None:
+    tribal = [dict(a) for a in TRIBAL]
+    registry = _registry(tribal)
+    index = ScopeIndex()
+    await index.refresh(registry)
+
+    tribal[0] = {**tribal[0], "metadata": {"severity": "high", "active": False}}
+    del tribal[1]
+    await index.refresh(registry)
+    assert len(index) == 0
+    assert index.match({"region": ["APAC", "JP"], "fiscal_period": ["2019-Q4"]}) == []
+
+
+async def test_resolve_attaches_matching_known_issues(
+    mock_graph: Any,
+    mock_vector: Any,
+    mock_registry: Any,
+    mock_semantic: Any,
+    mock_policy: Any,
+) -> None:
+    index = ScopeIndex()
+    index.upsert(TRIBAL[0])
+    mock_registry.get_assets.return_value = {}
+    orchestrator = ResolutionOrchestrator(
+        graph=mock_graph,
+        vector=mock_vector,
+        registry=mock_registry,
+        semantic=mock_semantic,
+        policy=mock_policy,
+        scope_index=index,
+    )
+
+    # The demo resolves to Q3-2024, outside the issue's scope
+    response = await orchestrator.resolve(ResolveRequest(concept="APAC revenue"))
+    assert response.warnings == []
+
+    index.upsert(
+        {
+            **TRIBAL[0],
+            "content": {
+                **TRIBAL[0]["content"],
+                "scope": {
+                    "tables": ["finance.fact_revenue_daily"],
+                    "dimensions": {"region": "APAC", "fiscal_period": "Q3-2024"},
+                },
+            },
+        }
+    )
+    response = await orchestrator.resolve(ResolveRequest(concept="APAC revenue"))
+    assert response.warnings == [
+        {
+            "type": "known_issue",
+            "message": "Q4 2019 APAC data is incomplete",
+            "asset_id": "ar_tk_001",
+            "severity": "high",
+            "impact": "Revenue understated by approximately 15%",
+            "workaround": "Use fact_revenue_daily_restated",
+        }
+    ]
+    nodes = {n["id"]: n for n in response.provenance["dag"]["nodes"]}
+    assert nodes["check_known_issues"]["output"] == {"matched": ["ar_tk_001"]}
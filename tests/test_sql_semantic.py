@@ -0,0 +1,119 @@
+"""Tests for the Cube schema compiler and per-measure semantic routing."""
+
+import json
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+
+from ecp.adapters.base import SemanticLayerClient
+from ecp.adapters.cube_schema import UnsupportedQueryError, load_schema, parse_cube_js
+from ecp.adapters.sql_semantic import RoutedSemanticLayer, SqliteExecutor, SqlSemanticLayer
+
+ROOT = Path(__file__).resolve().parent.parent
+APAC = ["APAC"]
+
+
+@pytest.fixture
+def embedded() -> SqlSemanticLayer:
+    # The synthetic DW seed runs unchanged on the embedded engine
+    executor = SqliteExecutor(script=(ROOT / "scripts" / "schema_dw.sql").read_text())
+    return SqlSemanticLayer(load_schema(ROOT / "cube" / "schema"), executor)
+
+
+async def test_compiled_measure_matches_cube_definition(embedded: SqlSemanticLayer) -> None:
+    result = await embedded.execute_query(
+        "Revenue.netRevenue",
+        ["Revenue.region", "Revenue.fiscalPeriod"],
+        {"Revenue.fiscalPeriod": "Q3-2024", "Revenue.region": APAC},
+    )
+    # Budget rows are excluded by the cube's base sql
+    assert result["data"].to_rows() == [
+        {
+            "Revenue.region": "APAC",
+            "Revenue.fiscalPeriod": "Q3-2024",
+            "Revenue.netRevenue": 142300000,
+        }
+    ]
+    assert result["annotation"]["measures"] == {"Revenue.netRevenue": "sum"}
+
+
+def test_compile_binds_values_as_parameters() -> None:
+    schema = load_schema(ROOT / "cube" / "schema")
+    query = {
+        "measures": ["Revenue.netRevenue"],
+        "dimensions": ["Revenue.region"],
+        "filters": [
+            {"member": "Revenue.region", "operator": "equals", "values": ["JP", "KR"]},
+            {"member": "Revenue.transactionDate", "operator": "gte", "values": ["2024-10-01"]},
+        ],
+    }
+    sql, params = schema.compile(query, placeholder="$")
+    assert "region_code IN ($1, $2)" in sql
+    assert "transaction_date >= $3::text::timestamp" in sql
+    assert params == ["JP", "KR", "2024-10-01"]
+
+    with pytest.raises(UnsupportedQueryError):
+        schema.compile({**query, "measures": ["Revenue.unknown"]})
+
+
+def test_unsupported_schema_features_are_skipped(tmp_path: Path) -> None:
+    cubes = parse_cube_js(
+        """
+        cube(`Orders`, {
+          sql: `SELECT * FROM ${ORDERS_TABLE}`,
+          measures: { count: { type: `count` } },
+        });
+        cube('Refunds', {
+          sql: 'SELECT * FROM refunds',
+          measures: {
+            total: { sql: `${CUBE}.amount`, type: 'sum' },
+            ratio: { sql: `${total} / 2`, type: 'number' },
+          },
+          dimensions: {},
+        });
+        """
+    )
+    assert [c.name for c in cubes] == ["Refunds"]
+    assert list(cubes[0].measures) == ["total"]
+    assert cubes[0].measures["total"].sql == '"Refunds".amount'
+
+    export = tmp_path / "schema.json"
+    export.write_text(
+        json.dumps(
+            {
+                "cubes": [
+                    {
+                        "name": "Refunds",
+                        "sql": "SELECT * FROM refunds",
+                        "measures": {"total": {"sql": "amount", "type": "sum"}},
+                    }
+                ]
+            }
+        )
+    )
+    assert "Refunds" in load_schema(export).cubes
+
+
+async def test_routes_certified_measures_to_embedded(embedded: SqlSemanticLayer) -> None:
+    cube = AsyncMock(spec=SemanticLayerClient)
+    cube.execute_query.return_value = {"data": [{"Revenue.count": 3}]}
+    routed = RoutedSemanticLayer(cube, embedded)
+
+    result = await routed.execute_query("Revenue.netRevenue", [], {"Revenue.region": APAC})
+    assert result["data"].to_rows() == [{"Revenue.netRevenue": 142300000}]
+    cube.execute_query.assert_not_called()
+
+    # Not certified: Cube
+    assert await routed.execute_query("Revenue.count", [], {}) == {"data": [{"Revenue.count": 3}]}
+    cube.execute_query.assert_awaited_once_with("Revenue.count", [], {})
+
+
+async def test_embedded_failure_falls_back_to_cube(embedded: SqlSemanticLayer) -> None:
+    cube = AsyncMock(spec=SemanticLayerClient)
+    cube.execute_query.return_value = {"data": [{"Revenue.netRevenue": 1}]}
+    embedded._executor.fetch = AsyncMock(side_effect=RuntimeError("warehouse down"))
+    routed = RoutedSemanticLayer(cube, embedded)
+
+    result = await routed.execute_query("Revenue.netRevenue", [], {})
+    assert result == {"data": [{"Revenue.netRevenue": 1}]}